@@ -4,38 +4,15 @@ FraudShield - Advanced Anomaly Detection Pipeline
 This package provides the core functionality for the FraudShield fraud
 detection system, integrating machine learning with optimized C++ backends.
 It orchestrates data ingestion, preprocessing, training, and evaluation.
+Subpackages load on first attribute access, so ``import fraudshield`` stays
+cheap for scoring workers and CLI start-up.
 
 File: __init__.py
 Author: Mudit Bhargava
 License: MIT
 """
-import os
-from pathlib import Path
-
-# Localize Airflow to the project root to prevent polluting the user's system
-_project_root = Path(__file__).resolve().parent.parent.parent
-_airflow_home = _project_root / ".airflow"
-_airflow_db = _airflow_home / "airflow.db"
-
-os.environ.setdefault("AIRFLOW_HOME", str(_airflow_home))
-os.environ.setdefault("AIRFLOW__DATABASE__SQL_ALCHEMY_CONN", f"sqlite:///{_airflow_db}")
-os.environ.setdefault("AIRFLOW__CORE__LOAD_EXAMPLES", "False")
-
-if not _airflow_db.exists():
-    import subprocess
-    import sys
-
-    _airflow_home.mkdir(parents=True, exist_ok=True)
-    try:
-        subprocess.run(
-            [sys.executable, "-m", "airflow", "db", "migrate"],
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-    except Exception:  # pylint: disable=broad-exception-caught
-        pass
-
+import importlib
+from typing import Any, List
 
 __all__ = [
     "data_ingestion",
@@ -46,6 +23,19 @@ __all__ = [
     "data_pipeline",
     "sql",
     "data_cleaning",
+    "benchmarks",
 ]
 
 __version__ = "2.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,33 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module provides performance benchmarks for the native kernels and their
+Python fallbacks, with baseline comparison to catch regressions, and for the
+ingestion bulk-load strategies.
+
+File: __init__.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+from fraudshield.benchmarks.ingestion_benchmarks import run_load_benchmarks
+from fraudshield.benchmarks.kernel_benchmarks import (
+    BenchmarkResult,
+    Regression,
+    compare_to_baseline,
+    kernel_names,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+__all__ = [
+    "BenchmarkResult",
+    "Regression",
+    "compare_to_baseline",
+    "kernel_names",
+    "load_results",
+    "run_benchmarks",
+    "run_load_benchmarks",
+    "save_results",
+]
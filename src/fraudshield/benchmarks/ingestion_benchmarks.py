@@ -0,0 +1,154 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module times the ingestion bulk-load strategies against each other on
+synthetic transactions. SQLite runs on a temporary file; a PostgreSQL (or
+any other) database can be added with ``--db_url``.
+
+File: ingestion_benchmarks.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from fraudshield.benchmarks.kernel_benchmarks import BenchmarkResult, _parse_sizes, _time, save_results
+from fraudshield.data_ingestion.bulk_load import LOAD_METHODS, bulk_insert, resolve_load_method, tune_sqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+BENCHMARK_TABLE = "fraudshield_load_benchmark"
+
+
+def synthetic_transactions(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Transactions shaped like the ingestion input.
+
+    Args:
+        n: Number of rows
+        seed: Random seed
+
+    Returns:
+        DataFrame with id, amount, timestamp, categorical and flag columns
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "transaction_id": np.arange(n, dtype=np.int64),
+            "user_id": rng.integers(0, max(1, n // 50), n),
+            "merchant_id": rng.integers(0, 5_000, n),
+            "amount": np.round(rng.lognormal(3.5, 1.0, n), 2),
+            "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86_400, n), "s"),
+            "currency": rng.choice(["USD", "EUR", "GBP"], n),
+            "is_fraud": (rng.random(n) < 0.01).astype(np.int64),
+        }
+    )
+
+
+def run_load_benchmarks(
+    rows: Sequence[int] = tuple(DEFAULT_ROWS),
+    methods: Optional[Sequence[str]] = None,
+    db_urls: Optional[Sequence[str]] = None,
+    chunksize: int = 10000,
+    min_repeats: int = 1,
+    min_seconds: float = 0.0,
+) -> List[BenchmarkResult]:
+    """
+    Time each bulk-load method on each database at each row count.
+
+    Every timed run replaces the benchmark table inside one transaction, as
+    ``DataIngestion.write_to_database`` does.
+
+    Args:
+        rows: Row counts to load
+        methods: Load methods (default: every method the dialect supports)
+        db_urls: SQLAlchemy URLs (default: a temporary SQLite file)
+        chunksize: Rows per statement, COPY buffer or executemany call
+        min_repeats: Timed repeats per measurement
+        min_seconds: Keep repeating until the repeats add up to this many seconds
+
+    Returns:
+        One BenchmarkResult per method, database and row count, with the
+        method as ``kernel`` (``ingest.<method>``) and the dialect as ``backend``
+    """
+    unknown = set(methods or ()) - set(LOAD_METHODS)
+    if unknown:
+        raise ValueError(f"Unknown load methods {sorted(unknown)}. Use any of {LOAD_METHODS}.")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        urls = list(db_urls) if db_urls else [f"sqlite:///{Path(tmpdir) / 'benchmark.db'}"]
+        results: List[BenchmarkResult] = []
+        for url in urls:
+            engine = create_engine(url)
+            tune_sqlite(engine)
+            dialect = engine.dialect.name
+            candidates = [method for method in (methods or LOAD_METHODS) if method != "auto"]
+            usable = []
+            for method in candidates:
+                try:
+                    resolve_load_method(dialect, method)
+                    usable.append(method)
+                except ValueError:
+                    logger.info(f"Skipping '{method}' on {dialect}")
+
+            for n in sorted(int(n) for n in rows):
+                frame = synthetic_transactions(n)
+                for method in usable:
+
+                    def load() -> None:
+                        with engine.begin() as conn:
+                            bulk_insert(conn, frame, BENCHMARK_TABLE, if_exists="replace", method=method, chunksize=chunksize)
+
+                    timings = _time(load, min_repeats, min_seconds)
+                    result = BenchmarkResult(f"ingest.{method}", dialect, n, min(timings), statistics.median(timings), len(timings))
+                    results.append(result)
+                    logger.info(f"{method} [{dialect}] rows={n}: {result.seconds:.3f}s ({result.throughput:,.0f} rows/s)")
+
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+            engine.dispose()
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion bulk-load strategies")
+    parser.add_argument(
+        "--rows", type=_parse_sizes, default=DEFAULT_ROWS, help="Comma-separated row counts, e.g. 1e4,1e5,1e6"
+    )
+    parser.add_argument(
+        "--methods",
+        type=str,
+        default="",
+        help=f"Comma-separated load methods from {', '.join(m for m in LOAD_METHODS if m != 'auto')} (default: all)",
+    )
+    parser.add_argument(
+        "--db_url",
+        action="append",
+        default=[],
+        help="SQLAlchemy URL to benchmark; repeat for several databases (default: temporary SQLite file)",
+    )
+    parser.add_argument("--chunksize", type=int, default=10000, help="Rows per statement, COPY buffer or executemany call")
+    parser.add_argument("--output", type=str, default="", help="Path to write the JSON results")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    methods = [method.strip() for method in args.methods.split(",") if method.strip()] or None
+    results = run_load_benchmarks(args.rows, methods, args.db_url, chunksize=args.chunksize)
+    for result in results:
+        print(f"{result.kernel:<20} {result.backend:<11} {result.size:>11,d} {result.seconds:>10.3f}s {result.throughput:>14,.0f} rows/s")
+    if args.output:
+        save_results(args.output, results)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
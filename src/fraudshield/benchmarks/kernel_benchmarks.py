@@ -0,0 +1,439 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module times every kernel of the data cleaning and feature engineering
+``cpp_wrapper`` modules, plus the rolling feature functions, on the C++ and
+Python fallback paths across data sizes. Results are written as JSON and can
+be compared against a stored baseline to fail on regressions.
+
+File: kernel_benchmarks.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fraudshield.data_cleaning import cpp_wrapper as cleaning
+from fraudshield.feature_engineering import cpp_wrapper as features
+from fraudshield.feature_engineering import rolling_engine
+from fraudshield.feature_engineering.rolling_engine import EntityIndicator, WindowAggregate
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("cpp", "python")
+DEFAULT_SIZES = [10**exponent for exponent in range(3, 9)]
+DEFAULT_THRESHOLD = 0.25
+# Larger sizes of a kernel/backend are skipped once one size takes longer than this
+DEFAULT_MAX_SECONDS = 30.0
+# Baseline timings below this are too noisy to flag as regressions
+DEFAULT_NOISE_FLOOR = 1e-4
+RESULTS_VERSION = 1
+
+# Transactions per entity in the generated grouped data
+_ROWS_PER_ENTITY = 50
+_BATCH_ARRAYS = 8
+_MATRIX_COLUMNS = 8
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timing of one kernel on one backend at one input size.
+
+    Attributes:
+        kernel: Kernel name, see ``kernel_names()``
+        backend: ``cpp`` or ``python``
+        size: Number of input elements
+        seconds: Fastest repeat, in seconds
+        median_seconds: Median repeat, in seconds
+        repeats: Timed repeats after one warm-up call
+    """
+
+    kernel: str
+    backend: str
+    size: int
+    seconds: float
+    median_seconds: float
+    repeats: int
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.kernel, self.backend, self.size
+
+    @property
+    def throughput(self) -> float:
+        """Elements per second, from the fastest repeat."""
+        return self.size / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class Regression:
+    """A result slower than its baseline by more than the allowed threshold."""
+
+    kernel: str
+    backend: str
+    size: int
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.seconds / self.baseline_seconds
+
+
+class _Inputs:
+    """Synthetic inputs of ``n`` elements, built lazily and shared by every kernel at that size."""
+
+    def __init__(self, n: int, seed: int = 0) -> None:
+        self.n = n
+        self._rng = np.random.default_rng(seed)
+        self._cache: Dict[str, Any] = {}
+
+    def _cached(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def values(self) -> np.ndarray:
+        def build() -> np.ndarray:
+            values = self._rng.normal(100.0, 20.0, self.n)
+            values[self._rng.random(self.n) < 0.01] = np.nan
+            return values
+
+        return self._cached("values", build)
+
+    @property
+    def series(self) -> np.ndarray:
+        return self._cached("series", lambda: 100.0 + np.cumsum(self._rng.normal(0.0, 1.0, self.n)))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._cached("matrix", lambda: self.values[: self.n - self.n % _MATRIX_COLUMNS].reshape(-1, _MATRIX_COLUMNS))
+
+    @property
+    def batch(self) -> List[np.ndarray]:
+        return self._cached("batch", lambda: np.array_split(self.series, _BATCH_ARRAYS))
+
+    @property
+    def entities(self) -> np.ndarray:
+        """Entity id per row, rows in time order."""
+        return self._cached("entities", lambda: self._rng.integers(0, max(1, self.n // _ROWS_PER_ENTITY), self.n))
+
+    @property
+    def times(self) -> np.ndarray:
+        """Non-decreasing int64 epoch nanoseconds over roughly a year."""
+        return self._cached(
+            "times",
+            lambda: np.sort(self._rng.integers(0, 365 * 86_400, self.n)).astype(np.int64) * 10**9 + 1_700_000_000 * 10**9,
+        )
+
+    @property
+    def grouped(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(codes, times, values)`` ordered by (entity, time), as the grouped kernels expect."""
+
+        def build() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            order = np.argsort(self.entities, kind="stable")
+            return self.entities[order].astype(np.int64), self.times[order], self.values[order]
+
+        return self._cached("grouped", build)
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._cached("offsets", lambda: rolling_engine.segment_offsets(self.grouped[0]))
+
+
+_WINDOWS_NS = [3_600 * 10**9, 86_400 * 10**9, 7 * 86_400 * 10**9]
+_AGGREGATES = ["count", "sum", "mean", "min", "max"]
+_ROLLING_WINDOWS = ["1h", "24h", "7d"]
+
+# name -> callable taking the shared inputs; each call is one timed run
+KERNELS: Dict[str, Callable[[_Inputs], Any]] = {
+    "cleaning.remove_missing_values": lambda x: cleaning.remove_missing_values(x.values),
+    "cleaning.remove_outliers": lambda x: cleaning.remove_outliers(x.series, 3.0),
+    "cleaning.summarize_outliers": lambda x: cleaning.summarize_outliers(x.values, 3.0),
+    "cleaning.summarize_outliers_batch": lambda x: cleaning.summarize_outliers_batch(x.batch, 3.0),
+    "cleaning.summarize_columns": lambda x: cleaning.summarize_columns(x.matrix, 3.0, winsorize=True),
+    "features.calculate_moving_average": lambda x: features.calculate_moving_average(x.series, 20),
+    "features.calculate_exponential_moving_average": lambda x: features.calculate_exponential_moving_average(
+        x.series, 0.1
+    ),
+    "features.calculate_relative_strength_index": lambda x: features.calculate_relative_strength_index(x.series, 14),
+    "features.calculate_moving_average_batch": lambda x: features.calculate_moving_average_batch(x.batch, 20),
+    "features.calculate_exponential_moving_average_batch": lambda x: features.calculate_exponential_moving_average_batch(
+        x.batch, 0.1
+    ),
+    "features.calculate_relative_strength_index_batch": lambda x: features.calculate_relative_strength_index_batch(
+        x.batch, 14
+    ),
+    "features.segmented_moving_average": lambda x: features.segmented_moving_average(x.grouped[2], x.offsets, 5),
+    "features.segmented_exponential_moving_average": lambda x: features.segmented_exponential_moving_average(
+        x.grouped[2], x.offsets, 0.3
+    ),
+    "features.segmented_relative_strength_index": lambda x: features.segmented_relative_strength_index(
+        x.grouped[2], x.offsets, 14
+    ),
+    "features.grouped_expanding_stats": lambda x: features.grouped_expanding_stats(x.grouped[0], x.grouped[2]),
+    "features.grouped_window_aggregates": lambda x: features.grouped_window_aggregates(
+        x.grouped[0], x.grouped[1], x.grouped[2], _WINDOWS_NS, _AGGREGATES
+    ),
+    "rolling.compute_window_aggregates": lambda x: rolling_engine.compute_window_aggregates(
+        x.entities,
+        x.times,
+        {"amount": x.values},
+        _ROLLING_WINDOWS,
+        [WindowAggregate(f"amount_{agg}", "amount", agg) for agg in _AGGREGATES],
+    ),
+    "rolling.time_since_last": lambda x: rolling_engine.time_since_last(x.entities, x.times),
+    "rolling.expanding_stats": lambda x: rolling_engine.expanding_stats(x.entities, x.times, x.values),
+    "rolling.entity_indicators": lambda x: rolling_engine.entity_indicators(
+        x.entities,
+        x.times,
+        x.values,
+        [EntityIndicator("ma", "ma", 5), EntityIndicator("ema", "ema", 0.3), EntityIndicator("rsi", "rsi", 14)],
+    ),
+}
+
+
+def kernel_names() -> List[str]:
+    """Names of every benchmarked kernel."""
+    return list(KERNELS)
+
+
+@contextmanager
+def _backend(name: str) -> Iterator[None]:
+    """Route both ``cpp_wrapper`` modules to the C++ kernels or the Python fallbacks."""
+    saved = cleaning.CPP_AVAILABLE, features.CPP_AVAILABLE
+    cleaning.CPP_AVAILABLE = features.CPP_AVAILABLE = name == "cpp"
+    try:
+        yield
+    finally:
+        cleaning.CPP_AVAILABLE, features.CPP_AVAILABLE = saved
+
+
+def _time(run: Callable[[], Any], min_repeats: int, min_seconds: float) -> List[float]:
+    run()
+    timings: List[float] = []
+    while len(timings) < min_repeats or sum(timings) < min_seconds:
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        # One slow repeat is enough once a call takes longer than the time target
+        if timings[-1] >= min_seconds:
+            break
+    return timings
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = tuple(DEFAULT_SIZES),
+    kernels: Optional[Sequence[str]] = None,
+    backends: Sequence[str] = BACKENDS,
+    min_repeats: int = 3,
+    min_seconds: float = 0.2,
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+) -> List[BenchmarkResult]:
+    """
+    Time kernels on each backend at each input size.
+
+    Args:
+        sizes: Input sizes in elements, run in ascending order
+        kernels: Kernel names to run (default: all, see ``kernel_names()``)
+        backends: Any of ``cpp`` and ``python``; ``cpp`` is skipped when the
+            extensions are not built
+        min_repeats: Timed repeats per measurement (fewer for calls slower than ``min_seconds``)
+        min_seconds: Keep repeating until the repeats add up to this many seconds
+        max_seconds: Once a kernel/backend call takes longer than this, its larger sizes are skipped
+
+    Returns:
+        One BenchmarkResult per kernel, backend and size that ran
+    """
+    names = list(kernels) if kernels is not None else kernel_names()
+    unknown = set(names) - set(KERNELS)
+    if unknown:
+        raise ValueError(f"Unknown kernels {sorted(unknown)}. Use any of {kernel_names()}.")
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        raise ValueError(f"Unknown backends {sorted(unknown)}. Use any of {BACKENDS}.")
+    if "cpp" in backends and not (cleaning.is_cpp_available() and features.is_cpp_available()):
+        logger.warning("C++ modules not built; benchmarking the Python fallbacks only.")
+        backends = [backend for backend in backends if backend != "cpp"]
+
+    results: List[BenchmarkResult] = []
+    too_slow = set()
+    for size in sorted(int(size) for size in sizes):
+        inputs = _Inputs(size)
+        for name in names:
+            for backend in backends:
+                if (name, backend) in too_slow:
+                    continue
+                with _backend(backend):
+                    timings = _time(lambda: KERNELS[name](inputs), min_repeats, min_seconds)
+                result = BenchmarkResult(name, backend, size, min(timings), statistics.median(timings), len(timings))
+                results.append(result)
+                logger.info(f"{name} [{backend}] n={size}: {result.seconds:.6f}s ({result.throughput:.3g} elements/s)")
+                if result.seconds > max_seconds:
+                    logger.info(f"Skipping larger sizes of {name} [{backend}] ({result.seconds:.1f}s > {max_seconds}s)")
+                    too_slow.add((name, backend))
+    return results
+
+
+def save_results(path: str, results: Sequence[BenchmarkResult]) -> None:
+    """
+    Write results with machine metadata as JSON.
+
+    Args:
+        path: Destination file
+        results: Results from ``run_benchmarks``
+    """
+    payload = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "results": [{**asdict(result), "throughput": result.throughput} for result in results],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """
+    Read results written by ``save_results``.
+
+    Args:
+        path: JSON file
+
+    Returns:
+        The stored results
+    """
+    with open(path, encoding="utf-8") as handle:
+        payload = json.load(handle)
+    fields = BenchmarkResult.__dataclass_fields__
+    return [BenchmarkResult(**{k: v for k, v in row.items() if k in fields}) for row in payload["results"]]
+
+
+def compare_to_baseline(
+    results: Sequence[BenchmarkResult],
+    baseline: Sequence[BenchmarkResult],
+    threshold: float = DEFAULT_THRESHOLD,
+    noise_floor: float = DEFAULT_NOISE_FLOOR,
+) -> List[Regression]:
+    """
+    Find results slower than the baseline by more than ``threshold``.
+
+    Args:
+        results: Current results
+        baseline: Stored results; only kernel/backend/size combinations present
+            in both are compared
+        threshold: Allowed relative slowdown, e.g. 0.25 for 25%
+        noise_floor: Baseline timings below this many seconds are not compared
+
+    Returns:
+        Regressions, slowest relative to baseline first
+    """
+    reference = {result.key: result for result in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get(result.key)
+        if base is None or base.seconds < noise_floor:
+            continue
+        if result.seconds > base.seconds * (1.0 + threshold):
+            regressions.append(Regression(result.kernel, result.backend, result.size, base.seconds, result.seconds))
+    return sorted(regressions, key=lambda regression: regression.slowdown, reverse=True)
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(float(size)) for size in value.split(",") if size.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the C++ kernels and Python fallbacks")
+    parser.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        default=DEFAULT_SIZES,
+        help="Comma-separated input sizes, e.g. 1e3,1e4,1e5 (default: 1e3 to 1e8 by decade)",
+    )
+    parser.add_argument(
+        "--kernels",
+        type=str,
+        default="",
+        help="Comma-separated kernel names or module prefixes such as 'cleaning.' or 'rolling.' (default: all)",
+    )
+    parser.add_argument(
+        "--backends", type=str, default=",".join(BACKENDS), help="Comma-separated backends: cpp, python"
+    )
+    parser.add_argument("--output", type=str, default="", help="Path to write the JSON results")
+    parser.add_argument("--baseline", type=str, default="", help="Stored results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative slowdown against the baseline before failing (default: 0.25)",
+    )
+    parser.add_argument(
+        "--max_seconds",
+        type=float,
+        default=DEFAULT_MAX_SECONDS,
+        help="Skip a kernel's larger sizes on a backend once one call takes longer than this",
+    )
+    parser.add_argument("--list", action="store_true", help="List kernel names and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.list:
+        print("\n".join(kernel_names()))
+        return 0
+
+    selected = None
+    if args.kernels:
+        prefixes = [name.strip() for name in args.kernels.split(",") if name.strip()]
+        selected = [
+            name
+            for name in kernel_names()
+            if any(name == prefix or (prefix.endswith(".") and name.startswith(prefix)) for prefix in prefixes)
+        ]
+        if not selected:
+            parser.error(f"No kernels match {prefixes}")
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+
+    results = run_benchmarks(args.sizes, selected, backends, max_seconds=args.max_seconds)
+    for result in results:
+        print(f"{result.kernel:<52} {result.backend:<7} {result.size:>11,d} {result.seconds:>12.6f}s")
+    if args.output:
+        save_results(args.output, results)
+        logger.info(f"Saved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.kernel} [{regression.backend}] n={regression.size}: "
+                f"{regression.baseline_seconds:.6f}s -> {regression.seconds:.6f}s ({regression.slowdown:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
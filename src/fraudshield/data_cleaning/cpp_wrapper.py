@@ -10,6 +10,8 @@ Author: Mudit Bhargava
 License: MIT
 """
 import logging
+import warnings
+from typing import List, NamedTuple, Optional, Sequence
 
 import numpy as np
 
@@ -26,55 +28,302 @@ except ImportError as e:
     logger.warning(f"C++ data cleaning module not available: {e}. Using Python fallback.")
 
 
-def remove_missing_values(data: np.ndarray) -> np.ndarray:
+def _native(data: np.ndarray) -> np.ndarray:
+    """Pass float32/float64 arrays through untouched; convert anything else to float64."""
+    data = np.asarray(data)
+    if data.dtype in (np.float32, np.float64):
+        return data
+    return data.astype(np.float64)
+
+
+def _write_prefix(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    """Copy ``result`` into the start of ``out`` and return that view, mirroring the C++ ``out`` contract."""
+    if out is None:
+        return result
+    if out.dtype != result.dtype or out.ndim != 1 or len(out) < len(result):
+        raise ValueError(f"out must be a one-dimensional {result.dtype} array of at least {len(result)} elements")
+    out[: len(result)] = result
+    return out[: len(result)]
+
+
+def remove_missing_values(data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Remove missing (NaN) values from array.
 
+    float32 and float64 inputs, including strided views, are read in place.
+
     Args:
         data: Input numpy array
+        out: Optional array of the input's dtype and length to write the kept
+            values into; may be ``data`` itself
 
     Returns:
-        Array with NaN values removed
+        Array with NaN values removed (a view of ``out`` when given)
     """
+    data = _native(data)
     if CPP_AVAILABLE:
         try:
-            return _data_cleaning_cpp.remove_missing_values(data.astype(np.float64))
+            return _data_cleaning_cpp.remove_missing_values(data, out=out)
         except Exception as e:
             logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
     # Python fallback
-    return data[~np.isnan(data)]
+    return _write_prefix(data[~np.isnan(data)], out)
 
 
-def remove_outliers(data: np.ndarray, threshold: float = 3.0) -> np.ndarray:
+def remove_outliers(data: np.ndarray, threshold: float = 3.0, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Remove outliers using z-score threshold.
 
+    float32 and float64 inputs, including strided views, are read in place.
+
     Args:
         data: Input numpy array
         threshold: Z-score threshold for outlier detection (default: 3.0)
+        out: Optional array of the input's dtype and length to write the kept
+            values into; may be ``data`` itself
 
     Returns:
-        Array with outliers removed
+        Array with outliers removed (a view of ``out`` when given)
     """
+    data = _native(data)
     if CPP_AVAILABLE:
         try:
-            return _data_cleaning_cpp.remove_outliers(data.astype(np.float64), threshold)
+            return _data_cleaning_cpp.remove_outliers(data, threshold, out=out)
         except Exception as e:
             logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
     # Python fallback
     if len(data) == 0:
-        return data
+        return _write_prefix(data, out)
 
-    mean = np.mean(data)
-    std = np.std(data, ddof=1)
+    mean = np.mean(data, dtype=np.float64)
+    std = np.std(data, ddof=1, dtype=np.float64)
 
     if std == 0:
-        return data
+        return _write_prefix(data, out)
 
     z_scores = np.abs((data - mean) / std)
-    return data[z_scores <= threshold]
+    return _write_prefix(data[z_scores <= threshold], out)
+
+
+class OutlierSummary(NamedTuple):
+    """
+    Result of ``summarize_outliers``.
+
+    Attributes:
+        keep: True for non-missing values inside ``[lower, upper]``
+        mean: Mean of the non-missing values
+        std: Sample standard deviation of the non-missing values
+        lower: ``mean - threshold * std``, or -inf when ``std`` is zero
+        upper: ``mean + threshold * std``, or inf when ``std`` is zero
+        median: Median of the kept values (NaN when nothing is kept)
+        n_missing: Number of NaN values
+        n_outliers: Number of non-missing values outside the bounds
+    """
+
+    keep: np.ndarray
+    mean: float
+    std: float
+    lower: float
+    upper: float
+    median: float
+    n_missing: int
+    n_outliers: int
+
+
+def summarize_outliers(data: np.ndarray, threshold: float = 3.0, out: Optional[np.ndarray] = None) -> OutlierSummary:
+    """
+    Classify missing values and z-score outliers in one call.
+
+    ``data[summary.keep]`` equals ``remove_outliers(remove_missing_values(data), threshold)``,
+    and the summary carries the statistics behind it, so callers do not rescan
+    the column to rebuild the mask or the median.
+
+    Args:
+        data: Input numpy array
+        threshold: Z-score threshold for outlier detection (default: 3.0)
+        out: Optional bool array of ``len(data)`` elements to write the keep mask into
+
+    Returns:
+        OutlierSummary with the keep mask, moments, bounds and kept-value median
+    """
+    data = _native(data)
+    if CPP_AVAILABLE:
+        try:
+            return OutlierSummary(**_data_cleaning_cpp.summarize_outliers(data, threshold, out=out))
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    # Python fallback
+    missing = np.isnan(data)
+    n_valid = len(data) - int(missing.sum())
+    mean = float(np.mean(data[~missing], dtype=np.float64)) if n_valid else np.nan
+    std = float(np.std(data[~missing], ddof=1, dtype=np.float64)) if n_valid > 1 else (0.0 if n_valid else np.nan)
+    keep = ~missing
+    lower, upper = -np.inf, np.inf
+    if std > 0:
+        lower, upper = mean - threshold * std, mean + threshold * std
+        with np.errstate(invalid="ignore"):
+            keep &= np.abs(data - mean) <= threshold * std
+    if out is not None:
+        if out.dtype != np.bool_ or out.shape != keep.shape:
+            raise ValueError(f"out must be a bool array of shape {keep.shape}")
+        out[...] = keep
+        keep = out
+    kept = data[keep]
+    return OutlierSummary(
+        keep=keep,
+        mean=mean,
+        std=std,
+        lower=lower,
+        upper=upper,
+        median=float(np.median(kept)) if len(kept) else np.nan,
+        n_missing=len(data) - n_valid,
+        n_outliers=n_valid - int(keep.sum()),
+    )
+
+
+def summarize_outliers_batch(
+    arrays: Sequence[np.ndarray], threshold: float = 3.0, n_jobs: int = -1
+) -> List[OutlierSummary]:
+    """
+    ``summarize_outliers`` for several independent arrays in one call.
+
+    The C++ module spreads the arrays over a worker pool with the GIL
+    released, so a batch of columns or entities uses several cores.
+
+    Args:
+        arrays: Input numpy arrays; float32/float64 arrays are read in place
+        threshold: Z-score threshold for outlier detection (default: 3.0)
+        n_jobs: Threads to use (-1 uses every core)
+
+    Returns:
+        One OutlierSummary per input array, in input order
+    """
+    arrays = [_native(data) for data in arrays]
+    if CPP_AVAILABLE:
+        try:
+            summaries = _data_cleaning_cpp.summarize_outliers_batch(arrays, threshold, n_threads=max(n_jobs, 0))
+            return [OutlierSummary(**summary) for summary in summaries]
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    return [summarize_outliers(data, threshold) for data in arrays]
+
+
+class ColumnSummary(NamedTuple):
+    """
+    Result of ``summarize_columns``; every statistic holds one entry per column.
+
+    Attributes:
+        keep: Bool matrix, True for non-missing values inside ``[lower, upper]``
+        values: Winsorized matrix (outliers clipped to the bounds, NaN kept), or
+            None unless ``winsorize`` was requested
+        n_missing: NaN count
+        n_outliers: Count of non-missing values outside the bounds
+        mean: Mean of the non-missing values
+        std: Sample standard deviation of the non-missing values
+        median: Median of the non-missing values
+        mad: Median absolute deviation from ``median``
+        lower: Lower clipping bound, or -inf when the column has no spread
+        upper: Upper clipping bound, or inf when the column has no spread
+    """
+
+    keep: np.ndarray
+    values: Optional[np.ndarray]
+    n_missing: np.ndarray
+    n_outliers: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    median: np.ndarray
+    mad: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+
+OUTLIER_METHODS = ("zscore", "mad")
+# Scales the MAD to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+
+def summarize_columns(
+    matrix: np.ndarray,
+    threshold: float = 3.0,
+    method: str = "zscore",
+    winsorize: bool = False,
+    out: Optional[np.ndarray] = None,
+    n_jobs: int = -1,
+) -> ColumnSummary:
+    """
+    Clean every column of a 2-D numeric matrix in one call.
+
+    Columns are processed in parallel by native threads with the GIL released;
+    C- and Fortran-ordered float32/float64 matrices are read in place.
+
+    Args:
+        matrix: 2-D numeric array, one feature per column
+        threshold: Outlier threshold in standard deviations (``zscore``) or
+            scaled MADs (``mad``)
+        method: ``zscore`` (mean/std) or ``mad`` (median/MAD, robust to the outliers themselves)
+        winsorize: Also return the matrix with outliers clipped to the column bounds
+        out: Optional array of the matrix's dtype and shape for the winsorized
+            values; may be ``matrix`` itself to clip in place
+        n_jobs: Threads to use (-1 uses every core)
+
+    Returns:
+        ColumnSummary with the keep mask, optional winsorized matrix and per-column statistics
+    """
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Unsupported outlier method '{method}'; expected one of {OUTLIER_METHODS}")
+    matrix = _native(matrix)
+    if CPP_AVAILABLE:
+        try:
+            result = _data_cleaning_cpp.summarize_columns(
+                matrix, threshold, method, winsorize, out=out, n_threads=max(n_jobs, 0)
+            )
+            return ColumnSummary(**result)
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    # Python fallback: column-wise NumPy reductions, no loop over columns
+    if matrix.ndim != 2:
+        raise ValueError("matrix must be two-dimensional")
+    missing = np.isnan(matrix)
+    n_valid = len(matrix) - missing.sum(axis=0)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(matrix, axis=0, dtype=np.float64)
+        std = np.where(n_valid == 1, 0.0, np.nanstd(matrix, axis=0, ddof=1, dtype=np.float64))
+        median = np.nanmedian(matrix.astype(np.float64, copy=False), axis=0)
+        mad = np.nanmedian(np.abs(matrix - median), axis=0)
+        center, scale = (mean, std) if method == "zscore" else (median, MAD_SCALE * mad)
+        bounded = scale > 0
+        lower = np.where(bounded, center - threshold * scale, -np.inf)
+        upper = np.where(bounded, center + threshold * scale, np.inf)
+        outlier = bounded & (np.abs(matrix - center) > threshold * scale)
+
+    values = None
+    if winsorize:
+        clipped = np.where(outlier, np.where(matrix < center, lower, upper), matrix).astype(matrix.dtype, copy=False)
+        if out is not None:
+            if out.dtype != matrix.dtype or out.shape != matrix.shape:
+                raise ValueError(f"out must be a {matrix.dtype} array of shape {matrix.shape}")
+            out[...] = clipped
+            clipped = out
+        values = clipped
+    return ColumnSummary(
+        keep=~(missing | outlier),
+        values=values,
+        n_missing=missing.sum(axis=0).astype(np.int64),
+        n_outliers=outlier.sum(axis=0).astype(np.int64),
+        mean=mean,
+        std=std,
+        median=median,
+        mad=mad,
+        lower=lower,
+        upper=upper,
+    )
 
 
 def is_cpp_available() -> bool:
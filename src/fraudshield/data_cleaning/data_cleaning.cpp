@@ -10,37 +10,307 @@
 #include <numeric>
 #include <cmath>
 #include <limits>
+#include <cstdint>
+#include <type_traits>
+#include <atomic>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <thread>
 
 namespace py = pybind11;
 
+// Typed view over a NumPy buffer or std::vector. The stride is in bytes, so sliced
+// and reversed arrays are read in place instead of being copied to a contiguous vector.
+template <typename T>
+struct StridedArray {
+    char* data;
+    py::ssize_t stride;
+    size_t size;
+
+    StridedArray(T* ptr, py::ssize_t stride_bytes, size_t n)
+        : data(reinterpret_cast<char*>(const_cast<typename std::remove_const<T>::type*>(ptr))),
+          stride(stride_bytes), size(n) {}
+    explicit StridedArray(std::vector<typename std::remove_const<T>::type>& vec)
+        : StridedArray(vec.data(), sizeof(T), vec.size()) {}
+    explicit StridedArray(const std::vector<typename std::remove_const<T>::type>& vec)
+        : StridedArray(vec.data(), sizeof(T), vec.size()) {}
+
+    T& operator[](size_t i) const {
+        return *reinterpret_cast<T*>(data + static_cast<py::ssize_t>(i) * stride);
+    }
+};
+
 class DataCleaning {
 public:
-    static void remove_missing_values(std::vector<double>& data) {
-        data.erase(std::remove_if(data.begin(), data.end(), [](double value) { return std::isnan(value); }), data.end());
+    // Strided kernels: read input[i] and write the kept values to output[0..k).
+    // output may alias input because every write lands at or before the read position.
+    template <typename T>
+    static size_t copy_non_missing(const StridedArray<const T>& input, const StridedArray<T>& output) {
+        size_t k = 0;
+        for (size_t i = 0; i < input.size; ++i) {
+            T value = input[i];
+            if (!std::isnan(value)) {
+                output[k++] = value;
+            }
+        }
+        return k;
     }
 
-    static double calculate_mean(const std::vector<double>& data) {
-        if (data.empty()) {
+    template <typename T>
+    static double strided_mean(const StridedArray<const T>& data) {
+        if (data.size == 0) {
             throw std::invalid_argument("Data vector is empty.");
         }
-        double sum = std::accumulate(data.begin(), data.end(), 0.0);
-        return sum / data.size();
+        double sum = 0.0;
+        for (size_t i = 0; i < data.size; ++i) {
+            sum += data[i];
+        }
+        return sum / data.size;
     }
 
-    static double calculate_stddev(const std::vector<double>& data, double mean) {
-        if (data.empty()) {
+    template <typename T>
+    static double strided_stddev(const StridedArray<const T>& data, double mean) {
+        if (data.size == 0) {
             throw std::invalid_argument("Data vector is empty.");
         }
-        if (data.size() < 2) {
+        if (data.size < 2) {
             return 0.0;
         }
         double sq_sum = 0.0;
-        for (std::vector<double>::const_iterator it = data.begin(); it != data.end(); ++it) {
-            double diff = *it - mean;
+        for (size_t i = 0; i < data.size; ++i) {
+            double diff = data[i] - mean;
             sq_sum += diff * diff;
         }
         // Use sample standard deviation (n-1) instead of population (n)
-        return std::sqrt(sq_sum / (data.size() - 1));
+        return std::sqrt(sq_sum / (data.size - 1));
+    }
+
+    template <typename T>
+    static size_t copy_inliers(const StridedArray<const T>& input, double threshold, const StridedArray<T>& output) {
+        if (input.size == 0) {
+            return 0;
+        }
+        double mean = strided_mean(input);
+        double stddev = strided_stddev(input, mean);
+        OutlierPredicate is_outlier(mean, stddev, threshold);
+        size_t k = 0;
+        for (size_t i = 0; i < input.size; ++i) {
+            T value = input[i];
+            if (stddev == 0.0 || !is_outlier(value)) {
+                output[k++] = value;
+            }
+        }
+        return k;
+    }
+
+    struct OutlierSummary {
+        double mean;
+        double stddev;
+        double lower;
+        double upper;
+        double median;
+        size_t n_missing;
+        size_t n_outliers;
+    };
+
+    // Reads the input twice, once for Welford moments and once for the mask: keep[i] is
+    // 1 for non-missing values within threshold * stddev of the mean (the values
+    // remove_outliers(remove_missing_values(x)) keeps) and 0 otherwise. The median of the
+    // kept values is selected from scratch with nth_element instead of a full sort.
+    template <typename T>
+    static OutlierSummary summarize_outliers(
+        const StridedArray<const T>& input,
+        double threshold,
+        const StridedArray<uint8_t>& keep,
+        std::vector<double>& scratch) {
+        const double nan = std::numeric_limits<double>::quiet_NaN();
+        const double inf = std::numeric_limits<double>::infinity();
+
+        // Welford's update over the non-missing values
+        size_t n_valid = 0;
+        double mean = 0.0;
+        double m2 = 0.0;
+        for (size_t i = 0; i < input.size; ++i) {
+            double value = input[i];
+            if (std::isnan(value)) {
+                continue;
+            }
+            ++n_valid;
+            double delta = value - mean;
+            mean += delta / n_valid;
+            m2 += delta * (value - mean);
+        }
+
+        OutlierSummary summary;
+        summary.n_missing = input.size - n_valid;
+        summary.n_outliers = 0;
+        summary.mean = (n_valid > 0) ? mean : nan;
+        // Sample standard deviation (n-1), matching calculate_stddev
+        summary.stddev = (n_valid > 1) ? std::sqrt(m2 / (n_valid - 1)) : ((n_valid == 1) ? 0.0 : nan);
+        // A zero spread keeps every value, as remove_outliers does
+        bool bounded = (summary.stddev > 0.0);
+        summary.lower = bounded ? mean - threshold * summary.stddev : -inf;
+        summary.upper = bounded ? mean + threshold * summary.stddev : inf;
+
+        OutlierPredicate is_outlier(mean, summary.stddev, threshold);
+        scratch.clear();
+        scratch.reserve(n_valid);
+        for (size_t i = 0; i < input.size; ++i) {
+            double value = input[i];
+            bool kept = !std::isnan(value) && !(bounded && is_outlier(value));
+            keep[i] = kept ? 1 : 0;
+            if (kept) {
+                scratch.push_back(value);
+            } else if (!std::isnan(value)) {
+                ++summary.n_outliers;
+            }
+        }
+
+        summary.median = median_in_place(scratch);
+        return summary;
+    }
+
+    // Median by selection; reorders values. NaN for an empty vector.
+    static double median_in_place(std::vector<double>& values) {
+        if (values.empty()) {
+            return std::numeric_limits<double>::quiet_NaN();
+        }
+        size_t mid = values.size() / 2;
+        std::nth_element(values.begin(), values.begin() + mid, values.end());
+        double median = values[mid];
+        if (values.size() % 2 == 0) {
+            double lower_mid = *std::max_element(values.begin(), values.begin() + mid);
+            median = (lower_mid + median) / 2.0;
+        }
+        return median;
+    }
+
+    enum class OutlierMethod { ZScore, Mad };
+
+    struct ColumnSummary {
+        int64_t n_missing;
+        int64_t n_outliers;
+        double mean;
+        double stddev;
+        double median;
+        double mad;
+        double lower;
+        double upper;
+    };
+
+    // Cleans one column: moments, median and MAD of the non-missing values, then the keep
+    // mask and (when winsorized is non-null) the column clipped to [lower, upper]. Outliers
+    // lie beyond threshold * stddev of the mean (ZScore) or threshold * 1.4826 * MAD of the
+    // median (Mad); a zero spread flags nothing. NaN stays NaN in the winsorized column.
+    template <typename T>
+    static ColumnSummary summarize_column(
+        const StridedArray<const T>& column,
+        double threshold,
+        OutlierMethod method,
+        const StridedArray<uint8_t>& keep,
+        const StridedArray<T>* winsorized,
+        std::vector<double>& scratch) {
+        const double nan = std::numeric_limits<double>::quiet_NaN();
+        const double inf = std::numeric_limits<double>::infinity();
+
+        scratch.clear();
+        double mean = 0.0;
+        double m2 = 0.0;
+        for (size_t i = 0; i < column.size; ++i) {
+            double value = column[i];
+            if (std::isnan(value)) {
+                continue;
+            }
+            scratch.push_back(value);
+            double delta = value - mean;
+            mean += delta / scratch.size();
+            m2 += delta * (value - mean);
+        }
+
+        const size_t n_valid = scratch.size();
+        ColumnSummary summary;
+        summary.n_missing = static_cast<int64_t>(column.size - n_valid);
+        summary.n_outliers = 0;
+        summary.mean = (n_valid > 0) ? mean : nan;
+        summary.stddev = (n_valid > 1) ? std::sqrt(m2 / (n_valid - 1)) : ((n_valid == 1) ? 0.0 : nan);
+        summary.median = median_in_place(scratch);
+        for (size_t i = 0; i < n_valid; ++i) {
+            scratch[i] = std::abs(scratch[i] - summary.median);
+        }
+        summary.mad = median_in_place(scratch);
+
+        double center = (method == OutlierMethod::ZScore) ? summary.mean : summary.median;
+        double scale = (method == OutlierMethod::ZScore) ? summary.stddev : 1.4826 * summary.mad;
+        bool bounded = (scale > 0.0);
+        summary.lower = bounded ? center - threshold * scale : -inf;
+        summary.upper = bounded ? center + threshold * scale : inf;
+
+        OutlierPredicate is_outlier(center, scale, threshold);
+        for (size_t i = 0; i < column.size; ++i) {
+            T value = column[i];
+            bool missing = std::isnan(value);
+            bool outlier = !missing && bounded && is_outlier(value);
+            keep[i] = (missing || outlier) ? 0 : 1;
+            if (outlier) {
+                ++summary.n_outliers;
+            }
+            if (winsorized != nullptr) {
+                (*winsorized)[i] = outlier ? static_cast<T>(value < center ? summary.lower : summary.upper) : value;
+            }
+        }
+        return summary;
+    }
+
+    // Runs task(index, scratch) for every index in [0, n_tasks) on up to n_threads threads,
+    // each with its own scratch buffer. The first exception is rethrown after all threads join.
+    static void parallel_for(size_t n_tasks, int n_threads, const std::function<void(size_t, std::vector<double>&)>& task) {
+        size_t workers = (n_threads > 0) ? static_cast<size_t>(n_threads) : std::max(1u, std::thread::hardware_concurrency());
+        workers = std::max<size_t>(1, std::min(workers, n_tasks));
+
+        std::atomic<size_t> next(0);
+        std::exception_ptr error;
+        std::mutex error_mutex;
+        auto worker = [&]() {
+            std::vector<double> scratch;
+            for (size_t index = next++; index < n_tasks; index = next++) {
+                try {
+                    task(index, scratch);
+                } catch (...) {
+                    std::lock_guard<std::mutex> lock(error_mutex);
+                    if (!error) {
+                        error = std::current_exception();
+                    }
+                }
+            }
+        };
+
+        if (workers == 1) {
+            worker();
+        } else {
+            std::vector<std::thread> threads;
+            for (size_t t = 0; t < workers; ++t) {
+                threads.emplace_back(worker);
+            }
+            for (std::thread& thread : threads) {
+                thread.join();
+            }
+        }
+        if (error) {
+            std::rethrow_exception(error);
+        }
+    }
+
+    static void remove_missing_values(std::vector<double>& data) {
+        data.resize(copy_non_missing(StridedArray<const double>(data), StridedArray<double>(data)));
+    }
+
+    static double calculate_mean(const std::vector<double>& data) {
+        return strided_mean(StridedArray<const double>(data));
+    }
+
+    static double calculate_stddev(const std::vector<double>& data, double mean) {
+        return strided_stddev(StridedArray<const double>(data), mean);
     }
 
     struct OutlierPredicate {
@@ -55,63 +325,310 @@ public:
     };
 
     static void remove_outliers(std::vector<double>& data, double threshold) {
-        if (data.empty()) {
-            return;
+        data.resize(copy_inliers(StridedArray<const double>(data), threshold, StridedArray<double>(data)));
+    }
+};
+
+// Python bindings using pybind11. Inputs are taken without forcecast, so float32 and
+// float64 arrays (strided or not) bind to their own overload without a conversion copy.
+// Kernels run with the GIL released, so Python threads calling them run in parallel.
+template <typename T>
+using InputArray = py::array_t<T, 0>;
+
+template <typename T>
+StridedArray<const T> input_view(const InputArray<T>& input) {
+    if (input.ndim() != 1) {
+        throw std::invalid_argument("Input must be a one-dimensional array.");
+    }
+    return StridedArray<const T>(input.data(), input.strides(0), static_cast<size_t>(input.shape(0)));
+}
+
+// Validates a caller-provided output array; it must match the input dtype so results
+// are written in place rather than into a converted temporary.
+template <typename T>
+py::array_t<T> output_array(const py::object& out, size_t size) {
+    if (out.is_none()) {
+        return py::array_t<T>(size);
+    }
+    if (!py::isinstance<py::array_t<T>>(out)) {
+        throw py::type_error("out must be a NumPy array with the same dtype as the input.");
+    }
+    py::array_t<T> array = py::reinterpret_borrow<py::array_t<T>>(out);
+    if (array.ndim() != 1 || static_cast<size_t>(array.shape(0)) < size) {
+        throw std::invalid_argument("out must be a one-dimensional array of at least " + std::to_string(size) + " elements.");
+    }
+    if (!array.writeable()) {
+        throw std::invalid_argument("out must be writeable.");
+    }
+    return array;
+}
+
+template <typename T>
+StridedArray<T> output_view(py::array_t<T>& output) {
+    return StridedArray<T>(output.mutable_data(), output.strides(0), static_cast<size_t>(output.shape(0)));
+}
+
+// Returns the first ``kept`` elements: a view of the caller's ``out``, or the trimmed new array.
+template <typename T>
+py::object kept_prefix(py::array_t<T> output, const py::object& out, size_t kept) {
+    if (out.is_none()) {
+        output.resize({kept}, false);
+        return std::move(output);
+    }
+    return output[py::slice(0, static_cast<py::ssize_t>(kept), 1)];
+}
+
+template <typename T>
+py::object remove_missing_values_py(InputArray<T> input, py::object out) {
+    StridedArray<const T> data = input_view(input);
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    size_t kept;
+    {
+        py::gil_scoped_release release;
+        kept = DataCleaning::copy_non_missing(data, output_data);
+    }
+    return kept_prefix(output, out, kept);
+}
+
+template <typename T>
+py::object remove_outliers_py(InputArray<T> input, double threshold, py::object out) {
+    StridedArray<const T> data = input_view(input);
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    size_t kept;
+    {
+        py::gil_scoped_release release;
+        kept = DataCleaning::copy_inliers(data, threshold, output_data);
+    }
+    return kept_prefix(output, out, kept);
+}
+
+py::dict outlier_summary_dict(const py::array_t<bool>& keep, const DataCleaning::OutlierSummary& summary) {
+    py::dict result;
+    result["keep"] = keep;
+    result["mean"] = summary.mean;
+    result["std"] = summary.stddev;
+    result["lower"] = summary.lower;
+    result["upper"] = summary.upper;
+    result["median"] = summary.median;
+    result["n_missing"] = summary.n_missing;
+    result["n_outliers"] = summary.n_outliers;
+    return result;
+}
+
+template <typename T>
+py::dict summarize_outliers_py(InputArray<T> input, double threshold, py::object out) {
+    StridedArray<const T> data = input_view(input);
+    py::array_t<bool> keep;
+    if (out.is_none()) {
+        keep = py::array_t<bool>(data.size);
+    } else {
+        if (!py::isinstance<py::array_t<bool>>(out)) {
+            throw py::type_error("out must be a NumPy bool array.");
         }
-        double mean = calculate_mean(data);
-        double stddev = calculate_stddev(data, mean);
-        if (stddev == 0.0) {
-            return;
+        keep = py::reinterpret_borrow<py::array_t<bool>>(out);
+        if (keep.ndim() != 1 || static_cast<size_t>(keep.shape(0)) != data.size) {
+            throw std::invalid_argument("out must be a one-dimensional array of " + std::to_string(data.size) + " elements.");
+        }
+    }
+    StridedArray<uint8_t> keep_view(reinterpret_cast<uint8_t*>(keep.mutable_data()), keep.strides(0), data.size);
+
+    DataCleaning::OutlierSummary summary;
+    {
+        py::gil_scoped_release release;
+        std::vector<double> scratch;
+        summary = DataCleaning::summarize_outliers(data, threshold, keep_view, scratch);
+    }
+    return outlier_summary_dict(keep, summary);
+}
+
+// One element of a batch call: a 1-D float32 or float64 array, read in place.
+struct BatchInput {
+    bool is_float;
+    const char* data;
+    py::ssize_t stride;
+    size_t size;
+
+    template <typename Fn>
+    void visit(Fn&& fn) const {
+        if (is_float) {
+            fn(StridedArray<const float>(reinterpret_cast<const float*>(data), stride, size));
+        } else {
+            fn(StridedArray<const double>(reinterpret_cast<const double*>(data), stride, size));
         }
-        data.erase(std::remove_if(data.begin(), data.end(), OutlierPredicate(mean, stddev, threshold)), data.end());
     }
 };
 
-// Python bindings using pybind11
-py::array_t<double> remove_missing_values_py(py::array_t<double> input) {
-    py::buffer_info buf = input.request();
-    double* ptr = static_cast<double*>(buf.ptr);
-    size_t total = buf.size;
-    
-    std::vector<double> data_vec(ptr, ptr + total);
-    DataCleaning::remove_missing_values(data_vec);
-    
-    // Create output array with cleaned data
-    py::array_t<double> result(data_vec.size());
-    py::buffer_info result_buf = result.request();
-    double* result_ptr = static_cast<double*>(result_buf.ptr);
-    std::copy(data_vec.begin(), data_vec.end(), result_ptr);
-    
-    return result;
+// ``owners`` keeps every buffer alive while worker threads run without the GIL, even if
+// another thread mutates the input list meanwhile.
+std::vector<BatchInput> batch_inputs(const py::sequence& inputs, std::vector<py::array>& owners) {
+    std::vector<BatchInput> batch;
+    batch.reserve(inputs.size());
+    for (py::handle item : inputs) {
+        bool is_float = py::isinstance<py::array_t<float>>(item);
+        if (!is_float && !py::isinstance<py::array_t<double>>(item)) {
+            throw py::type_error("Batch inputs must be float32 or float64 NumPy arrays.");
+        }
+        py::array array = py::reinterpret_borrow<py::array>(item);
+        if (array.ndim() != 1) {
+            throw std::invalid_argument("Batch inputs must be one-dimensional arrays.");
+        }
+        owners.push_back(array);
+        batch.push_back(BatchInput{is_float, static_cast<const char*>(array.data()), array.strides(0),
+                                   static_cast<size_t>(array.shape(0))});
+    }
+    return batch;
 }
 
-py::array_t<double> remove_outliers_py(py::array_t<double> input, double threshold) {
-    py::buffer_info buf = input.request();
-    double* ptr = static_cast<double*>(buf.ptr);
-    size_t total = buf.size;
-    
-    std::vector<double> data_vec(ptr, ptr + total);
-    DataCleaning::remove_outliers(data_vec, threshold);
-    
-    // Create output array with cleaned data
-    py::array_t<double> result(data_vec.size());
-    py::buffer_info result_buf = result.request();
-    double* result_ptr = static_cast<double*>(result_buf.ptr);
-    std::copy(data_vec.begin(), data_vec.end(), result_ptr);
-    
+py::list summarize_outliers_batch_py(py::sequence inputs, double threshold, int n_threads) {
+    std::vector<py::array> owners;
+    std::vector<BatchInput> batch = batch_inputs(inputs, owners);
+    std::vector<py::array_t<bool>> keeps;
+    std::vector<StridedArray<uint8_t>> keep_views;
+    for (const BatchInput& input : batch) {
+        keeps.emplace_back(input.size);
+        keep_views.emplace_back(reinterpret_cast<uint8_t*>(keeps.back().mutable_data()), sizeof(bool), input.size);
+    }
+
+    std::vector<DataCleaning::OutlierSummary> summaries(batch.size());
+    {
+        py::gil_scoped_release release;
+        DataCleaning::parallel_for(batch.size(), n_threads, [&](size_t i, std::vector<double>& scratch) {
+            batch[i].visit([&](const auto& data) {
+                summaries[i] = DataCleaning::summarize_outliers(data, threshold, keep_views[i], scratch);
+            });
+        });
+    }
+
+    py::list results;
+    for (size_t i = 0; i < batch.size(); ++i) {
+        results.append(outlier_summary_dict(keeps[i], summaries[i]));
+    }
+    return results;
+}
+
+template <typename T>
+py::dict summarize_columns_py(
+    InputArray<T> input, double threshold, const std::string& method, bool winsorize, py::object out, int n_threads) {
+    if (input.ndim() != 2) {
+        throw std::invalid_argument("Input must be a two-dimensional array.");
+    }
+    DataCleaning::OutlierMethod outlier_method;
+    if (method == "zscore") {
+        outlier_method = DataCleaning::OutlierMethod::ZScore;
+    } else if (method == "mad") {
+        outlier_method = DataCleaning::OutlierMethod::Mad;
+    } else {
+        throw std::invalid_argument("Unsupported outlier method: " + method);
+    }
+    const size_t rows = static_cast<size_t>(input.shape(0));
+    const size_t cols = static_cast<size_t>(input.shape(1));
+
+    py::array_t<bool> keep({rows, cols});
+    py::array_t<int64_t> n_missing(cols), n_outliers(cols);
+    py::array_t<double> mean(cols), stddev(cols), median(cols), mad(cols), lower(cols), upper(cols);
+    py::object winsorized = py::none();
+    py::array_t<T> values;
+    if (winsorize) {
+        if (out.is_none()) {
+            values = py::array_t<T>({rows, cols});
+        } else {
+            if (!py::isinstance<py::array_t<T>>(out)) {
+                throw py::type_error("out must be a NumPy array with the same dtype as the input.");
+            }
+            values = py::reinterpret_borrow<py::array_t<T>>(out);
+            if (values.ndim() != 2 || values.shape(0) != input.shape(0) || values.shape(1) != input.shape(1)) {
+                throw std::invalid_argument("out must have the same shape as the input.");
+            }
+        }
+        values.mutable_data();  // raises for read-only arrays while the GIL is still held
+        winsorized = values;
+    }
+
+    // Raw pointers and strides only from here on, so the GIL can be released
+    const char* in_ptr = reinterpret_cast<const char*>(input.data());
+    const py::ssize_t in_row = input.strides(0), in_col = input.strides(1);
+    char* keep_ptr = reinterpret_cast<char*>(keep.mutable_data());
+    const py::ssize_t keep_row = keep.strides(0), keep_col = keep.strides(1);
+    char* values_ptr = winsorize ? reinterpret_cast<char*>(values.mutable_data()) : nullptr;
+    const py::ssize_t values_row = winsorize ? values.strides(0) : 0;
+    const py::ssize_t values_col = winsorize ? values.strides(1) : 0;
+    int64_t* n_missing_ptr = n_missing.mutable_data();
+    int64_t* n_outliers_ptr = n_outliers.mutable_data();
+    double* stats[6] = { mean.mutable_data(), stddev.mutable_data(), median.mutable_data(),
+                         mad.mutable_data(), lower.mutable_data(), upper.mutable_data() };
+
+    {
+        py::gil_scoped_release release;
+        DataCleaning::parallel_for(cols, n_threads, [&](size_t j, std::vector<double>& scratch) {
+            StridedArray<const T> column(reinterpret_cast<const T*>(in_ptr + j * in_col), in_row, rows);
+            StridedArray<uint8_t> keep_column(reinterpret_cast<uint8_t*>(keep_ptr + j * keep_col), keep_row, rows);
+            StridedArray<T> winsorized_column(reinterpret_cast<T*>(values_ptr + j * values_col), values_row, rows);
+            DataCleaning::ColumnSummary summary = DataCleaning::summarize_column(
+                column, threshold, outlier_method, keep_column, winsorize ? &winsorized_column : nullptr, scratch);
+            n_missing_ptr[j] = summary.n_missing;
+            n_outliers_ptr[j] = summary.n_outliers;
+            stats[0][j] = summary.mean;
+            stats[1][j] = summary.stddev;
+            stats[2][j] = summary.median;
+            stats[3][j] = summary.mad;
+            stats[4][j] = summary.lower;
+            stats[5][j] = summary.upper;
+        });
+    }
+
+    py::dict result;
+    result["keep"] = keep;
+    result["values"] = winsorized;
+    result["n_missing"] = n_missing;
+    result["n_outliers"] = n_outliers;
+    result["mean"] = mean;
+    result["std"] = stddev;
+    result["median"] = median;
+    result["mad"] = mad;
+    result["lower"] = lower;
+    result["upper"] = upper;
     return result;
 }
 
 PYBIND11_MODULE(_data_cleaning_cpp, m) {
     m.doc() = "C++ data cleaning module for FraudShield";
     
-    m.def("remove_missing_values", &remove_missing_values_py,
-          "Remove missing (NaN) values from array",
-          py::arg("input"));
-    
-    m.def("remove_outliers", &remove_outliers_py,
-          "Remove outliers using z-score threshold",
-          py::arg("input"), py::arg("threshold") = 3.0);
+    // float64 is registered first so other numeric inputs convert to it on the second pass
+    m.def("remove_missing_values", &remove_missing_values_py<double>,
+          "Remove missing (NaN) values from array, optionally writing into out",
+          py::arg("input"), py::arg("out") = py::none());
+    m.def("remove_missing_values", &remove_missing_values_py<float>,
+          "Remove missing (NaN) values from array, optionally writing into out",
+          py::arg("input"), py::arg("out") = py::none());
+
+    m.def("remove_outliers", &remove_outliers_py<double>,
+          "Remove outliers using z-score threshold, optionally writing into out",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("out") = py::none());
+    m.def("remove_outliers", &remove_outliers_py<float>,
+          "Remove outliers using z-score threshold, optionally writing into out",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("out") = py::none());
+
+    m.def("summarize_outliers", &summarize_outliers_py<double>,
+          "Keep mask, mean, std, bounds and kept-value median for z-score outlier cleaning",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("out") = py::none());
+    m.def("summarize_outliers", &summarize_outliers_py<float>,
+          "Keep mask, mean, std, bounds and kept-value median for z-score outlier cleaning",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("out") = py::none());
+
+    m.def("summarize_outliers_batch", &summarize_outliers_batch_py,
+          "summarize_outliers for a list of float32/float64 arrays, spread over n_threads workers without the GIL",
+          py::arg("inputs"), py::arg("threshold") = 3.0, py::arg("n_threads") = 0);
+
+    m.def("summarize_columns", &summarize_columns_py<double>,
+          "Per-column missing counts, moments, median/MAD, outlier mask and optional winsorized copy of a 2-D array",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("method") = "zscore", py::arg("winsorize") = false,
+          py::arg("out") = py::none(), py::arg("n_threads") = 0);
+    m.def("summarize_columns", &summarize_columns_py<float>,
+          "Per-column missing counts, moments, median/MAD, outlier mask and optional winsorized copy of a 2-D array",
+          py::arg("input"), py::arg("threshold") = 3.0, py::arg("method") = "zscore", py::arg("winsorize") = false,
+          py::arg("out") = py::none(), py::arg("n_threads") = 0);
 }
 
 // int main() {
@@ -0,0 +1,282 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module provides mergeable streaming statistics for data cleaning. A
+running moments accumulator and a KLL quantile sketch are fitted chunk by
+chunk in bounded memory, merged across workers, and turned into median and
+outlier bounds without holding or sorting the full column.
+
+File: streaming_stats.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, pd.Series, Sequence[float]]
+
+BOUND_METHODS = ("zscore", "quantile", "iqr")
+DEFAULT_SKETCH_K = 200
+# Each level below the top holds this fraction of the capacity of the level above it
+_CAPACITY_DECAY = 2.0 / 3.0
+
+
+def _finite_values(values: ArrayLike) -> np.ndarray:
+    array = np.asarray(values, dtype=np.float64).ravel()
+    return array[~np.isnan(array)]
+
+
+@dataclass
+class RunningMoments:
+    """
+    Count, mean, M2, min and max of the non-missing values seen so far.
+
+    Chunks are folded in with Chan et al.'s parallel update, so accumulators
+    fitted on separate chunks or workers merge to the full-column result.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def update(self, values: ArrayLike) -> "RunningMoments":
+        values = _finite_values(values)
+        if len(values):
+            mean = float(values.mean())
+            chunk = RunningMoments(
+                count=len(values),
+                mean=mean,
+                m2=float(np.square(values - mean).sum()),
+                minimum=float(values.min()),
+                maximum=float(values.max()),
+            )
+            self.merge(chunk)
+        return self
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n-1); NaN with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Values enter level 0; a level that outgrows its capacity is sorted and
+    every other item (random offset) moves up one level with double weight.
+    Retained items stay below about ``3 * k`` regardless of stream length, and
+    rank error is roughly ``1.7 / k``. Sketches merge level by level, so
+    per-chunk or per-worker sketches combine into one over the whole stream.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("Sketch size k must be at least 8.")
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        """Number of retained items."""
+        return sum(len(level) for level in self.levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, int(math.ceil(self.k * _CAPACITY_DECAY**depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays behind so the promoted pairs keep total weight exact
+            keep = items[:1] if len(items) % 2 else items[:0]
+            pairs = items[len(keep):]
+            promoted = pairs[int(self._rng.integers(2))::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Capacities shrink when a level is added, so rescan from the bottom
+            level = 0
+
+    def update(self, values: ArrayLike) -> "QuantileSketch":
+        values = _finite_values(values)
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.n += len(values)
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """
+        Approximate quantiles of every value seen.
+
+        Args:
+            q: Quantile or sequence of quantiles in ``[0, 1]``
+
+        Returns:
+            Float for a scalar ``q``, otherwise an array; NaN for an empty sketch
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantiles must be between 0 and 1.")
+        if self.n == 0:
+            result = np.full(len(qs), np.nan)
+        else:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(level), 2**h, dtype=np.int64) for h, level in enumerate(self.levels)])
+            order = np.argsort(items, kind="stable")
+            cumulative = np.cumsum(weights[order])
+            index = np.searchsorted(cumulative, qs * cumulative[-1], side="left")
+            result = items[order][np.minimum(index, len(items) - 1)]
+        return float(result[0]) if np.ndim(q) == 0 else result
+
+
+@dataclass
+class ColumnStatistics:
+    """
+    Streaming cleaning statistics for one numeric column.
+
+    Attributes:
+        moments: Running count/mean/M2/min/max of the non-missing values
+        sketch: Quantile sketch of the non-missing values
+        n_missing: NaN values seen
+    """
+
+    moments: RunningMoments = field(default_factory=RunningMoments)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    n_missing: int = 0
+
+    def update(self, values: ArrayLike) -> "ColumnStatistics":
+        array = np.asarray(values, dtype=np.float64).ravel()
+        missing = np.isnan(array)
+        self.n_missing += int(missing.sum())
+        finite = array[~missing]
+        self.moments.update(finite)
+        self.sketch.update(finite)
+        return self
+
+    def merge(self, other: "ColumnStatistics") -> "ColumnStatistics":
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        self.n_missing += other.n_missing
+        return self
+
+    @property
+    def median(self) -> float:
+        return self.sketch.quantile(0.5)
+
+    def bounds(
+        self,
+        method: str = "zscore",
+        threshold: float = 3.0,
+        quantiles: Tuple[float, float] = (0.005, 0.995),
+    ) -> Tuple[float, float]:
+        """
+        Outlier bounds from the fitted statistics.
+
+        Args:
+            method: ``zscore`` (mean ± threshold·std), ``quantile`` (the
+                ``quantiles`` pair) or ``iqr`` (Q1 - threshold·IQR, Q3 + threshold·IQR)
+            threshold: Multiplier for ``zscore`` and ``iqr``
+            quantiles: Lower and upper quantile for ``quantile``
+
+        Returns:
+            ``(lower, upper)``; ``(-inf, inf)`` when the column has no spread
+        """
+        if method == "zscore":
+            center, scale = self.moments.mean, self.moments.std
+            lower, upper = center - threshold * scale, center + threshold * scale
+        elif method == "quantile":
+            lower, upper = (float(value) for value in self.sketch.quantile(list(quantiles)))
+        elif method == "iqr":
+            q1, q3 = self.sketch.quantile([0.25, 0.75])
+            lower, upper = q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+        else:
+            raise ValueError(f"Unsupported bound method '{method}'; expected one of {BOUND_METHODS}")
+        if not lower < upper:
+            return -math.inf, math.inf
+        return float(lower), float(upper)
+
+    def winsorize(self, values: ArrayLike, method: str = "zscore", threshold: float = 3.0, **kwargs) -> np.ndarray:
+        """Clip ``values`` to ``bounds(method, threshold, ...)``; NaN stays NaN."""
+        lower, upper = self.bounds(method, threshold, **kwargs)
+        return np.clip(np.asarray(values, dtype=np.float64), lower, upper)
+
+
+def fit_column_statistics(
+    chunks: Iterable[pd.DataFrame],
+    columns: Optional[Sequence[str]] = None,
+    k: int = DEFAULT_SKETCH_K,
+) -> Dict[str, ColumnStatistics]:
+    """
+    Fit cleaning statistics over DataFrame chunks in bounded memory.
+
+    Args:
+        chunks: DataFrames, e.g. from ``pd.read_csv(..., chunksize=...)``
+        columns: Columns to track; defaults to the numeric columns of the first chunk
+        k: Sketch size per column
+
+    Returns:
+        Dict mapping each column to its ``ColumnStatistics``; dicts fitted on
+        separate workers combine with ``merge_column_statistics``
+    """
+    statistics: Dict[str, ColumnStatistics] = {}
+    for chunk in chunks:
+        if columns is None:
+            columns = chunk.select_dtypes(include="number").columns.tolist()
+        for column in columns:
+            if column not in statistics:
+                statistics[column] = ColumnStatistics(sketch=QuantileSketch(k))
+            statistics[column].update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+    return statistics
+
+
+def merge_column_statistics(*fitted: Dict[str, ColumnStatistics]) -> Dict[str, ColumnStatistics]:
+    """Merge per-column statistics fitted on separate chunks or workers (the first dict is updated)."""
+    merged = fitted[0] if fitted else {}
+    for statistics in fitted[1:]:
+        for column, stats in statistics.items():
+            if column in merged:
+                merged[column].merge(stats)
+            else:
+                merged[column] = stats
+    return merged
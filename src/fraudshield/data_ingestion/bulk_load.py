@@ -0,0 +1,196 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module provides bulk-load strategies for writing DataFrames to SQL
+databases: PostgreSQL ``COPY FROM STDIN``, a single DBAPI ``executemany``
+for SQLite, and multi-row ``VALUES`` inserts, selected per dialect.
+
+File: bulk_load.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import csv
+import io
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+LOAD_METHODS = ("auto", "copy", "executemany", "multi", "to_sql")
+AUTO_METHODS = {"postgresql": "copy", "sqlite": "executemany"}
+# Bound parameters allowed per statement, which caps the rows of one multi-row INSERT
+_MAX_PARAMETERS = {
+    "sqlite": 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999,
+    "postgresql": 65535,
+    "mssql": 2100,
+}
+_DEFAULT_MAX_PARAMETERS = 1000
+
+# Applied to every new SQLite connection; NORMAL sync still survives an application crash
+SQLITE_PRAGMAS = {"synchronous": "NORMAL", "temp_store": "MEMORY", "cache_size": "-65536"}
+_PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+
+def tune_sqlite(engine: Engine) -> None:
+    """
+    Applies ``SQLITE_PRAGMAS`` to each connection the engine opens (no-op for other dialects).
+
+    Args:
+        engine: Engine used for loading
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def resolve_load_method(dialect: str, method: str = "auto") -> str:
+    """
+    Picks the bulk-load strategy for a dialect.
+
+    Args:
+        dialect: SQLAlchemy dialect name, e.g. ``postgresql`` or ``sqlite``
+        method: One of ``LOAD_METHODS``; ``auto`` selects ``copy`` for
+            PostgreSQL, ``executemany`` for SQLite and ``multi`` otherwise
+
+    Returns:
+        The concrete method name
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unsupported load method '{method}'; expected one of {LOAD_METHODS}")
+    if method == "auto":
+        return AUTO_METHODS.get(dialect, "multi")
+    if method == "copy" and dialect != "postgresql":
+        raise ValueError("COPY bulk loading requires PostgreSQL.")
+    return method
+
+
+def _qualified_name(conn: Connection, pd_table: Any) -> str:
+    quote = conn.dialect.identifier_preparer.quote
+    return f"{quote(pd_table.schema)}.{quote(pd_table.name)}" if pd_table.schema else quote(pd_table.name)
+
+
+def _copy_from_stdin(pd_table: Any, conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> int:
+    """``to_sql`` method streaming one chunk through PostgreSQL ``COPY ... FROM STDIN``."""
+    buffer = io.StringIO()
+    rows = 0
+    writer = csv.writer(buffer)
+    for row in data_iter:
+        writer.writerow(row)
+        rows += 1
+    buffer.seek(0)
+
+    quote = conn.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(key) for key in keys)
+    sql = f"COPY {_qualified_name(conn, pd_table)} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    with conn.connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    return rows
+
+
+def _placeholders(conn: Connection, n: int, start: int = 1) -> List[str]:
+    paramstyle = conn.dialect.paramstyle
+    if paramstyle == "numeric":
+        return [f":{i}" for i in range(start, start + n)]
+    if paramstyle in _PLACEHOLDERS:
+        return [_PLACEHOLDERS[paramstyle]] * n
+    raise ValueError(f"Driver-level loading does not support the '{paramstyle}' parameter style.")
+
+
+def _insert_prefix(conn: Connection, pd_table: Any, keys: List[str]) -> str:
+    quote = conn.dialect.identifier_preparer.quote
+    return f"INSERT INTO {_qualified_name(conn, pd_table)} ({', '.join(quote(key) for key in keys)}) VALUES "
+
+
+def _bound_rows(pd_table: Any, conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> List[tuple]:
+    """Rows with the column types' bind processors applied, as SQLAlchemy would before the driver sees them."""
+    rows = list(data_iter)
+    # Generic types such as DateTime only carry a processor in their dialect implementation
+    processors = [pd_table.table.c[key].type.dialect_impl(conn.dialect).bind_processor(conn.dialect) for key in keys]
+    if not any(processors):
+        return rows
+    columns = [
+        [None if value is None else process(value) for value in column] if process else column
+        for process, column in zip(processors, zip(*rows))
+    ]
+    return list(zip(*columns))
+
+
+def _executemany(pd_table: Any, conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> int:
+    """``to_sql`` method handing one chunk to a single DBAPI ``executemany``."""
+    row = f"({', '.join(_placeholders(conn, len(keys)))})"
+    rows = _bound_rows(pd_table, conn, keys, data_iter)
+    conn.exec_driver_sql(_insert_prefix(conn, pd_table, keys) + row, rows)
+    return len(rows)
+
+
+def _multi_values(pd_table: Any, conn: Connection, keys: List[str], data_iter: Iterable[tuple]) -> int:
+    """``to_sql`` method sending one chunk as a single multi-row ``VALUES`` statement."""
+    rows = _bound_rows(pd_table, conn, keys, data_iter)
+    if not rows:
+        return 0
+    width = len(keys)
+    placeholders = _placeholders(conn, width * len(rows))
+    values = ", ".join(f"({', '.join(placeholders[i : i + width])})" for i in range(0, len(placeholders), width))
+    conn.exec_driver_sql(_insert_prefix(conn, pd_table, keys) + values, tuple(value for row in rows for value in row))
+    return len(rows)
+
+
+_TO_SQL_METHODS: Dict[str, Any] = {"copy": _copy_from_stdin, "executemany": _executemany, "multi": _multi_values, "to_sql": None}
+
+
+def _statement_rows(dialect: str, n_columns: int, chunksize: Optional[int]) -> int:
+    limit = max(1, _MAX_PARAMETERS.get(dialect, _DEFAULT_MAX_PARAMETERS) // max(1, n_columns))
+    return min(chunksize, limit) if chunksize else limit
+
+
+def bulk_insert(
+    conn: Connection,
+    dataframe: pd.DataFrame,
+    table_name: str,
+    if_exists: str = "append",
+    method: str = "auto",
+    chunksize: Optional[int] = 10000,
+) -> int:
+    """
+    Writes a DataFrame to a table with a bulk-load strategy.
+
+    The table is created (or replaced) by ``to_sql`` as usual; only the row
+    transfer changes. Runs inside the caller's transaction.
+
+    Args:
+        conn: Open connection, typically from ``engine.begin()``
+        dataframe: Rows to write
+        table_name: Destination table
+        if_exists: ``fail``, ``replace`` or ``append``
+        method: One of ``LOAD_METHODS``
+        chunksize: Rows per statement, ``COPY`` buffer or ``executemany`` call;
+            ``multi`` inserts are further capped by the dialect's parameter limit
+
+    Returns:
+        Number of rows written
+    """
+    dialect = conn.dialect.name
+    method = resolve_load_method(dialect, method)
+    if method == "multi":
+        chunksize = _statement_rows(dialect, len(dataframe.columns), chunksize)
+    dataframe.to_sql(
+        table_name, con=conn, if_exists=if_exists, index=False, chunksize=chunksize, method=_TO_SQL_METHODS[method]
+    )
+    logger.debug(f"Loaded {len(dataframe)} rows into {table_name} with '{method}'")
+    return len(dataframe)
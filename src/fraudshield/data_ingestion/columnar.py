@@ -0,0 +1,144 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module reads the ingested data back for preprocessing. Parquet files
+are read column-projected, and a ``transaction_date`` range skips every row
+group whose min/max statistics fall outside it; CSV files get the same
+projection and filtering after a full parse, typed by the ingestion schema.
+
+File: columnar.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import pandas as pd
+
+from fraudshield.data_ingestion.schema import TRANSACTION_SCHEMA, IngestionSchema
+
+logger = logging.getLogger(__name__)
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def is_parquet(path: str) -> bool:
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def _bound(value: Any, tz: Optional[str]) -> Optional[pd.Timestamp]:
+    """``value`` as a Timestamp in the column's timezone (naive for naive columns)."""
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    if tz is None:
+        return timestamp.tz_convert("UTC").tz_localize(None) if timestamp.tzinfo is not None else timestamp
+    return timestamp.tz_localize(tz) if timestamp.tzinfo is None else timestamp.tz_convert(tz)
+
+
+def _filter_dates(frame: pd.DataFrame, date_column: str, start: Any, end: Any) -> pd.DataFrame:
+    dates = frame[date_column]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors="coerce")
+    tz = getattr(dates.dtype, "tz", None)
+    start, end = _bound(start, tz), _bound(end, tz)
+    mask = pd.Series(True, index=frame.index)
+    if start is not None:
+        mask &= dates >= start
+    if end is not None:
+        mask &= dates < end
+    return frame[mask.to_numpy()]
+
+
+def row_groups_in_range(path: str, date_column: str = "transaction_date", start: Any = None, end: Any = None) -> List[int]:
+    """
+    Row groups of a Parquet file that may hold dates in ``[start, end)``.
+
+    Groups without statistics for the column (or with nulls only) are kept,
+    so the result never drops a matching row.
+
+    Args:
+        path: Parquet file
+        date_column: Timestamp column whose statistics are checked
+        start: Inclusive lower bound, or None
+        end: Exclusive upper bound, or None
+
+    Returns:
+        Indices of the row groups to read
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    every_group = list(range(metadata.num_row_groups))
+    if start is None and end is None:
+        return every_group
+    schema = parquet_file.schema_arrow
+    if date_column not in schema.names:
+        raise ValueError(f"Column '{date_column}' not found in {Path(path).name}.")
+    field = schema.field(date_column)
+    if not pa.types.is_timestamp(field.type):
+        return every_group
+    start, end = _bound(start, field.type.tz), _bound(end, field.type.tz)
+    position = schema.get_field_index(date_column)
+
+    selected = []
+    for index in every_group:
+        stats = metadata.row_group(index).column(position).statistics
+        if stats is None or not stats.has_min_max:
+            selected.append(index)
+            continue
+        low, high = pd.Timestamp(stats.min), pd.Timestamp(stats.max)
+        if (start is None or high >= start) and (end is None or low < end):
+            selected.append(index)
+    return selected
+
+
+def read_ingested_data(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    date_column: str = "transaction_date",
+    start: Any = None,
+    end: Any = None,
+    schema: Optional[IngestionSchema] = TRANSACTION_SCHEMA,
+) -> pd.DataFrame:
+    """
+    Reads ingested data written as Parquet or CSV.
+
+    Args:
+        path: Ingested data file; ``.parquet``/``.pq`` is read as Parquet
+        columns: Columns to load (default: all)
+        date_column: Column ``start`` and ``end`` apply to
+        start: Keep rows dated on or after this, e.g. ``"2024-01-01"``
+        end: Keep rows dated before this
+        schema: Column types for CSV input (Parquet stores its own), or None to infer them
+
+    Returns:
+        The selected rows and columns
+    """
+    filtered = start is not None or end is not None
+    requested = list(columns) if columns else None
+    # The date column is loaded for filtering even when not requested
+    load = requested + [date_column] if requested and filtered and date_column not in requested else requested
+
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        groups = row_groups_in_range(path, date_column, start, end)
+        parquet_file = pq.ParquetFile(path)
+        logger.info(f"Reading {len(groups)} of {parquet_file.metadata.num_row_groups} row groups from: {path}")
+        frame = parquet_file.read_row_groups(groups, columns=load).to_pandas()
+    else:
+        logger.info(f"Reading CSV from: {path}")
+        options = schema.read_csv_kwargs() if schema is not None else {}
+        frame = pd.read_csv(path, usecols=load, **options)
+        frame = schema.apply(frame) if schema is not None else frame
+
+    if filtered:
+        if date_column not in frame.columns:
+            raise ValueError(f"Column '{date_column}' not found in {Path(path).name}.")
+        frame = _filter_dates(frame, date_column, start, end).reset_index(drop=True)
+    return frame[requested] if requested else frame
@@ -3,7 +3,11 @@ FraudShield - Advanced Anomaly Detection Pipeline
 
 This module provides the DataIngestion pipeline class, automating the
 extraction of transaction data from CSV sources and secure loading
-into standard SQL databases.
+into standard SQL databases with per-dialect bulk-load strategies. Each
+file is parsed once and fanned out to every attached sink. Large files can
+be streamed in chunks with per-transaction progress tracking, so a failed
+load resumes where the last committed chunk ended. Columns are typed at
+parse time by a declared ``IngestionSchema``.
 
 File: data_ingestion.py
 Author: Mudit Bhargava
@@ -12,28 +16,44 @@ License: MIT
 
 import argparse
 import logging
-import sys
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 import pandas as pd
 from sqlalchemy import create_engine
 
-# Set up logging
-Path("logs").mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("logs/fraudshield_ingest.log"), logging.StreamHandler(sys.stdout)],
-)
+from fraudshield.data_ingestion.bulk_load import LOAD_METHODS, tune_sqlite
+from fraudshield.data_ingestion.schema import TRANSACTION_SCHEMA, IngestionSchema
+from fraudshield.data_ingestion.sinks import DatabaseSink, IngestionSink, read_progress, sink_for_path
+from fraudshield.logging_config import configure_logging
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_STREAM_CHUNK_SIZE = 100_000
+
+
+def _has_header(file_path: Path) -> bool:
+    with open(file_path, "rb") as handle:
+        return any(line.strip() for line in handle)
+
 
 class DataIngestion:
-    def __init__(self, data_path: str, db_connection_string: str) -> None:
+    def __init__(
+        self, data_path: str, db_connection_string: str, schema: Optional[IngestionSchema] = TRANSACTION_SCHEMA
+    ) -> None:
         self.data_path = Path(data_path)
         self.db_connection_string = db_connection_string
+        # None lets pandas infer every column
+        self.schema = schema
         self.engine = create_engine(db_connection_string)
+        tune_sqlite(self.engine)
+
+    def _read_options(self, chunked: bool, read_csv_kwargs: dict) -> dict:
+        options = self.schema.read_csv_kwargs(chunked) if self.schema is not None else {}
+        return {**options, **read_csv_kwargs}
+
+    def _typed(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.schema.apply(df) if self.schema is not None else df
 
     def read_csv_file(self, file_name: str, **read_csv_kwargs) -> pd.DataFrame:
         """
@@ -41,9 +61,10 @@ class DataIngestion:
 
         Args:
             file_name: Name of the CSV file to be read.
+            **read_csv_kwargs: Overrides for the schema's ``pd.read_csv`` options.
 
         Returns:
-            DataFrame containing data from the CSV file.
+            DataFrame containing data from the CSV file, typed by the schema.
         """
         file_path = self.data_path / file_name
 
@@ -52,7 +73,10 @@ class DataIngestion:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         try:
-            df = pd.read_csv(file_path, **read_csv_kwargs)
+            if not _has_header(file_path):
+                # The pyarrow engine reports an empty file as a generic parse error
+                raise pd.errors.EmptyDataError("No columns to parse from file")
+            df = self._typed(pd.read_csv(file_path, **self._read_options(False, read_csv_kwargs)))
             logger.info(f"Successfully read file: {file_path}")
             return df
         except pd.errors.EmptyDataError as exc:
@@ -64,16 +88,60 @@ class DataIngestion:
         except (UnicodeDecodeError, OSError) as e:
             logger.error(f"Error reading file {file_path}: {e}")
             raise ValueError(f"Error reading file {file_path}: {e}") from e
+        except (TypeError, ValueError) as e:
+            logger.error(f"Data in {file_path} does not match the ingestion schema: {e}")
+            raise ValueError(f"Data in {file_path} does not match the ingestion schema: {e}") from e
         except Exception as e:
             logger.error(f"Unexpected error reading file {file_path}: {e}")
             raise
 
+    def read_csv_chunks(
+        self, file_name: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE, skip_rows: int = 0, **read_csv_kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file as DataFrames of at most ``chunk_size`` rows.
+
+        Args:
+            file_name: Name of the CSV file to be read.
+            chunk_size: Rows per chunk; bounds the memory held at once.
+            skip_rows: Data rows (after the header) to skip, e.g. when resuming.
+                Counted as physical lines, so records must not span lines.
+            **read_csv_kwargs: Overrides for the schema's ``pd.read_csv`` options.
+
+        Returns:
+            Iterator over the typed chunks, indexed by their row position in the file.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+        file_path = self.data_path / file_name
+        if not file_path.exists():
+            logger.error(f"File not found: {file_path}")
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        skip = range(1, skip_rows + 1) if skip_rows else None
+        try:
+            options = self._read_options(True, read_csv_kwargs)
+            with pd.read_csv(file_path, chunksize=chunk_size, skiprows=skip, **options) as reader:
+                for chunk in reader:
+                    chunk.index += skip_rows
+                    yield self._typed(chunk)
+        except pd.errors.EmptyDataError as exc:
+            logger.error(f"Empty data file: {file_path}")
+            raise ValueError(f"Empty data file: {file_path}") from exc
+        except pd.errors.ParserError as e:
+            logger.error(f"Invalid data format in file: {file_path} - {e}")
+            raise ValueError(f"Invalid data format in file: {file_path}") from e
+        except (TypeError, ValueError) as e:
+            logger.error(f"Data in {file_path} does not match the ingestion schema: {e}")
+            raise ValueError(f"Data in {file_path} does not match the ingestion schema: {e}") from e
+
     def write_to_database(
         self,
         dataframe: pd.DataFrame,
         table_name: str,
         if_exists: str = "append",
-        chunksize: Optional[int] = 100,
+        chunksize: Optional[int] = 10000,
+        method: str = "auto",
     ):
         """
         Write the DataFrame to the specified database table.
@@ -81,6 +149,10 @@ class DataIngestion:
         Args:
             dataframe: DataFrame to be written to the database.
             table_name: Name of the table in the database.
+            if_exists: Behavior if the table already exists.
+            chunksize: Rows per insert statement, COPY buffer or executemany call.
+            method: Bulk-load strategy, one of ``LOAD_METHODS``; ``auto``
+                picks COPY for PostgreSQL and executemany for SQLite.
         """
         if dataframe is None or dataframe.empty:
             logger.warning("Received empty DataFrame. Skipping database write.")
@@ -88,20 +160,111 @@ class DataIngestion:
         if not table_name:
             raise ValueError("table_name must be provided.")
 
+        sink = DatabaseSink(
+            self.engine, table_name, if_exists=if_exists, chunksize=chunksize, method=method, track_progress=False
+        )
+        sink.open()
         try:
-            with self.engine.begin() as conn:
-                dataframe.to_sql(
-                    table_name,
-                    con=conn,
-                    if_exists=if_exists,
-                    index=False,
-                    chunksize=chunksize,
-                    # method="multi",
-                )
-            logger.info(f"Data ingested successfully into table: {table_name}")
-        except Exception as e:
-            logger.error(f"Error writing to database: {str(e)}")
-            raise ValueError(f"Error writing to database: {str(e)}") from e
+            sink.write(dataframe)
+            sink.close()
+        except BaseException:
+            sink.abort()
+            raise
+
+    def committed_rows(self, file_name: str, table_name: str) -> int:
+        """
+        Rows of ``file_name`` already committed to ``table_name`` by an unfinished streaming load.
+
+        Args:
+            file_name: Name of the CSV file being loaded.
+            table_name: Destination table.
+
+        Returns:
+            Committed row count, 0 when no load is in progress.
+        """
+        return read_progress(self.engine, self.data_path / file_name, table_name)
+
+    def ingest(self, file_name: str, sinks: Sequence[IngestionSink], chunk_size: Optional[int] = None) -> int:
+        """
+        Parse a CSV once and fan every chunk out to each sink.
+
+        Args:
+            file_name: Name of the CSV file to be read.
+            sinks: Destinations for the parsed rows.
+            chunk_size: Rows per chunk, or None to parse the whole file as one chunk.
+
+        Returns:
+            Number of rows parsed.
+        """
+        opened = []
+        try:
+            for sink in sinks:
+                sink.open()
+                opened.append(sink)
+            # Rows every sink already holds need not be parsed again
+            skip = min((sink.resume_offset for sink in sinks), default=0)
+            if chunk_size is None:
+                chunks = iter([self.read_csv_file(file_name)])
+            else:
+                chunks = self.read_csv_chunks(file_name, chunk_size=chunk_size, skip_rows=skip)
+            parsed = 0
+            for chunk in chunks:
+                parsed += len(chunk)
+                for sink in sinks:
+                    sink.write(chunk)
+            for sink in sinks:
+                sink.close()
+        except BaseException:
+            for sink in opened:
+                sink.abort()
+            raise
+        return parsed
+
+    def stream_to_database(
+        self,
+        file_name: str,
+        table_name: str,
+        if_exists: str = "append",
+        chunksize: Optional[int] = 10000,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        commit_every: int = 1,
+        resume: bool = True,
+        method: str = "auto",
+    ) -> int:
+        """
+        Load a CSV into a table chunk by chunk in bounded memory.
+
+        Every ``commit_every`` chunks are written in one transaction, together
+        with the count of rows committed so far, so a failed load loses at most
+        the open transaction. With ``resume``, a later call on the same file
+        and table skips the committed rows and continues from there.
+
+        Args:
+            file_name: Name of the CSV file to be read.
+            table_name: Destination table.
+            if_exists: Table policy for the first write of a fresh load; a
+                resumed load always appends.
+            chunksize: Rows per insert statement batch.
+            chunk_size: Rows read from the CSV per chunk.
+            commit_every: Chunks per transaction.
+            resume: Continue an interrupted load instead of starting over.
+            method: Bulk-load strategy, see ``write_to_database``.
+
+        Returns:
+            Number of rows written by this call.
+        """
+        sink = DatabaseSink(
+            self.engine,
+            table_name,
+            source=self.data_path / file_name,
+            if_exists=if_exists,
+            chunksize=chunksize,
+            method=method,
+            commit_every=commit_every,
+            resume=resume,
+        )
+        self.ingest(file_name, [sink], chunk_size=chunk_size)
+        return sink.rows_written
 
     def run_ingestion_pipeline(
         self,
@@ -109,22 +272,54 @@ class DataIngestion:
         table_name: str,
         if_exists: str = "append",
         chunksize: Optional[int] = 10000,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        commit_every: int = 1,
+        resume: bool = True,
+        method: str = "auto",
+        output_file: Optional[str] = None,
+        sinks: Sequence[IngestionSink] = (),
     ) -> None:
+        """
+        Load a CSV into the database and any extra outputs from a single parse.
+
+        Args:
+            file_name: Name of the CSV file to be read.
+            table_name: Destination table.
+            if_exists: Behavior if the table already exists.
+            chunksize: Rows per insert statement, COPY buffer or executemany call.
+            stream: Parse and load in chunks of ``chunk_size`` rows with resumable progress.
+            chunk_size: Rows per chunk in streaming mode.
+            commit_every: Chunks per transaction in streaming mode.
+            resume: Continue an interrupted streaming load.
+            method: Bulk-load strategy, see ``write_to_database``.
+            output_file: Also write the parsed rows to this file, as Parquet
+                for a ``.parquet`` extension and CSV otherwise.
+            sinks: Further destinations fed from the same parse.
+        """
         logger.info(f"Starting data ingestion pipeline for file: {file_name}")
-        dataframe = self.read_csv_file(file_name)
-        self.write_to_database(dataframe, table_name, if_exists=if_exists, chunksize=chunksize)
+        database = DatabaseSink(
+            self.engine,
+            table_name,
+            source=self.data_path / file_name,
+            if_exists=if_exists,
+            chunksize=chunksize,
+            method=method,
+            commit_every=commit_every,
+            resume=resume,
+            track_progress=stream,
+        )
+        outputs = [database] + ([sink_for_path(output_file)] if output_file else []) + list(sinks)
+        self.ingest(file_name, outputs, chunk_size=chunk_size if stream else None)
         logger.info(f"Data ingestion pipeline completed successfully for file: {file_name}")
 
     def save_ingested_data(self, file_name: str, output_file: str) -> None:
         logger.info(f"Saving ingested data from file: {file_name} to output file: {output_file}")
-        ingested_data = self.read_csv_file(file_name)
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        ingested_data.to_csv(output_path, index=False)
-        logger.info(f"Ingested data saved successfully to: {output_file}")
+        self.ingest(file_name, [sink_for_path(output_file)])
 
 
 def main() -> None:
+    configure_logging("fraudshield_ingest.log")
     parser = argparse.ArgumentParser(description="Data Ingestion Pipeline")
     parser.add_argument("--data_path", type=str, default="data/raw", help="Path to the raw data directory")
     parser.add_argument(
@@ -136,7 +331,10 @@ def main() -> None:
     parser.add_argument("--input_file", type=str, default="synthetic_fraud_data.csv", help="Name of the input CSV file")
     parser.add_argument("--table_name", type=str, default="fraud_data", help="Name of the database table")
     parser.add_argument(
-        "--output_file", type=str, default="data/processed/ingested_data.csv", help="Path to save the ingested data"
+        "--output_file",
+        type=str,
+        default="data/processed/ingested_data.parquet",
+        help="Path to save the ingested data (.parquet for Parquet, otherwise CSV)",
     )
     parser.add_argument(
         "--if_exists",
@@ -145,18 +343,57 @@ def main() -> None:
         choices=["fail", "replace", "append"],
         help="Behavior if the table already exists",
     )
-    parser.add_argument("--chunksize", type=int, default=100, help="Chunk size for database inserts")
+    parser.add_argument(
+        "--chunksize", type=int, default=10000, help="Rows per insert statement, COPY buffer or executemany call"
+    )
+    parser.add_argument(
+        "--load_method",
+        type=str,
+        default="auto",
+        choices=list(LOAD_METHODS),
+        help="Bulk-load strategy; 'auto' uses COPY on PostgreSQL and executemany on SQLite",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="Load the CSV in chunks with bounded memory and resumable progress"
+    )
+    parser.add_argument(
+        "--stream_chunk_size",
+        type=int,
+        default=DEFAULT_STREAM_CHUNK_SIZE,
+        help="Rows read from the CSV per chunk in streaming mode",
+    )
+    parser.add_argument("--commit_every", type=int, default=1, help="Chunks per transaction in streaming mode")
+    parser.add_argument(
+        "--no_resume", action="store_true", help="Restart an interrupted streaming load instead of resuming it"
+    )
+    parser.add_argument(
+        "--schema_file",
+        type=str,
+        default="",
+        help="JSON ingestion schema (dtypes, categorical, datetime_columns, datetime_format, timezone); "
+        "default: the built-in transaction schema",
+    )
+    parser.add_argument("--infer_dtypes", action="store_true", help="Ignore the schema and let pandas infer every column")
 
     args = parser.parse_args()
 
-    data_ingestion = DataIngestion(args.data_path, args.db_connection_string)
+    if args.infer_dtypes:
+        schema = None
+    else:
+        schema = IngestionSchema.from_json(args.schema_file) if args.schema_file else TRANSACTION_SCHEMA
+    data_ingestion = DataIngestion(args.data_path, args.db_connection_string, schema=schema)
     data_ingestion.run_ingestion_pipeline(
         args.input_file,
         args.table_name,
         if_exists=args.if_exists,
         chunksize=args.chunksize,
+        stream=args.stream,
+        chunk_size=args.stream_chunk_size,
+        commit_every=args.commit_every,
+        resume=not args.no_resume,
+        method=args.load_method,
+        output_file=args.output_file,
     )
-    data_ingestion.save_ingested_data(args.input_file, args.output_file)
 
 
 if __name__ == "__main__":
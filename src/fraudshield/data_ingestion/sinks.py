@@ -0,0 +1,345 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module provides the sinks that ingestion fans parsed data out to. The
+source file is parsed once, whole or chunk by chunk, and every chunk goes to
+each attached sink: a database table, a CSV or Parquet file, or an
+in-memory frame.
+
+File: sinks.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, delete, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from fraudshield.data_ingestion.bulk_load import bulk_insert, resolve_load_method
+from fraudshield.data_ingestion.columnar import is_parquet
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_TABLE = "fraudshield_ingestion_progress"
+# Rows per Parquet row group; smaller groups let date filters skip more of the file
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+_progress_metadata = MetaData()
+_progress_table = Table(
+    PROGRESS_TABLE,
+    _progress_metadata,
+    Column("source", String(1024), primary_key=True),
+    Column("table_name", String(255), primary_key=True),
+    Column("source_size", BigInteger, nullable=False),
+    Column("rows_committed", BigInteger, nullable=False),
+)
+
+
+def _source_key(source: Path) -> str:
+    return str(Path(source).resolve())
+
+
+def read_progress(engine: Engine, source: Path, table_name: str) -> int:
+    """
+    Rows of ``source`` already committed to ``table_name`` by an unfinished load.
+
+    Args:
+        engine: Database holding the table.
+        source: File being loaded.
+        table_name: Destination table.
+
+    Returns:
+        Committed row count, 0 when no load is in progress.
+    """
+    _progress_metadata.create_all(engine, checkfirst=True)
+    query = select(_progress_table.c.source_size, _progress_table.c.rows_committed).where(
+        _progress_table.c.source == _source_key(source), _progress_table.c.table_name == table_name
+    )
+    with engine.connect() as conn:
+        row = conn.execute(query).first()
+    if row is None:
+        return 0
+    if row.source_size != Path(source).stat().st_size:
+        raise ValueError(
+            f"{Path(source).name} changed since its interrupted load into {table_name} "
+            f"({row.rows_committed} rows committed); clear the progress with resume=False."
+        )
+    return int(row.rows_committed)
+
+
+def _record_progress(conn: Connection, source: Path, table_name: str, rows: Optional[int]) -> None:
+    """Replace the progress row inside the caller's transaction; ``rows=None`` clears it."""
+    key = _source_key(source)
+    conn.execute(delete(_progress_table).where(_progress_table.c.source == key, _progress_table.c.table_name == table_name))
+    if rows is not None:
+        size = Path(source).stat().st_size
+        conn.execute(insert(_progress_table).values(source=key, table_name=table_name, source_size=size, rows_committed=rows))
+
+
+class IngestionSink(ABC):
+    """
+    Destination for the chunks of one ingestion pass.
+
+    ``open`` runs before the first chunk, ``write`` once per chunk (indexed by
+    row position in the source), then ``close`` on success or ``abort`` on
+    failure. A sink that already holds the first ``resume_offset`` rows from
+    an interrupted run sets that attribute in ``open`` and drops those rows.
+    """
+
+    resume_offset: int = 0
+
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Hand one chunk to the destination."""
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        pass
+
+
+class DatabaseSink(IngestionSink):
+    """
+    Writes chunks to a table with a bulk-load strategy.
+
+    Every ``commit_every`` chunks form one transaction. With ``track_progress``
+    the transaction also records the rows committed so far, so a failed load
+    resumes after the last commit instead of starting over.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        table_name: str,
+        source: Optional[Path] = None,
+        if_exists: str = "append",
+        chunksize: Optional[int] = 10000,
+        method: str = "auto",
+        commit_every: int = 1,
+        resume: bool = True,
+        track_progress: bool = True,
+    ) -> None:
+        if not table_name:
+            raise ValueError("table_name must be provided.")
+        if commit_every < 1:
+            raise ValueError("commit_every must be positive.")
+        if track_progress and source is None:
+            raise ValueError("Progress tracking needs the source file.")
+        self.engine = engine
+        self.table_name = table_name
+        self.source = source
+        self.if_exists = if_exists
+        self.chunksize = chunksize
+        self.method = resolve_load_method(engine.dialect.name, method)
+        self.commit_every = commit_every
+        self.resume = resume
+        self.track_progress = track_progress
+        self.rows_written = 0
+        self._conn: Optional[Connection] = None
+        self._chunks_in_transaction = 0
+
+    def open(self) -> None:
+        if self.track_progress:
+            if self.resume:
+                self.resume_offset = read_progress(self.engine, self.source, self.table_name)
+            else:
+                _progress_metadata.create_all(self.engine, checkfirst=True)
+                with self.engine.begin() as conn:
+                    _record_progress(conn, self.source, self.table_name, None)
+        if self.resume_offset:
+            logger.info(f"Resuming load into {self.table_name} after {self.resume_offset} committed rows")
+            self.if_exists = "append"
+        self._conn = self.engine.connect()
+        self._conn.begin()
+
+    def _commit(self, finished: bool) -> None:
+        if self.track_progress:
+            # The finishing transaction clears the progress row
+            _record_progress(self._conn, self.source, self.table_name, None if finished else self.resume_offset + self.rows_written)
+        self._conn.commit()
+        self._chunks_in_transaction = 0
+        logger.info(f"Committed {self.resume_offset + self.rows_written} rows into {self.table_name}")
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.resume_offset and len(chunk) and chunk.index[0] < self.resume_offset:
+            chunk = chunk[chunk.index >= self.resume_offset]
+        if chunk.empty:
+            return
+        try:
+            bulk_insert(self._conn, chunk, self.table_name, if_exists=self.if_exists, method=self.method, chunksize=self.chunksize)
+            self.if_exists = "append"
+            self.rows_written += len(chunk)
+            self._chunks_in_transaction += 1
+            if self._chunks_in_transaction == self.commit_every:
+                self._commit(finished=False)
+                self._conn.begin()
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error writing to database after {self.resume_offset + self.rows_written} rows: {str(e)}")
+            raise ValueError(f"Error writing to database: {str(e)}") from e
+
+    def close(self) -> None:
+        self._commit(finished=True)
+        self._conn.close()
+        self._conn = None
+        logger.info(f"Data ingested successfully into table: {self.table_name}")
+
+    def abort(self) -> None:
+        if self._conn is not None:
+            self._conn.rollback()
+            self._conn.close()
+            self._conn = None
+
+
+class CsvSink(IngestionSink):
+    """Writes chunks to a CSV file, replacing ``path`` only once the pass succeeds."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._partial = self.path.with_name(self.path.name + ".partial")
+        self._handle = None
+        self._header = True
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self._partial, "w", newline="", encoding="utf-8")
+        self._header = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(self._handle, header=self._header, index=False)
+        self._header = False
+
+    def close(self) -> None:
+        self._handle.close()
+        self._handle = None
+        os.replace(self._partial, self.path)
+        logger.info(f"Ingested data saved successfully to: {self.path}")
+
+    def abort(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._partial.unlink(missing_ok=True)
+
+
+class ParquetSink(IngestionSink):
+    """
+    Writes chunks to a Parquet file, replacing ``path`` only once the pass succeeds.
+
+    Date columns still holding text are parsed to timestamps first, so each
+    row group's min/max statistics let readers skip groups outside a date
+    range. The first chunk fixes the file schema; later chunks are cast to it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        date_columns: Sequence[str] = ("transaction_date",),
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+    ) -> None:
+        self.path = Path(path)
+        self.date_columns = list(date_columns)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self._partial = self.path.with_name(self.path.name + ".partial")
+        self._writer = None
+        self._opened = False
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = None
+        self._opened = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        text_dates = [c for c in self.date_columns if c in chunk.columns and not pd.api.types.is_datetime64_any_dtype(chunk[c])]
+        if text_dates:
+            chunk = chunk.assign(**{column: pd.to_datetime(chunk[column], errors="coerce") for column in text_dates})
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._partial, table.schema, compression=self.compression)
+        elif not table.schema.equals(self._writer.schema):
+            try:
+                table = table.cast(self._writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+                raise ValueError(
+                    f"Chunk columns no longer match the Parquet schema of {self.path.name}: {e}. "
+                    "Declare the column dtypes or ingest the file as a single chunk."
+                ) from e
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def close(self) -> None:
+        if self._writer is None:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pq.write_table(pa.table({}), self._partial)
+        else:
+            self._writer.close()
+        self._writer = None
+        self._opened = False
+        os.replace(self._partial, self.path)
+        logger.info(f"Ingested data saved successfully to: {self.path}")
+
+    def abort(self) -> None:
+        if self._opened:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._partial.unlink(missing_ok=True)
+            self._opened = False
+
+
+def sink_for_path(path: str) -> IngestionSink:
+    """
+    File sink matching the output's extension.
+
+    Args:
+        path: Output file; ``.parquet``/``.pq`` selects Parquet, anything else CSV.
+
+    Returns:
+        A ParquetSink or CsvSink for ``path``
+    """
+    return ParquetSink(path) if is_parquet(path) else CsvSink(path)
+
+
+class FrameSink(IngestionSink):
+    """Collects the chunks in memory, for same-process consumers of the parsed data."""
+
+    def __init__(self) -> None:
+        self._chunks: List[pd.DataFrame] = []
+
+    def open(self) -> None:
+        self._chunks = []
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        self._chunks.append(chunk)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Every row written so far as one DataFrame."""
+        if not self._chunks:
+            return pd.DataFrame()
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        frame = pd.concat(self._chunks)
+        # Chunks parse categoricals with their own categories, which concat turns back into objects
+        for column, dtype in self._chunks[0].dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = union_categoricals([chunk[column] for chunk in self._chunks], sort_categories=True)
+        return frame
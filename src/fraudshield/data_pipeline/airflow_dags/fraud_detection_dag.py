@@ -15,11 +15,21 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict
 
-from airflow import DAG
-from airflow.models import Variable
-from airflow.operators.python import PythonOperator
+# Ensure src/ is on the path for DAG imports (src layout).
+SRC_ROOT = Path(__file__).resolve().parents[3]
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from fraudshield.data_pipeline.airflow_env import configure_airflow  # noqa: E402
+
+# Airflow reads its settings at import time, so localize it first
+configure_airflow()
 
-from fraudshield.data_pipeline.pipeline_tasks import (
+from airflow import DAG  # noqa: E402
+from airflow.models import Variable  # noqa: E402
+from airflow.operators.python import PythonOperator  # noqa: E402
+
+from fraudshield.data_pipeline.pipeline_tasks import (  # noqa: E402
     run_data_ingestion,
     run_model_deployment,
     run_data_preprocessing,
@@ -27,11 +37,6 @@ from fraudshield.data_pipeline.pipeline_tasks import (
     run_model_training,
 )
 
-# Ensure src/ is on the path for DAG imports (src layout).
-SRC_ROOT = Path(__file__).resolve().parents[3]
-if str(SRC_ROOT) not in sys.path:
-    sys.path.insert(0, str(SRC_ROOT))
-
 try:
     from airflow.providers.snowflake.operators.snowflake import SnowflakeOperator
 except ImportError as e:
@@ -0,0 +1,57 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module localizes Airflow to the project root. The DAG calls it before
+importing Airflow, so importing the fraudshield package itself never touches
+Airflow or its metadata database.
+
+File: airflow_env.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+AIRFLOW_HOME = PROJECT_ROOT / ".airflow"
+AIRFLOW_DB = AIRFLOW_HOME / "airflow.db"
+
+
+def configure_airflow(migrate: bool = True) -> None:
+    """
+    Points Airflow at ``<project>/.airflow`` unless ``AIRFLOW_HOME`` is already set.
+
+    Must run before ``airflow`` is imported, since Airflow reads its settings
+    at import time. A deployment that sets ``AIRFLOW_HOME`` keeps its own
+    configuration untouched.
+
+    Args:
+        migrate: Create the local SQLite metadata database with
+            ``airflow db migrate`` when it does not exist yet. Skipped when the
+            environment supplies its own database connection.
+    """
+    if "AIRFLOW_HOME" in os.environ:
+        return
+    local_db = "AIRFLOW__DATABASE__SQL_ALCHEMY_CONN" not in os.environ
+    os.environ["AIRFLOW_HOME"] = str(AIRFLOW_HOME)
+    os.environ.setdefault("AIRFLOW__DATABASE__SQL_ALCHEMY_CONN", f"sqlite:///{AIRFLOW_DB}")
+    os.environ.setdefault("AIRFLOW__CORE__LOAD_EXAMPLES", "False")
+
+    if migrate and local_db and not AIRFLOW_DB.exists():
+        AIRFLOW_HOME.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Initializing the local Airflow database at {AIRFLOW_DB}")
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "airflow", "db", "migrate"],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Airflow database migration failed: {e}")
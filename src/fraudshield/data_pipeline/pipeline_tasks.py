@@ -3,7 +3,8 @@ FraudShield - Advanced Anomaly Detection Pipeline
 
 This module provides independent task wrappers for the core steps
 in the ML pipeline (ingestion, preprocessing, training, evaluation),
-designed specifically to be scheduled by Airflow DAGs.
+designed specifically to be scheduled by Airflow DAGs. Each wrapper imports
+its step when it runs, so parsing the DAG does not load the ML stack.
 
 File: pipeline_tasks.py
 Author: Mudit Bhargava
@@ -13,11 +14,6 @@ License: MIT
 import logging
 from typing import Any
 
-from fraudshield.data_ingestion.data_ingestion import DataIngestion
-from fraudshield.data_preprocessing.data_preprocessing import preprocess_and_save
-from fraudshield.model_evaluation.evaluation import evaluate_and_save
-from fraudshield.model_training.train_models import train_and_save
-
 logger = logging.getLogger(__name__)
 
 
@@ -26,22 +22,29 @@ def run_data_ingestion(
     table: str,
     data_path: str = "data/raw",
     input_file: str = "synthetic_fraud_data.csv",
-    output_file: str = "data/processed/ingested_data.csv",
+    output_file: str = "data/processed/ingested_data.parquet",
+    stream: bool = False,
 ) -> None:
+    from fraudshield.data_ingestion.data_ingestion import DataIngestion
+
     logger.info("Starting data ingestion task")
     ingestion = DataIngestion(data_path, database)
-    ingestion.run_ingestion_pipeline(input_file, table)
-    ingestion.save_ingested_data(input_file, output_file)
+    # One parse feeds both the database table and the file handed to preprocessing
+    ingestion.run_ingestion_pipeline(input_file, table, stream=stream, output_file=output_file)
     logger.info("Data ingestion task completed")
 
 
 def run_data_preprocessing(**kwargs: Any) -> None:
+    from fraudshield.data_preprocessing.data_preprocessing import preprocess_and_save
+
     logger.info("Starting data preprocessing task")
     preprocess_and_save(**kwargs)
     logger.info("Data preprocessing task completed")
 
 
 def run_model_training(**kwargs: Any) -> None:
+    from fraudshield.model_training.train_models import train_and_save
+
     logger.info("Starting model training task")
     train_and_save(**kwargs)
     logger.info("Model training task completed")
@@ -53,7 +56,11 @@ def run_model_evaluation(
     output_path: str = "data/models/evaluation_report.csv",
     confusion_matrix_path: str = "data/plots/confusion_matrix.png",
     normalize_cm: bool = False,
+    metrics_only: bool = False,
+    cm_renderer: str = "seaborn",
 ) -> None:
+    from fraudshield.model_evaluation.evaluation import evaluate_and_save
+
     logger.info("Starting model evaluation task")
     evaluate_and_save(
         model_path=model_path,
@@ -61,6 +68,8 @@ def run_model_evaluation(
         output_path=output_path,
         confusion_matrix_path=confusion_matrix_path,
         normalize_cm=normalize_cm,
+        metrics_only=metrics_only,
+        cm_renderer=cm_renderer,
     )
     logger.info("Model evaluation task completed")
 
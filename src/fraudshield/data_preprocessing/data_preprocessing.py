@@ -13,7 +13,6 @@ License: MIT
 import argparse
 import json
 import logging
-import sys
 from pathlib import Path
 from typing import Any, List, Optional, Tuple
 
@@ -27,20 +26,27 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-from fraudshield.data_cleaning.cpp_wrapper import remove_missing_values, remove_outliers
+from fraudshield.data_cleaning.cpp_wrapper import OUTLIER_METHODS, summarize_columns, summarize_outliers
+from fraudshield.data_ingestion.columnar import read_ingested_data, row_groups_in_range
+from fraudshield.feature_engineering.checkpoint import (
+    add_transaction_features_incremental,
+    load_feature_checkpoint,
+    save_feature_checkpoint,
+)
+from fraudshield.feature_engineering.dtypes import compact_dtypes as compact_frame
+from fraudshield.feature_engineering.feature_cache import (
+    DEFAULT_MAX_BYTES,
+    FeatureCache,
+    add_transaction_features_cached,
+)
 from fraudshield.feature_engineering.transaction_features import (
     TransactionFeatureConfig,
+    _ensure_datetime,
     add_transaction_features,
     parse_windows,
 )
+from fraudshield.logging_config import configure_logging
 
-# Set up logging
-Path("logs").mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("logs/fraudshield_preprocess.log"), logging.StreamHandler(sys.stdout)],
-)
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +75,11 @@ def _parse_id_columns_arg(value: str) -> Optional[List[str]]:
     return [col.strip() for col in value.split(",") if col.strip()]
 
 
+def _parse_list_arg(value: str) -> Optional[List[str]]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
+
 def _make_one_hot_encoder() -> OneHotEncoder:
     return OneHotEncoder(handle_unknown="ignore", sparse_output=True)
 
@@ -112,6 +123,101 @@ def _to_dense(matrix: Any) -> np.ndarray:
     return np.asarray(matrix)
 
 
+def _winsorize_numeric_columns(
+    data: pd.DataFrame,
+    columns: List[str],
+    method: str,
+    threshold: float,
+) -> pd.DataFrame:
+    """Clip outliers in every listed numeric column with one native multi-column call."""
+    if not columns:
+        return data
+    # Nullable extension columns (Int64 and friends) are read with pd.NA as NaN
+    dtype = np.float32 if all(dtype == np.float32 for dtype in data[columns].dtypes) else np.float64
+    matrix = data[columns].to_numpy(dtype=dtype, na_value=np.nan)
+    summary = summarize_columns(matrix, threshold=threshold, method=method, winsorize=True, out=matrix)
+    changed = np.flatnonzero(summary.n_outliers)
+    for j in changed:
+        # Replace the whole column: clipped bounds need not fit an integer dtype
+        data[columns[j]] = summary.values[:, j]
+    logger.info(
+        f"Winsorized {int(summary.n_outliers.sum())} values in {len(changed)} of {len(columns)} numeric columns "
+        f"({method}, threshold {threshold})"
+    )
+    return data
+
+
+def _history_partitions(history_dir: Path, watermark: Optional[int]) -> List[Path]:
+    """
+    Committed history partitions in time order, deleting the rest.
+
+    Partitions past ``watermark`` come from a run that never saved its
+    checkpoint; without a checkpoint (``None``) every partition is stale.
+    """
+    partitions = []
+    for path in sorted(history_dir.glob("part-*.parquet")):
+        if watermark is None or int(path.stem.split("-", 1)[1]) > watermark:
+            path.unlink()
+        else:
+            partitions.append(path)
+    return partitions
+
+
+def _add_transaction_features_from_state(
+    data: pd.DataFrame,
+    feature_config: TransactionFeatureConfig,
+    feature_state_dir: str,
+) -> pd.DataFrame:
+    """
+    Featurize only rows newer than the stored checkpoint and reuse stored features for the rest.
+
+    Each run appends its newly featured rows to the history as one Parquet
+    partition named after its watermark. Rows of ``data`` at or before the
+    checkpoint watermark are served from the partitions covering their time
+    range, so ``data`` may hold full history or just the newly arrived rows,
+    and a run over new rows alone reads and writes only those rows.
+    """
+    state_dir = Path(feature_state_dir)
+    checkpoint_path = state_dir / "feature_checkpoint.joblib"
+    history_dir = state_dir / "featured_history"
+    time_column = feature_config.time_column
+
+    checkpoint = load_feature_checkpoint(str(checkpoint_path))
+    partitions = _history_partitions(history_dir, checkpoint.watermark if checkpoint is not None else None)
+    if not partitions:
+        checkpoint = None
+
+    times = _ensure_datetime(data[time_column])
+    new_rows = data
+    history = []
+    if checkpoint is not None:
+        watermark = pd.Timestamp(checkpoint.watermark, tz="UTC")
+        is_old = (times <= watermark).to_numpy()
+        new_rows = data.loc[~is_old]
+        if is_old.any():
+            # Only partitions whose row groups reach the earliest old row are read
+            start = times[is_old].min()
+            for path in partitions:
+                if row_groups_in_range(str(path), time_column, start=start):
+                    history.append(read_ingested_data(str(path), date_column=time_column, start=start))
+
+    featured, checkpoint = add_transaction_features_incremental(new_rows, feature_config, checkpoint)
+    reused = sum(len(part) for part in history)
+    logger.info(f"Incremental features: {len(featured)} new rows, {reused} reused from {len(history)} partitions.")
+
+    has_time = featured[time_column].notna()
+    state_dir.mkdir(parents=True, exist_ok=True)
+    if has_time.any():
+        history_dir.mkdir(parents=True, exist_ok=True)
+        partition = history_dir / f"part-{checkpoint.watermark:020d}.parquet"
+        partial = partition.with_name(partition.name + ".partial")
+        featured.loc[has_time].reset_index(drop=True).to_parquet(partial, index=False)
+        partial.replace(partition)
+    # The checkpoint commits the partition; a crash before this line leaves it to be discarded
+    save_feature_checkpoint(checkpoint, str(checkpoint_path))
+    return pd.concat([*history, featured.loc[has_time], featured.loc[~has_time]], ignore_index=True)
+
+
 def preprocess_data(
     data: pd.DataFrame,
     target_column: str = "fraud",
@@ -127,6 +233,16 @@ def preprocess_data(
     status_column: str = "status",
     feature_windows: Optional[List[str]] = None,
     id_columns: Optional[List[str]] = None,
+    feature_state_dir: Optional[str] = None,
+    feature_n_jobs: int = 1,
+    compact_dtypes: bool = False,
+    feature_cache_dir: Optional[str] = None,
+    feature_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    feature_families: Optional[List[str]] = None,
+    feature_aggregates: Optional[List[str]] = None,
+    selected_features: Optional[List[str]] = None,
+    winsorize_numeric: Optional[str] = None,
+    winsorize_threshold: float = 4.0,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, ColumnTransformer, List[str]]:
     logger.info("Starting data preprocessing...")
 
@@ -135,6 +251,8 @@ def preprocess_data(
 
     if target_column not in data.columns:
         raise ValueError(f"Target column '{target_column}' not found in input data.")
+    if winsorize_numeric is not None and winsorize_numeric not in OUTLIER_METHODS:
+        raise ValueError(f"winsorize_numeric must be one of {OUTLIER_METHODS}, got '{winsorize_numeric}'")
 
     feature_config = TransactionFeatureConfig(
         time_column=time_column,
@@ -145,11 +263,25 @@ def preprocess_data(
         status_column=status_column,
         target_column=target_column,
         windows=parse_windows(feature_windows),
+        n_jobs=feature_n_jobs,
+        compact_dtypes=compact_dtypes,
+        families=feature_families,
+        aggregates=feature_aggregates,
+        features=selected_features,
     )
 
-    working_data = data.copy()
+    if compact_dtypes:
+        # compact_frame returns a new frame, so the input is never modified
+        working_data, _ = compact_frame(data, exclude=[target_column, time_column], money_columns=[amount_column])
+    else:
+        working_data = data.copy()
     use_time_split = time_column in working_data.columns and working_data[time_column].notna().any()
-    if use_time_split:
+    if use_time_split and feature_state_dir:
+        working_data = _add_transaction_features_from_state(working_data, feature_config, feature_state_dir)
+    elif use_time_split and feature_cache_dir:
+        cache = FeatureCache(feature_cache_dir, max_bytes=feature_cache_max_bytes)
+        working_data = add_transaction_features_cached(working_data, feature_config, cache)
+    elif use_time_split:
         working_data = add_transaction_features(working_data, feature_config)
 
     drop_set = set(drop_columns or [])
@@ -162,21 +294,28 @@ def preprocess_data(
     if amount_column in working_data.columns:
         logger.info(f"Applying native C++ data cleaning routines for column: {amount_column}")
 
-        amount_data = working_data[amount_column]
-        cleaned_amount = remove_outliers(remove_missing_values(amount_data.to_numpy()), threshold=4.0)
+        amount_data = working_data[amount_column].to_numpy()
+        summary = summarize_outliers(amount_data, threshold=4.0)
 
         # In a generic ML pipeline, dropping independent rows changes the target mapping length.
-        # We fill anomalies based on the clean C++ bounded array.
-        median_val = float(np.median(cleaned_amount)) if len(cleaned_amount) > 0 else 0.0
-
-        mean_val = amount_data.mean()
-        std_val = amount_data.std()
-
-        if std_val > 0:
-            outlier_mask = np.abs((amount_data - mean_val) / std_val) > 4.0
-            working_data.loc[outlier_mask, amount_column] = median_val
-
-        working_data[amount_column] = working_data[amount_column].fillna(median_val)
+        # Missing values and outliers are filled with the median of the kept values instead.
+        median_val = 0.0 if np.isnan(summary.median) else summary.median
+        if summary.n_missing or summary.n_outliers:
+            logger.info(
+                f"Replacing {summary.n_missing} missing and {summary.n_outliers} out-of-range "
+                f"[{summary.lower:.4g}, {summary.upper:.4g}] values of {amount_column} with median {median_val:.4g}"
+            )
+            working_data[amount_column] = np.where(summary.keep, amount_data, median_val)
+
+    if winsorize_numeric:
+        # Remaining NaNs are left to the median imputer fitted on the training split
+        skip = {target_column, amount_column, *drop_set}
+        numeric_columns = [
+            col for col in working_data.select_dtypes(include="number").columns if col not in skip
+        ]
+        working_data = _winsorize_numeric_columns(
+            working_data, numeric_columns, winsorize_numeric, winsorize_threshold
+        )
 
     if use_time_split:
         logger.info("Using time-based split based on transaction date.")
@@ -257,9 +396,23 @@ def preprocess_and_save(
     status_column: str = "status",
     feature_windows: Optional[List[str]] = None,
     id_columns: Optional[List[str]] = None,
+    feature_state_dir: Optional[str] = None,
+    feature_n_jobs: int = 1,
+    compact_dtypes: bool = False,
+    feature_cache_dir: Optional[str] = None,
+    feature_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+    feature_families: Optional[List[str]] = None,
+    feature_aggregates: Optional[List[str]] = None,
+    selected_features: Optional[List[str]] = None,
+    winsorize_numeric: Optional[str] = None,
+    winsorize_threshold: float = 4.0,
+    input_columns: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
 ) -> None:
     logger.info(f"Reading input data from: {input_data}")
-    ingested_data = pd.read_csv(input_data)
+    # Parquet input only decodes the requested columns and the row groups inside the date range
+    ingested_data = read_ingested_data(input_data, columns=input_columns, date_column=time_column, start=start_date, end=end_date)
 
     use_time_split = bool(time_column in ingested_data.columns and ingested_data[time_column].notna().any())
 
@@ -278,6 +431,16 @@ def preprocess_and_save(
         status_column=status_column,
         feature_windows=feature_windows,
         id_columns=id_columns,
+        feature_state_dir=feature_state_dir,
+        feature_n_jobs=feature_n_jobs,
+        compact_dtypes=compact_dtypes,
+        feature_cache_dir=feature_cache_dir,
+        feature_cache_max_bytes=feature_cache_max_bytes,
+        feature_families=feature_families,
+        feature_aggregates=feature_aggregates,
+        selected_features=selected_features,
+        winsorize_numeric=winsorize_numeric,
+        winsorize_threshold=winsorize_threshold,
     )
 
     train_path = Path(train_data)
@@ -307,15 +470,38 @@ def preprocess_and_save(
         "status_column": status_column,
         "feature_windows": parse_windows(feature_windows),
         "id_columns": _resolve_id_columns(id_columns, user_column, merchant_column),
+        "compact_dtypes": compact_dtypes,
+        "feature_families": feature_families,
+        "feature_aggregates": feature_aggregates,
+        "selected_features": selected_features,
+        "winsorize_numeric": winsorize_numeric,
+        "winsorize_threshold": winsorize_threshold,
+        "input_columns": input_columns,
+        "start_date": start_date,
+        "end_date": end_date,
     }
     metadata_path_obj.write_text(json.dumps(metadata, indent=2))
 
 
 def main() -> None:
+    configure_logging("fraudshield_preprocess.log")
     parser = argparse.ArgumentParser(description="Preprocess data for fraud detection")
     parser.add_argument(
-        "--input_data", type=str, default="data/processed/ingested_data.csv", help="Path to the input data CSV file"
+        "--input_data",
+        type=str,
+        default="data/processed/ingested_data.parquet",
+        help="Path to the ingested data (.parquet or CSV)",
+    )
+    parser.add_argument(
+        "--input_columns",
+        type=str,
+        default="",
+        help="Comma-separated columns to read from the ingested data (default: all)",
     )
+    parser.add_argument(
+        "--start_date", type=str, default=None, help="Only use transactions dated on or after this date, e.g. 2024-01-01"
+    )
+    parser.add_argument("--end_date", type=str, default=None, help="Only use transactions dated before this date")
     parser.add_argument(
         "--train_data",
         type=str,
@@ -364,6 +550,68 @@ def main() -> None:
         default="auto",
         help='Identifier columns to drop: comma-separated list, or "auto"/"none"',
     )
+    parser.add_argument(
+        "--feature_state_dir",
+        type=str,
+        default=None,
+        help="Directory for checkpointed feature state; only rows newer than the checkpoint are featurized",
+    )
+    parser.add_argument(
+        "--feature_n_jobs",
+        type=int,
+        default=1,
+        help="Worker processes for entity-partitioned feature computation (-1 uses every core)",
+    )
+    parser.add_argument(
+        "--compact_dtypes",
+        action="store_true",
+        help="Use categorical/int32 ids and float32 amounts and features where values are preserved",
+    )
+    parser.add_argument(
+        "--feature_cache_dir",
+        type=str,
+        default=None,
+        help="Directory for the content-addressed feature cache; unchanged inputs skip feature computation",
+    )
+    parser.add_argument(
+        "--feature_cache_max_mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="Size budget for the feature cache before least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--feature_families",
+        type=str,
+        default="",
+        help=(
+            "Comma-separated feature families to compute (user, merchant, user_merchant, currency, status; "
+            "opt-in: user_indicators, merchant_indicators)"
+        ),
+    )
+    parser.add_argument(
+        "--feature_aggregates",
+        type=str,
+        default="",
+        help="Comma-separated rolling aggregates to compute (count, sum, mean)",
+    )
+    parser.add_argument(
+        "--selected_features",
+        type=str,
+        default="",
+        help="Comma-separated engineered feature columns to compute, e.g. user_txn_count_24h",
+    )
+    parser.add_argument(
+        "--winsorize_numeric",
+        choices=list(OUTLIER_METHODS),
+        default=None,
+        help="Clip outliers in every numeric feature column using mean/std (zscore) or median/MAD (mad) bounds",
+    )
+    parser.add_argument(
+        "--winsorize_threshold",
+        type=float,
+        default=4.0,
+        help="Outlier threshold in standard deviations or scaled MADs for --winsorize_numeric",
+    )
     parser.add_argument("--test_size", type=float, default=0.2, help="Fraction of data to use for test set")
     parser.add_argument("--random_state", type=int, default=42, help="Random seed for data splitting")
     parser.add_argument("--no_stratify", action="store_true", help="Disable stratified splitting")
@@ -391,6 +639,19 @@ def main() -> None:
         status_column=args.status_column,
         feature_windows=args.feature_windows,
         id_columns=id_columns,
+        feature_state_dir=args.feature_state_dir,
+        feature_n_jobs=args.feature_n_jobs,
+        compact_dtypes=args.compact_dtypes,
+        feature_cache_dir=args.feature_cache_dir,
+        feature_cache_max_bytes=args.feature_cache_max_mb * 1024**2,
+        feature_families=_parse_list_arg(args.feature_families),
+        feature_aggregates=_parse_list_arg(args.feature_aggregates),
+        selected_features=_parse_list_arg(args.selected_features),
+        winsorize_numeric=args.winsorize_numeric,
+        winsorize_threshold=args.winsorize_threshold,
+        input_columns=_parse_list_arg(args.input_columns),
+        start_date=args.start_date,
+        end_date=args.end_date,
     )
 
     logger.info("Preprocessed data saved successfully!")
@@ -9,14 +9,31 @@ Author: Mudit Bhargava
 License: MIT
 """
 
+from fraudshield.feature_engineering.checkpoint import (
+    FeatureCheckpoint,
+    add_transaction_features_incremental,
+    load_feature_checkpoint,
+    save_feature_checkpoint,
+)
+from fraudshield.feature_engineering.feature_cache import FeatureCache, add_transaction_features_cached
+from fraudshield.feature_engineering.online_state import OnlineFeatureState
 from fraudshield.feature_engineering.transaction_features import (
     TransactionFeatureConfig,
     add_transaction_features,
+    feature_names,
     parse_windows,
 )
 
 __all__ = [
+    "FeatureCache",
+    "FeatureCheckpoint",
+    "OnlineFeatureState",
     "TransactionFeatureConfig",
     "add_transaction_features",
+    "add_transaction_features_cached",
+    "add_transaction_features_incremental",
+    "feature_names",
+    "load_feature_checkpoint",
     "parse_windows",
+    "save_feature_checkpoint",
 ]
@@ -0,0 +1,298 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module implements append-mode transaction features. A checkpoint keeps
+the tail of history still inside the longest window (plus each entity's last
+transaction) and the per-user expanding moments, so a run over newly
+arrived rows reproduces the full-history features without recomputing them.
+
+File: checkpoint.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from fraudshield.feature_engineering.rolling_engine import NAT, expanding_stats, window_to_ns
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    _ensure_datetime,
+    _epoch_ns,
+    _indicator_families,
+    _recency_families,
+    _user_expanding_features,
+    _window_families,
+    add_transaction_features,
+    feature_names,
+)
+
+logger = logging.getLogger(__name__)
+
+MOMENT_COLUMNS = ["count", "mean", "m2", "min", "max"]
+
+
+@dataclass
+class FeatureCheckpoint:
+    """
+    Window and expanding state carried between append-mode feature runs.
+
+    Attributes:
+        watermark: Latest transaction time seen, as epoch nanoseconds
+        windows: Rolling windows the selected features use
+        features: Feature columns the state was built for
+        tail: Input rows newer than ``watermark - longest window`` plus the
+            last row of every recency entity
+        moments: Per-user ``count``/``mean``/``m2``/``min``/``max`` of the amount
+            over all ingested rows, indexed by user
+        n_rows: Rows ingested so far
+    """
+
+    watermark: int
+    windows: List[str]
+    features: List[str]
+    tail: pd.DataFrame
+    moments: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=MOMENT_COLUMNS))
+    n_rows: int = 0
+
+
+def save_feature_checkpoint(checkpoint: FeatureCheckpoint, path: str) -> None:
+    """
+    Saves a feature checkpoint to disk.
+
+    Args:
+        checkpoint: State returned by ``add_transaction_features_incremental``
+        path: Destination file
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    joblib.dump(checkpoint, path)
+
+
+def load_feature_checkpoint(path: str) -> Optional[FeatureCheckpoint]:
+    """
+    Loads a feature checkpoint from disk.
+
+    Args:
+        path: File written by ``save_feature_checkpoint``
+
+    Returns:
+        The checkpoint, or None when the file does not exist yet
+    """
+    if not os.path.exists(path):
+        return None
+    return joblib.load(path)
+
+
+def _combine_moments(
+    count_a: np.ndarray,
+    mean_a: np.ndarray,
+    m2_a: np.ndarray,
+    count_b: np.ndarray,
+    mean_b: np.ndarray,
+    m2_b: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Chan et al. parallel merge of two (count, mean, M2) summaries; empty sides may hold NaN."""
+    mean_a = np.where(count_a > 0, mean_a, 0.0)
+    mean_b = np.where(count_b > 0, mean_b, 0.0)
+    m2_a = np.where(count_a > 1, m2_a, 0.0)
+    m2_b = np.where(count_b > 1, m2_b, 0.0)
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, mean_a + delta * count_b / count, np.nan)
+        m2 = m2_a + m2_b + np.where(count > 0, delta * delta * count_a * count_b / count, 0.0)
+    return count, mean, m2
+
+
+def _prior_moments(moments: pd.DataFrame, users: np.ndarray) -> Dict[str, np.ndarray]:
+    aligned = moments.reindex(pd.Index(users))
+    prior = {column: aligned[column].to_numpy(dtype=np.float64) for column in MOMENT_COLUMNS}
+    prior["count"] = np.nan_to_num(prior["count"])
+    return prior
+
+
+def _continued_expanding_stats(
+    work_df: pd.DataFrame,
+    times: np.ndarray,
+    config: TransactionFeatureConfig,
+    moments: pd.DataFrame,
+) -> Dict[str, np.ndarray]:
+    """Expanding amount statistics for ``work_df`` rows, continued from the checkpointed moments."""
+    users = work_df[config.user_column].to_numpy()
+    amounts = work_df[config.amount_column].to_numpy(dtype=np.float64)
+    stats = expanding_stats(users, times, amounts)
+    prior = _prior_moments(moments, users)
+
+    count_b = stats["count"]
+    with np.errstate(invalid="ignore"):
+        m2_b = stats["std"] ** 2 * (count_b - 1)
+    count, mean, m2 = _combine_moments(prior["count"], prior["mean"], prior["m2"], count_b, stats["mean"], m2_b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(np.where(count > 1, m2 / (count - 1), np.nan))
+        zscore = np.where((std > 0) & ~np.isnan(amounts), (amounts - mean) / std, np.nan)
+
+    # Rows the batch kernel skips (missing user or time) stay NaN
+    skipped = np.isnan(count_b)
+    merged = {
+        "count": count,
+        "mean": mean,
+        "std": std,
+        "min": np.fmin(prior["min"], stats["min"]),
+        "max": np.fmax(prior["max"], stats["max"]),
+        "zscore": zscore,
+    }
+    for column in merged.values():
+        column[skipped] = np.nan
+    return merged
+
+
+def _updated_moments(
+    moments: pd.DataFrame,
+    work_df: pd.DataFrame,
+    valid_time: np.ndarray,
+    config: TransactionFeatureConfig,
+) -> pd.DataFrame:
+    rows = work_df.loc[valid_time, [config.user_column, config.amount_column]]
+    grouped = rows.groupby(config.user_column, sort=False)[config.amount_column]
+    batch = pd.DataFrame(
+        {
+            "count": grouped.count().astype(np.float64),
+            "mean": grouped.mean(),
+            "m2": grouped.var(ddof=0) * grouped.count(),
+            "min": grouped.min(),
+            "max": grouped.max(),
+        }
+    )
+    users = moments.index.union(batch.index, sort=False)
+    a = moments.reindex(users)
+    b = batch.reindex(users)
+    count, mean, m2 = _combine_moments(
+        np.nan_to_num(a["count"].to_numpy(dtype=np.float64)),
+        a["mean"].to_numpy(dtype=np.float64),
+        a["m2"].to_numpy(dtype=np.float64),
+        np.nan_to_num(b["count"].to_numpy(dtype=np.float64)),
+        b["mean"].to_numpy(dtype=np.float64),
+        b["m2"].to_numpy(dtype=np.float64),
+    )
+    return pd.DataFrame(
+        {
+            "count": count,
+            "mean": mean,
+            "m2": m2,
+            "min": np.fmin(a["min"].to_numpy(dtype=np.float64), b["min"].to_numpy(dtype=np.float64)),
+            "max": np.fmax(a["max"].to_numpy(dtype=np.float64), b["max"].to_numpy(dtype=np.float64)),
+        },
+        index=users,
+    )
+
+
+def _state_columns(config: TransactionFeatureConfig, columns: List[str]) -> List[str]:
+    """Input columns the window and recency features read."""
+    needed = [config.time_column, config.amount_column]
+    for _, key_columns in _recency_families(config, columns):
+        needed.extend(key_columns)
+    for family in _window_families(config, columns):
+        needed.append(family.entity_column)
+        needed.extend(spec.value for spec in family.aggregates)
+    return [column for column in dict.fromkeys(needed) if column in columns]
+
+
+def _updated_tail(
+    tail: pd.DataFrame,
+    work_df: pd.DataFrame,
+    valid_time: np.ndarray,
+    watermark: int,
+    windows: List[str],
+    config: TransactionFeatureConfig,
+) -> pd.DataFrame:
+    columns = _state_columns(config, list(work_df.columns))
+    history = pd.concat([tail, work_df.loc[valid_time, columns]], ignore_index=True)
+    history = history.sort_values(config.time_column, kind="stable").reset_index(drop=True)
+
+    horizon = max((window_to_ns(window) for window in windows), default=0)
+    times = _epoch_ns(pd.DatetimeIndex(history[config.time_column]))
+    keep = times >= max(watermark - horizon, NAT + 1)
+    # Each entity's last row keeps time_since_last_txn exact past the window horizon
+    for _, key_columns in _recency_families(config, history.columns):
+        keep |= ~history.duplicated(subset=list(key_columns), keep="last").to_numpy()
+    return history.loc[keep].reset_index(drop=True)
+
+
+def add_transaction_features_incremental(
+    df: pd.DataFrame,
+    config: TransactionFeatureConfig,
+    checkpoint: Optional[FeatureCheckpoint] = None,
+) -> Tuple[pd.DataFrame, Optional[FeatureCheckpoint]]:
+    """
+    Append-mode ``add_transaction_features``: featurize only the new rows.
+
+    Features match a full-history run over every row ingested so far, as long
+    as new rows are not older than the checkpoint watermark. Cost scales with
+    ``len(df)`` plus the checkpointed tail, not with total history.
+
+    Args:
+        df: Newly arrived transactions
+        config: Feature configuration (must select the checkpoint's feature set)
+        checkpoint: State from the previous run, or None to start from scratch
+
+    Returns:
+        Tuple of the featured ``df`` (indexed like ``df``) and the checkpoint
+        to pass to the next run
+    """
+    if config.time_column not in df.columns or config.amount_column not in df.columns:
+        logger.info("Skipping transaction features: required columns missing.")
+        return df, checkpoint
+
+    if _indicator_families(config, df.columns):
+        raise ValueError("Indicator families depend on each entity's full history; append mode does not support them.")
+    names = feature_names(config, df.columns)
+    if checkpoint is not None and list(checkpoint.features) != names:
+        raise ValueError("Checkpoint was built for a different feature set; start a new checkpoint.")
+    windows = list(dict.fromkeys(window for family in _window_families(config, df.columns) for window in family.windows))
+
+    work_df = df.copy()
+    work_df[config.time_column] = _ensure_datetime(work_df[config.time_column])
+    times = _epoch_ns(pd.DatetimeIndex(work_df[config.time_column]))
+    valid_time = times != NAT
+    if checkpoint is not None and (times[valid_time] < checkpoint.watermark).any():
+        raise ValueError("New transactions must not be older than the checkpoint watermark.")
+
+    tail = checkpoint.tail if checkpoint is not None else work_df.iloc[:0][_state_columns(config, list(work_df.columns))]
+    moments = checkpoint.moments if checkpoint is not None else pd.DataFrame(columns=MOMENT_COLUMNS, dtype=np.float64)
+
+    # Tail rows precede the new rows, so ties at the watermark order as in a full run
+    combined = pd.concat([tail, work_df], ignore_index=True)
+    featured = add_transaction_features(combined, config).iloc[len(tail):]
+    featured.index = df.index
+
+    if config.user_column in work_df.columns:
+        order = np.argsort(times, kind="stable")
+        stats = _continued_expanding_stats(work_df.iloc[order], times[order], config, moments)
+        for name, stat in _user_expanding_features(config, work_df.columns):
+            column = np.empty(len(order))
+            column[order] = stats[stat]
+            featured[name] = column
+        moments = _updated_moments(moments, work_df, valid_time, config)
+
+    watermark = int(times[valid_time].max()) if valid_time.any() else NAT
+    if checkpoint is not None:
+        watermark = max(watermark, checkpoint.watermark)
+    new_checkpoint = FeatureCheckpoint(
+        watermark=watermark,
+        windows=windows,
+        features=names,
+        tail=_updated_tail(tail, work_df, valid_time, watermark, windows, config),
+        moments=moments,
+        n_rows=(checkpoint.n_rows if checkpoint is not None else 0) + len(df),
+    )
+    logger.info(
+        f"Computed transaction features for {len(df)} new rows with {len(tail)} checkpointed rows "
+        f"({len(new_checkpoint.tail)} carried forward)."
+    )
+    return featured, new_checkpoint
@@ -10,6 +10,7 @@ Author: Mudit Bhargava
 License: MIT
 """
 import logging
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -26,97 +27,596 @@ except ImportError as e:
     logger.warning(f"C++ feature engineering module not available: {e}. Using Python fallback.")
 
 
-def calculate_moving_average(data: np.ndarray, window_size: int) -> np.ndarray:
+def _native(data: np.ndarray) -> np.ndarray:
+    """Pass float32/float64 arrays through untouched; convert anything else to float64."""
+    data = np.asarray(data)
+    if data.dtype in (np.float32, np.float64):
+        return data
+    return data.astype(np.float64)
+
+
+def _write_out(result: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    """Copy ``result`` into ``out`` when given, mirroring the C++ ``out`` contract."""
+    if out is None:
+        return result
+    if out.dtype != result.dtype or out.shape != result.shape:
+        raise ValueError(f"out must be a {result.dtype} array of shape {result.shape}")
+    out[...] = result
+    return out
+
+
+def _exponential_filter(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """
+    Evaluate ``y[i] = alpha * values[i] + (1 - alpha) * y[i - 1]`` with ``y[-1] = initial``.
+
+    ``scipy.signal.lfilter`` runs the recurrence in compiled code, so the
+    fallback avoids a per-element Python loop.
+    """
+    from scipy.signal import lfilter
+
+    if len(values) == 0:
+        return values
+    decay = 1.0 - alpha
+    return lfilter([alpha], [1.0, -decay], values, zi=[decay * initial])[0]
+
+
+def calculate_moving_average(data: np.ndarray, window_size: int, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Calculate moving average with specified window size.
 
+    float32 and float64 inputs, including strided views, are read in place and
+    the result keeps the input dtype.
+
     Args:
         data: Input numpy array
         window_size: Size of the moving window
+        out: Optional array of ``len(data) - window_size + 1`` elements to write into;
+            must not overlap ``data``, since the running sum re-reads inputs already overwritten
 
     Returns:
-        Array of moving averages
+        Array of moving averages (``out`` when given)
     """
+    if out is not None and np.shares_memory(data, out):
+        raise ValueError("out must not overlap data for the moving average.")
+    data = _native(data)
     if CPP_AVAILABLE:
         try:
-            return _feature_engineering_cpp.calculate_moving_average(data.astype(np.float64), window_size)
+            return _feature_engineering_cpp.calculate_moving_average(data, window_size, out=out)
         except Exception as e:
             logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
     # Python fallback using pandas
     import pandas as pd
 
-    return pd.Series(data).rolling(window=window_size).mean().values[window_size - 1:]
+    result = pd.Series(data).rolling(window=window_size).mean().values[window_size - 1:]
+    return _write_out(result.astype(data.dtype, copy=False), out)
 
 
-def calculate_exponential_moving_average(data: np.ndarray, alpha: float) -> np.ndarray:
+def calculate_exponential_moving_average(data: np.ndarray, alpha: float, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Calculate exponential moving average with alpha parameter.
 
+    float32 and float64 inputs, including strided views, are read in place and
+    the result keeps the input dtype.
+
     Args:
         data: Input numpy array
         alpha: Smoothing factor (0 < alpha <= 1)
+        out: Optional array of ``len(data)`` elements to write into
 
     Returns:
-        Array of exponential moving averages
+        Array of exponential moving averages (``out`` when given)
     """
+    data = _native(data)
     if CPP_AVAILABLE:
         try:
-            return _feature_engineering_cpp.calculate_exponential_moving_average(data.astype(np.float64), alpha)
+            return _feature_engineering_cpp.calculate_exponential_moving_average(data, alpha, out=out)
         except Exception as e:
             logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
-    # Python fallback
-    ema = np.zeros_like(data)
-    ema[0] = data[0]
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
-    return ema
+    # Python fallback: ema[0] = x[0], then the recurrence as a first-order IIR filter
+    if not 0.0 <= alpha <= 1.0:
+        raise ValueError("Invalid alpha value.")
+    values = data.astype(np.float64)
+    ema = np.empty_like(values)
+    if len(values):
+        ema[0] = values[0]
+        ema[1:] = _exponential_filter(values[1:], alpha, values[0])
+    return _write_out(ema.astype(data.dtype, copy=False), out)
 
 
-def calculate_relative_strength_index(data: np.ndarray, window_size: int) -> np.ndarray:
+def calculate_relative_strength_index(data: np.ndarray, window_size: int, out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Calculate Relative Strength Index (RSI) with specified window size.
 
+    float32 and float64 inputs, including strided views, are read in place and
+    the result keeps the input dtype.
+
     Args:
         data: Input numpy array
         window_size: Size of the window for RSI calculation
+        out: Optional array of ``len(data) - window_size + 1`` elements to write into
 
     Returns:
-        Array of RSI values
+        Array of RSI values (``out`` when given)
     """
+    data = _native(data)
     if CPP_AVAILABLE:
         try:
-            return _feature_engineering_cpp.calculate_relative_strength_index(data.astype(np.float64), window_size)
+            return _feature_engineering_cpp.calculate_relative_strength_index(data, window_size, out=out)
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    # Python fallback: Wilder smoothing is an exponential filter with alpha = 1 / window_size
+    if window_size <= 0 or window_size > len(data):
+        raise ValueError("Invalid window size.")
+    if window_size == 1:
+        raise ValueError("Window size must be at least 2 for RSI calculation")
+
+    deltas = np.diff(data.astype(np.float64))
+    head = deltas[: window_size - 1]
+    # Seed averages divide by window_size, as the C++ kernel does
+    avg_gain = np.where(head > 0, head, 0.0).sum() / window_size
+    avg_loss = np.where(head > 0, 0.0, -head).sum() / window_size
+
+    tail = deltas[window_size - 1:]
+    alpha = 1.0 / window_size
+    gains = np.concatenate([[avg_gain], _exponential_filter(np.where(tail > 0, tail, 0.0), alpha, avg_gain)])
+    losses = np.concatenate([[avg_loss], _exponential_filter(np.where(tail < 0, -tail, 0.0), alpha, avg_loss)])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(losses == 0.0, np.inf, gains / losses)
+        rsi = 100.0 - 100.0 / (1.0 + rs)
+    return _write_out(rsi.astype(data.dtype, copy=False), out)
+
+
+def calculate_moving_average_batch(
+    arrays: Sequence[np.ndarray], window_size: int, n_jobs: int = -1
+) -> List[np.ndarray]:
+    """
+    ``calculate_moving_average`` for several independent series in one call.
+
+    The C++ module spreads the series over a worker pool with the GIL released.
+
+    Args:
+        arrays: Input numpy arrays; float32/float64 arrays are read in place
+        window_size: Size of the moving window
+        n_jobs: Threads to use (-1 uses every core)
+
+    Returns:
+        One array of moving averages per input, each keeping its input's dtype
+    """
+    arrays = [_native(data) for data in arrays]
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.calculate_moving_average_batch(
+                arrays, window_size, n_threads=max(n_jobs, 0)
+            )
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+    return [calculate_moving_average(data, window_size) for data in arrays]
+
+
+def calculate_exponential_moving_average_batch(
+    arrays: Sequence[np.ndarray], alpha: float, n_jobs: int = -1
+) -> List[np.ndarray]:
+    """
+    ``calculate_exponential_moving_average`` for several independent series in one call.
+
+    Args:
+        arrays: Input numpy arrays; float32/float64 arrays are read in place
+        alpha: Smoothing factor (0 < alpha <= 1)
+        n_jobs: Threads to use (-1 uses every core)
+
+    Returns:
+        One array of exponential moving averages per input, each keeping its input's dtype
+    """
+    arrays = [_native(data) for data in arrays]
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.calculate_exponential_moving_average_batch(
+                arrays, alpha, n_threads=max(n_jobs, 0)
+            )
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+    return [calculate_exponential_moving_average(data, alpha) for data in arrays]
+
+
+def calculate_relative_strength_index_batch(
+    arrays: Sequence[np.ndarray], window_size: int, n_jobs: int = -1
+) -> List[np.ndarray]:
+    """
+    ``calculate_relative_strength_index`` for several independent series in one call.
+
+    Args:
+        arrays: Input numpy arrays; float32/float64 arrays are read in place
+        window_size: Size of the window for RSI calculation
+        n_jobs: Threads to use (-1 uses every core)
+
+    Returns:
+        One array of RSI values per input, each keeping its input's dtype
+    """
+    arrays = [_native(data) for data in arrays]
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.calculate_relative_strength_index_batch(
+                arrays, window_size, n_threads=max(n_jobs, 0)
+            )
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+    return [calculate_relative_strength_index(data, window_size) for data in arrays]
+
+
+def _check_offsets(offsets: np.ndarray, n: int) -> None:
+    if len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != n:
+        raise ValueError("offsets must start at 0 and end at the number of values.")
+    if np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets must be non-decreasing.")
+
+
+def _segment_blocks(starts: np.ndarray, lengths: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield ``(index, mask)`` matrices that lay segments out as padded rows.
+
+    Segments are bucketed by length rounded up to a power of two, so padding
+    at most doubles memory while each bucket is processed as one 2-D array.
+    """
+    nonempty = np.flatnonzero(lengths > 0)
+    widths = np.left_shift(1, np.ceil(np.log2(lengths[nonempty])).astype(np.int64))
+    for width in np.unique(widths):
+        segments = nonempty[widths == width]
+        columns = np.arange(width)
+        mask = columns < lengths[segments, None]
+        yield np.where(mask, starts[segments, None] + columns, 0), mask
+
+
+def _segmented_fallback(
+    data: np.ndarray, offsets: np.ndarray, indicator: Callable[[np.ndarray], np.ndarray]
+) -> np.ndarray:
+    """
+    Run ``indicator`` over the non-NaN values of every segment.
+
+    ``indicator`` maps a matrix of padded segment rows to a matrix of results;
+    NaN inputs then take the last result of their segment, as the C++ kernels do.
+    """
+    values = data.astype(np.float64)
+    lengths = np.diff(offsets)
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    valid = ~np.isnan(values)
+    compact = values[valid]
+    counts = np.bincount(segment[valid], minlength=len(lengths))
+    starts = np.cumsum(counts) - counts
+
+    result = np.full(len(compact), np.nan)
+    for index, mask in _segment_blocks(starts, counts):
+        matrix = np.where(mask, compact[index], 0.0)
+        rows = indicator(matrix)
+        result[index[mask]] = rows[mask]
+
+    # Index of the last valid value at or before each row, if it is in the same segment
+    last = np.cumsum(valid) - 1
+    carried = last >= starts[segment]
+    output = np.full(len(values), np.nan)
+    output[carried] = result[last[carried]]
+    return output
+
+
+def segmented_moving_average(
+    data: np.ndarray, offsets: np.ndarray, window_size: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Calculate a moving average independently inside each segment in one call.
+
+    Args:
+        data: Input numpy array, rows grouped by segment (e.g. sorted by entity and time)
+        offsets: int64 segment boundaries; segment ``s`` spans ``offsets[s]:offsets[s + 1]``
+        window_size: Number of values in the moving window
+        out: Optional array of ``len(data)`` elements to write into
+
+    Returns:
+        Array aligned with ``data``: the mean of the segment's last ``window_size``
+        non-NaN values up to each row, NaN until the segment has that many
+    """
+    data = _native(data)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.segmented_moving_average(data, offsets, window_size, out=out)
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    if window_size <= 0:
+        raise ValueError("Invalid window size.")
+    _check_offsets(offsets, len(data))
+
+    def moving_average(matrix: np.ndarray) -> np.ndarray:
+        rows = np.full(matrix.shape, np.nan)
+        if matrix.shape[1] >= window_size:
+            total = np.cumsum(matrix, axis=1)
+            total[:, window_size:] -= total[:, :-window_size].copy()
+            rows[:, window_size - 1:] = total[:, window_size - 1:] / window_size
+        return rows
+
+    result = _segmented_fallback(data, offsets, moving_average)
+    return _write_out(result.astype(data.dtype, copy=False), out)
+
+
+def segmented_exponential_moving_average(
+    data: np.ndarray, offsets: np.ndarray, alpha: float, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Calculate an exponential moving average restarted at every segment in one call.
+
+    Args:
+        data: Input numpy array, rows grouped by segment (e.g. sorted by entity and time)
+        offsets: int64 segment boundaries; segment ``s`` spans ``offsets[s]:offsets[s + 1]``
+        alpha: Smoothing factor (0 <= alpha <= 1)
+        out: Optional array of ``len(data)`` elements to write into
+
+    Returns:
+        Array aligned with ``data``; each segment's EMA starts at its first
+        non-NaN value and is carried over NaN values
+    """
+    data = _native(data)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.segmented_exponential_moving_average(data, offsets, alpha, out=out)
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    if not 0.0 <= alpha <= 1.0:
+        raise ValueError("Invalid alpha value.")
+    _check_offsets(offsets, len(data))
+
+    def exponential_moving_average(matrix: np.ndarray) -> np.ndarray:
+        from scipy.signal import lfilter
+
+        rows = np.empty(matrix.shape)
+        rows[:, 0] = matrix[:, 0]
+        if matrix.shape[1] > 1:
+            decay = 1.0 - alpha
+            rows[:, 1:] = lfilter([alpha], [1.0, -decay], matrix[:, 1:], axis=1, zi=decay * matrix[:, :1])[0]
+        return rows
+
+    result = _segmented_fallback(data, offsets, exponential_moving_average)
+    return _write_out(result.astype(data.dtype, copy=False), out)
+
+
+def segmented_relative_strength_index(
+    data: np.ndarray, offsets: np.ndarray, window_size: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Calculate the Relative Strength Index independently inside each segment in one call.
+
+    Args:
+        data: Input numpy array, rows grouped by segment (e.g. sorted by entity and time)
+        offsets: int64 segment boundaries; segment ``s`` spans ``offsets[s]:offsets[s + 1]``
+        window_size: Size of the window for RSI calculation
+        out: Optional array of ``len(data)`` elements to write into
+
+    Returns:
+        Array aligned with ``data``: the Wilder RSI of the segment's non-NaN
+        values up to each row, NaN until the segment has ``window_size`` of them
+    """
+    data = _native(data)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if CPP_AVAILABLE:
+        try:
+            return _feature_engineering_cpp.segmented_relative_strength_index(data, offsets, window_size, out=out)
         except Exception as e:
             logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
-    # Python fallback
     if window_size < 2:
         raise ValueError("Window size must be at least 2 for RSI calculation")
+    _check_offsets(offsets, len(data))
 
-    deltas = np.diff(data)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
+    def relative_strength_index(matrix: np.ndarray) -> np.ndarray:
+        from scipy.signal import lfilter
 
-    avg_gain = np.mean(gains[: window_size - 1])
-    avg_loss = np.mean(losses[: window_size - 1])
+        rows = np.full(matrix.shape, np.nan)
+        if matrix.shape[1] < window_size:
+            return rows
+        deltas = np.diff(matrix, axis=1)
+        # Seed averages are sequential sums divided by window_size, as in the C++ kernel
+        seed_gain = np.cumsum(np.where(deltas[:, : window_size - 1] > 0, deltas[:, : window_size - 1], 0.0), axis=1)
+        seed_loss = np.cumsum(np.where(deltas[:, : window_size - 1] > 0, 0.0, -deltas[:, : window_size - 1]), axis=1)
+        tail = deltas[:, window_size - 1:]
+        alpha = 1.0 / window_size
+        decay = 1.0 - alpha
+        averages = []
+        for seed, moves in ((seed_gain, np.where(tail > 0, tail, 0.0)), (seed_loss, np.where(tail < 0, -tail, 0.0))):
+            seed = seed[:, -1:] / window_size
+            smoothed = lfilter([alpha], [1.0, -decay], moves, axis=1, zi=decay * seed)[0] if tail.shape[1] else moves
+            averages.append(np.concatenate([seed, smoothed], axis=1))
+        gains, losses = averages
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.where(losses == 0.0, np.inf, gains / losses)
+            rows[:, window_size - 1:] = 100.0 - 100.0 / (1.0 + rs)
+        return rows
 
-    rsi = np.zeros(len(data) - window_size + 1)
-    rs = avg_gain / avg_loss if avg_loss != 0 else np.inf
-    rsi[0] = 100 - (100 / (1 + rs))
+    result = _segmented_fallback(data, offsets, relative_strength_index)
+    return _write_out(result.astype(data.dtype, copy=False), out)
+
+
+def grouped_expanding_stats(codes: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate leave-current-out expanding statistics per segment.
+
+    Args:
+        codes: int64 segment code per row, rows ordered by (segment, time)
+        values: Input numpy array aligned with ``codes``
+
+    Returns:
+        Dict with ``count``, ``mean``, ``std``, ``min``, ``max`` and ``zscore``
+        arrays, each describing the non-NaN rows before the current one
+    """
+    if CPP_AVAILABLE:
+        try:
+            return dict(_feature_engineering_cpp.grouped_expanding_stats(codes, _native(values)))
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
+
+    codes = np.ascontiguousarray(codes, dtype=np.int64)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+
+    # Python fallback: shifted prefix sums per segment (no per-row Python loop)
+    n = len(values)
+    is_start = np.ones(n, dtype=bool)
+    if n > 1:
+        is_start[1:] = codes[1:] != codes[:-1]
+    segment = np.cumsum(is_start) - 1
+    starts = np.flatnonzero(is_start)
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    seg_count = np.bincount(segment, weights=valid, minlength=len(starts))
+    seg_sum = np.bincount(segment, weights=filled, minlength=len(starts))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shift = np.where(seg_count > 0, seg_sum / seg_count, 0.0)[segment]
+    centered = np.where(valid, values - shift, 0.0)
+
+    def _prior(x: np.ndarray) -> np.ndarray:
+        total = np.cumsum(x) - x
+        return total - total[starts][segment]
+
+    count = _prior(valid.astype(np.float64))
+    s1 = _prior(centered)
+    s2 = _prior(centered * centered)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, shift + s1 / count, np.nan)
+        var = np.where(count > 1, (s2 - s1 * s1 / count) / (count - 1), np.nan)
+    std = np.sqrt(np.maximum(var, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        zscore = np.where((std > 0) & valid, (values - mean) / std, np.nan)
+
+    import pandas as pd
+
+    running_min = pd.Series(np.where(valid, values, np.inf)).groupby(segment).cummin().to_numpy()
+    running_max = pd.Series(np.where(valid, values, -np.inf)).groupby(segment).cummax().to_numpy()
+    prior_min = np.empty(n)
+    prior_max = np.empty(n)
+    prior_min[0:1] = np.nan
+    prior_max[0:1] = np.nan
+    prior_min[1:] = running_min[:-1]
+    prior_max[1:] = running_max[:-1]
+    empty = count == 0
+    prior_min[empty] = np.nan
+    prior_max[empty] = np.nan
+
+    return {"count": count, "mean": mean, "std": std, "min": prior_min, "max": prior_max, "zscore": zscore}
+
+
+def _window_bounds(codes: np.ndarray, times: np.ndarray, windows: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Exclusive window ends and per-window starts for rows ordered by (segment, time)."""
+    time_order = np.argsort(times, kind="stable")
+    sorted_times = times[time_order]
+    is_new = np.ones(len(times), dtype=bool)
+    is_new[1:] = sorted_times[1:] != sorted_times[:-1]
+    unique_times = sorted_times[is_new]
+    ranks = np.empty(len(times), dtype=np.int64)
+    ranks[time_order] = np.cumsum(is_new) - 1
+
+    # (segment, time-rank) keys are sorted, so a single searchsorted finds bounds inside each segment
+    stride = np.int64(len(unique_times) + 1)
+    keys = codes * stride + ranks
+    ends = np.searchsorted(keys, keys, side="left")
+    starts = np.empty((len(windows), len(times)), dtype=np.int64)
+    thresholds = np.empty(len(times), dtype=np.int64)
+    for w, window in enumerate(windows):
+        thresholds[time_order] = np.searchsorted(unique_times, sorted_times - window, side="left")
+        starts[w] = np.searchsorted(keys, codes * stride + thresholds, side="left")
+    return ends, starts
+
+
+def _range_extreme(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, func: np.ufunc) -> np.ndarray:
+    """Range min/max over [start, end) via a sparse table; NaN for empty ranges."""
+    lengths = ends - starts
+    output = np.full(len(starts), np.nan)
+    if len(values) == 0 or lengths.max(initial=0) <= 0:
+        return output
+    levels = [values]
+    span = 1
+    while span * 2 <= lengths.max():
+        previous = levels[-1]
+        current = previous.copy()
+        current[:-span] = func(previous[:-span], previous[span:])
+        levels.append(current)
+        span *= 2
+    nonempty = np.flatnonzero(lengths > 0)
+    level = np.floor(np.log2(lengths[nonempty])).astype(np.int64)
+    for j in np.unique(level):
+        rows = nonempty[level == j]
+        table = levels[j]
+        output[rows] = func(table[starts[rows]], table[ends[rows] - (1 << j)])
+    return output
+
+
+def grouped_window_aggregates(
+    codes: np.ndarray,
+    times: np.ndarray,
+    values: np.ndarray,
+    windows: Sequence[int],
+    aggregates: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate left-closed time-window aggregates per segment for several windows.
+
+    Args:
+        codes: int64 segment code per row, rows ordered by (segment, time)
+        times: int64 epoch nanoseconds aligned with ``codes``
+        values: Input numpy array aligned with ``codes``
+        windows: Window lengths in nanoseconds
+        aggregates: Any of ``count``, ``sum``, ``mean``, ``min``, ``max``
+
+    Returns:
+        Dict mapping each aggregate to a ``(len(windows), len(values))`` array;
+        row ``i`` covers the segment's rows with time in ``[t_i - window, t_i)``
+    """
+    windows = [int(window) for window in windows]
+    if CPP_AVAILABLE:
+        try:
+            return dict(
+                _feature_engineering_cpp.grouped_window_aggregates(codes, times, _native(values), windows, list(aggregates))
+            )
+        except Exception as e:
+            logger.warning(f"C++ function failed: {e}. Using Python fallback.")
 
-    for i in range(window_size, len(data)):
-        gain = gains[i - 1] if i - 1 < len(gains) else 0
-        loss = losses[i - 1] if i - 1 < len(losses) else 0
+    codes = np.ascontiguousarray(codes, dtype=np.int64)
+    times = np.ascontiguousarray(times, dtype=np.int64)
+    values = np.ascontiguousarray(values, dtype=np.float64)
 
-        avg_gain = (avg_gain * (window_size - 1) + gain) / window_size
-        avg_loss = (avg_loss * (window_size - 1) + loss) / window_size
+    # Python fallback: searchsorted window bounds over prefix sums
+    unsupported = set(aggregates) - {"count", "sum", "mean", "min", "max"}
+    if unsupported:
+        raise ValueError(f"Unsupported aggregate(s): {sorted(unsupported)}")
 
-        rs = avg_gain / avg_loss if avg_loss != 0 else np.inf
-        rsi[i - window_size + 1] = 100 - (100 / (1 + rs))
+    valid = ~np.isnan(values)
+    prefix_sum = np.zeros(len(values) + 1)
+    prefix_count = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(np.where(valid, values, 0.0), out=prefix_sum[1:])
+    np.cumsum(valid, out=prefix_count[1:])
 
-    return rsi
+    ends, starts = _window_bounds(codes, times, windows)
+    output = {agg: np.full((len(windows), len(values)), np.nan) for agg in aggregates}
+    for w in range(len(windows)):
+        n_obs = ends - starts[w]
+        n_valid = (prefix_count[ends] - prefix_count[starts[w]]).astype(np.float64)
+        has_value = n_valid > 0
+        total = prefix_sum[ends] - prefix_sum[starts[w]]
+        if "count" in output:
+            output["count"][w] = np.where(n_obs > 0, n_valid, np.nan)
+        if "sum" in output:
+            output["sum"][w] = np.where(has_value, total, np.nan)
+        if "mean" in output:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                output["mean"][w] = np.where(has_value, total / n_valid, np.nan)
+        if "min" in output:
+            extreme = _range_extreme(np.where(valid, values, np.inf), starts[w], ends, np.minimum)
+            output["min"][w] = np.where(has_value, extreme, np.nan)
+        if "max" in output:
+            extreme = _range_extreme(np.where(valid, values, -np.inf), starts[w], ends, np.maximum)
+            output["max"][w] = np.where(has_value, extreme, np.nan)
+    return output
 
 
 def is_cpp_available() -> bool:
@@ -0,0 +1,121 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module implements the compact dtype mode. Identifier and categorical
+columns become dictionary-encoded categoricals or int32, and float columns
+drop to float32 when every value survives the round trip.
+
+File: dtypes.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# float32 keeps ~7 significant digits; larger relative errors mean overflow or subnormals
+FLOAT32_RTOL = 1e-6
+# Money columns must also keep every cent, which float32 stops doing above about 131,072
+MONEY_ATOL = 0.005
+# Object columns with more distinct values than this share of rows stay as they are
+MAX_CATEGORY_RATIO = 0.5
+
+_INT32 = np.iinfo(np.int32)
+
+
+def float32_if_safe(values: np.ndarray, rtol: float = FLOAT32_RTOL, atol: Optional[float] = None) -> np.ndarray:
+    """
+    Downcast a float array to float32 when it round-trips within ``rtol`` (and ``atol``, if given).
+
+    Args:
+        values: Float array
+        rtol: Largest relative error allowed for any finite value
+        atol: Largest absolute error allowed for any finite value, or None for no limit
+
+    Returns:
+        float32 copy of ``values``, or ``values`` itself when precision would be lost
+    """
+    if values.dtype == np.float32:
+        return values
+    with np.errstate(over="ignore"):
+        compact = values.astype(np.float32)
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(compact)):
+        return values
+    original = values[finite]
+    error = np.abs(compact[finite].astype(np.float64) - original)
+    if np.any(error > rtol * np.abs(original)) or (atol is not None and np.any(error > atol)):
+        return values
+    return compact
+
+
+def _compact_column(series: pd.Series, rtol: float, atol: Optional[float] = None) -> pd.Series:
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return series
+    if pd.api.types.is_integer_dtype(dtype):
+        if dtype.itemsize > 4 and series.notna().any() and _INT32.min <= series.min() and series.max() <= _INT32.max:
+            return series.astype(np.int32 if isinstance(dtype, np.dtype) else "Int32")
+        return series
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = series.to_numpy()
+        compact = float32_if_safe(values, rtol, atol)
+        return series if compact is values else pd.Series(compact, index=series.index, name=series.name)
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if len(series) and series.nunique(dropna=True) <= MAX_CATEGORY_RATIO * len(series):
+            return series.astype("category")
+    return series
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    exclude: Iterable[str] = (),
+    rtol: float = FLOAT32_RTOL,
+    money_columns: Iterable[str] = ("amount",),
+    money_atol: float = MONEY_ATOL,
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Shrink a DataFrame's columns to the smallest dtype that keeps their values.
+
+    Integer columns become int32 when in range, string/object columns become
+    categoricals when they repeat enough, and float columns become float32
+    when every value round-trips within ``rtol``; money columns must also
+    round-trip within ``money_atol``, so amounts keep their cents.
+
+    Args:
+        df: Input DataFrame (left unchanged)
+        exclude: Columns to keep as they are, e.g. the target or time column
+        rtol: Relative tolerance for the float32 downcast
+        money_columns: Float columns holding currency amounts
+        money_atol: Absolute tolerance for the float32 downcast of money columns
+
+    Returns:
+        Tuple of the compacted DataFrame and bytes saved per changed column
+    """
+    skip = set(exclude)
+    money = set(money_columns)
+    columns = {}
+    saved: Dict[str, int] = {}
+    for column in df.columns:
+        series = df[column]
+        atol = money_atol if column in money else None
+        compact = series if column in skip else _compact_column(series, rtol, atol)
+        if compact is not series:
+            delta = int(series.memory_usage(index=False, deep=True) - compact.memory_usage(index=False, deep=True))
+            if delta > 0:
+                saved[column] = delta
+            else:
+                compact = series
+        columns[column] = compact
+
+    result = pd.DataFrame(columns, index=df.index)
+    for column, delta in saved.items():
+        logger.info(f"Compact dtypes: {column} {df[column].dtype} -> {result[column].dtype} saved {delta} bytes")
+    if saved:
+        logger.info(f"Compact dtypes saved {sum(saved.values())} bytes across {len(saved)} columns")
+    return result, saved
@@ -0,0 +1,161 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module implements an on-disk, content-addressed cache for engineered
+transaction features. Entries are keyed by a fingerprint of the input rows
+and the feature configuration, stored column-wise, and evicted least
+recently used once the cache grows past its size budget.
+
+File: feature_cache.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    attach_features,
+    compute_transaction_features,
+    parse_windows,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when feature semantics change so stale entries stop matching
+FEATURE_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Config fields that change how features are computed but not their values
+_EXECUTION_FIELDS = {"n_jobs"}
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Hash a DataFrame's column names, dtypes, index and values.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Hex digest that changes whenever any cell, column or row order changes
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy().tobytes())
+    for column in df.columns:
+        digest.update(pd.util.hash_pandas_object(df[column], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_config(config: TransactionFeatureConfig) -> str:
+    """Hex digest of the configuration fields that affect feature values."""
+    fields = {k: v for k, v in dataclasses.asdict(config).items() if k not in _EXECUTION_FIELDS}
+    fields["windows"] = parse_windows(config.windows)
+    fields["version"] = FEATURE_CACHE_VERSION
+    return hashlib.blake2b(json.dumps(fields, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+
+class FeatureCache:
+    """
+    Directory of ``<key>.npz`` feature entries with size-based LRU eviction.
+
+    Each entry holds one array per feature column. A hit refreshes the entry's
+    modification time, which is the recency used for eviction.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                features = {name: entry[name] for name in entry.files}
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        os.utime(path)
+        return features
+
+    def put(self, key: str, features: Dict[str, np.ndarray]) -> None:
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, **features)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict(keep=key)
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.npz"))
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted feature cache entry {path.name} ({size} bytes)")
+
+
+def add_transaction_features_cached(
+    df: pd.DataFrame,
+    config: TransactionFeatureConfig,
+    cache: FeatureCache,
+) -> pd.DataFrame:
+    """
+    ``add_transaction_features`` backed by a content-addressed ``FeatureCache``.
+
+    Args:
+        df: Transactions containing the configured time and amount columns
+        config: Feature configuration
+        cache: Cache to read from and populate
+
+    Returns:
+        ``df`` with the engineered feature columns attached
+    """
+    if config.time_column not in df.columns or config.amount_column not in df.columns:
+        logger.info("Skipping transaction features: required columns missing.")
+        return df
+
+    key = hashlib.blake2b(
+        f"{fingerprint_frame(df)}:{fingerprint_config(config)}".encode(), digest_size=20
+    ).hexdigest()
+    features = cache.get(key)
+    if features is not None:
+        logger.info(f"Feature cache hit {key}: reusing {len(features)} feature columns")
+    else:
+        logger.info(f"Feature cache miss {key}: computing transaction features")
+        features = compute_transaction_features(df, config)
+        cache.put(key, features)
+    return attach_features(df, config, features)
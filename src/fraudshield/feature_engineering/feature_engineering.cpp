@@ -8,91 +8,533 @@
 #include <unordered_map>
 #include <numeric>
 #include <cmath>
+#include <cstdint>
 #include <limits>
+#include <algorithm>
+#include <deque>
+#include <string>
+#include <type_traits>
+#include <atomic>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <thread>
 
 namespace py = pybind11;
 
+struct ExpandingStats {
+    std::vector<double> count;
+    std::vector<double> mean;
+    std::vector<double> stddev;
+    std::vector<double> minimum;
+    std::vector<double> maximum;
+    std::vector<double> zscore;
+};
+
+struct WindowAggregates {
+    // Each vector holds n_windows blocks of n values, one block per window.
+    std::vector<double> count;
+    std::vector<double> sum;
+    std::vector<double> mean;
+    std::vector<double> minimum;
+    std::vector<double> maximum;
+};
+
+// Typed view over a NumPy buffer or std::vector. The stride is in bytes, so sliced
+// and reversed arrays are read in place instead of being copied to a contiguous vector.
+template <typename T>
+struct StridedArray {
+    char* data;
+    py::ssize_t stride;
+    size_t size;
+
+    StridedArray(T* ptr, py::ssize_t stride_bytes, size_t n)
+        : data(reinterpret_cast<char*>(const_cast<typename std::remove_const<T>::type*>(ptr))),
+          stride(stride_bytes), size(n) {}
+    explicit StridedArray(std::vector<typename std::remove_const<T>::type>& vec)
+        : StridedArray(vec.data(), sizeof(T), vec.size()) {}
+    explicit StridedArray(const std::vector<typename std::remove_const<T>::type>& vec)
+        : StridedArray(vec.data(), sizeof(T), vec.size()) {}
+
+    T& operator[](size_t i) const {
+        return *reinterpret_cast<T*>(data + static_cast<py::ssize_t>(i) * stride);
+    }
+};
+
 class FeatureEngineering {
 public:
-    static std::vector<double> calculate_moving_average(const std::vector<double>& data, int window_size) {
-        if (window_size <= 0 || static_cast<size_t>(window_size) > data.size()) {
-            throw std::invalid_argument("Invalid window size.");
+    // Strided kernels accumulate in double and write output[0..result_size); the
+    // std::vector overloads below wrap them for C++ callers and tests.
+    template <typename T>
+    static void moving_average_into(const StridedArray<const T>& data, int window_size, const StridedArray<T>& output) {
+        double sum = 0.0;
+        for (int i = 0; i < window_size; ++i) {
+            sum += data[i];
         }
+        output[0] = static_cast<T>(sum / window_size);
+        for (size_t i = 1; i + window_size - 1 < data.size; ++i) {
+            sum -= data[i - 1];
+            sum += data[i + window_size - 1];
+            output[i] = static_cast<T>(sum / window_size);
+        }
+    }
 
-        std::vector<double> moving_average(data.size() - window_size + 1);
-        double sum = std::accumulate(data.begin(), data.begin() + window_size, 0.0);
-        moving_average[0] = sum / window_size;
+    template <typename T>
+    static void exponential_moving_average_into(const StridedArray<const T>& data, double alpha, const StridedArray<T>& output) {
+        if (data.size == 0) {
+            return;
+        }
+        double ema = data[0];
+        output[0] = static_cast<T>(ema);
+        for (size_t i = 1; i < data.size; ++i) {
+            ema = alpha * data[i] + (1 - alpha) * ema;
+            output[i] = static_cast<T>(ema);
+        }
+    }
 
-        for (size_t i = 1; i < moving_average.size(); ++i) {
-            sum -= data[i - 1];
-            // Bounds check: ensure i + window_size - 1 < data.size()
-            size_t next_idx = i + window_size - 1;
-            if (next_idx >= data.size()) {
-                break;
+    template <typename T>
+    static void relative_strength_index_into(const StridedArray<const T>& data, int window_size, const StridedArray<T>& output) {
+        double gain_sum = 0.0;
+        double loss_sum = 0.0;
+        for (int i = 1; i < window_size; ++i) {
+            double diff = static_cast<double>(data[i]) - data[i - 1];
+            if (diff > 0) {
+                gain_sum += diff;
+            } else {
+                loss_sum -= diff;
             }
-            sum += data[next_idx];
-            moving_average[i] = sum / window_size;
         }
 
-        return moving_average;
+        double avg_gain = gain_sum / window_size;
+        double avg_loss = loss_sum / window_size;
+
+        double rs = (avg_loss == 0.0) ? std::numeric_limits<double>::infinity() : (avg_gain / avg_loss);
+        output[0] = static_cast<T>(100.0 - (100.0 / (1.0 + rs)));
+
+        for (size_t i = window_size; i < data.size; ++i) {
+            double diff = static_cast<double>(data[i]) - data[i - 1];
+            double gain = (diff > 0) ? diff : 0.0;
+            double loss = (diff < 0) ? -diff : 0.0;
+
+            avg_gain = (avg_gain * (window_size - 1) + gain) / window_size;
+            avg_loss = (avg_loss * (window_size - 1) + loss) / window_size;
+
+            double rolling_rs = (avg_loss == 0.0) ? std::numeric_limits<double>::infinity() : (avg_gain / avg_loss);
+            output[i - window_size + 1] = static_cast<T>(100.0 - (100.0 / (1.0 + rolling_rs)));
+        }
     }
 
-    static std::vector<double> calculate_exponential_moving_average(const std::vector<double>& data, double alpha) {
+    static size_t moving_average_size(size_t n, int window_size) {
+        if (window_size <= 0 || static_cast<size_t>(window_size) > n) {
+            throw std::invalid_argument("Invalid window size.");
+        }
+        return n - window_size + 1;
+    }
+
+    static void check_alpha(double alpha) {
         if (alpha < 0.0 || alpha > 1.0) {
             throw std::invalid_argument("Invalid alpha value.");
         }
+    }
 
-        std::vector<double> ema(data.size());
-        ema[0] = data[0];
-
-        for (size_t i = 1; i < data.size(); ++i) {
-            ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1];
+    static size_t relative_strength_index_size(size_t n, int window_size) {
+        if (window_size <= 0 || static_cast<size_t>(window_size) > n) {
+            throw std::invalid_argument("Invalid window size.");
+        }
+        // Handle edge case where window_size is 1
+        if (window_size == 1) {
+            throw std::invalid_argument("Window size must be at least 2 for RSI calculation.");
         }
+        return n - window_size + 1;
+    }
 
+    static std::vector<double> calculate_moving_average(const std::vector<double>& data, int window_size) {
+        std::vector<double> moving_average(moving_average_size(data.size(), window_size));
+        moving_average_into(StridedArray<const double>(data), window_size, StridedArray<double>(moving_average));
+        return moving_average;
+    }
+
+    static std::vector<double> calculate_exponential_moving_average(const std::vector<double>& data, double alpha) {
+        check_alpha(alpha);
+        std::vector<double> ema(data.size());
+        exponential_moving_average_into(StridedArray<const double>(data), alpha, StridedArray<double>(ema));
         return ema;
     }
 
     static std::vector<double> calculate_relative_strength_index(const std::vector<double>& data, int window_size) {
-        if (window_size <= 0 || static_cast<size_t>(window_size) > data.size()) {
+        std::vector<double> rsi(relative_strength_index_size(data.size(), window_size));
+        relative_strength_index_into(StridedArray<const double>(data), window_size, StridedArray<double>(rsi));
+        return rsi;
+    }
+
+    // Segmented indicators: rows are grouped into segments by offsets (segment s spans
+    // [offsets[s], offsets[s + 1]), offsets[0] == 0 and the last offset == n), e.g. the
+    // rows of one entity after a sort by (entity, time). Each segment starts from a fresh
+    // state, so every entity's series is computed in one call. Output is aligned with the
+    // input: row i holds the indicator over the segment's values up to and including i.
+    // NaN values are skipped and the last indicator value carries over them; rows before
+    // a segment has enough values are NaN.
+    static void check_offsets(const StridedArray<const int64_t>& offsets, size_t n) {
+        if (offsets.size == 0 || offsets[0] != 0 || offsets[offsets.size - 1] != static_cast<int64_t>(n)) {
+            throw std::invalid_argument("offsets must start at 0 and end at the number of values.");
+        }
+        for (size_t s = 1; s < offsets.size; ++s) {
+            if (offsets[s] < offsets[s - 1]) {
+                throw std::invalid_argument("offsets must be non-decreasing.");
+            }
+        }
+    }
+
+    template <typename T>
+    static void segmented_moving_average_into(
+        const StridedArray<const T>& data,
+        const StridedArray<const int64_t>& offsets,
+        int window_size,
+        const StridedArray<T>& output) {
+        if (window_size <= 0) {
             throw std::invalid_argument("Invalid window size.");
         }
-        // Handle edge case where window_size is 1
-        if (window_size == 1) {
-            throw std::invalid_argument("Window size must be at least 2 for RSI calculation.");
+        check_offsets(offsets, data.size);
+        const double nan = std::numeric_limits<double>::quiet_NaN();
+        // Ring buffer of the last window_size valid values of the current segment
+        std::vector<double> ring(window_size);
+        for (size_t s = 0; s + 1 < offsets.size; ++s) {
+            size_t count = 0;
+            size_t head = 0;
+            double sum = 0.0;
+            for (size_t i = offsets[s]; i < static_cast<size_t>(offsets[s + 1]); ++i) {
+                double value = data[i];
+                if (!std::isnan(value)) {
+                    if (count == static_cast<size_t>(window_size)) {
+                        sum -= ring[head];
+                    } else {
+                        ++count;
+                    }
+                    ring[head] = value;
+                    if (++head == ring.size()) {
+                        head = 0;
+                    }
+                    sum += value;
+                }
+                output[i] = static_cast<T>(count == static_cast<size_t>(window_size) ? sum / window_size : nan);
+            }
         }
+    }
 
-        std::vector<double> rsi(data.size() - window_size + 1);
-        std::vector<double> gains(window_size - 1, 0.0);
-        std::vector<double> losses(window_size - 1, 0.0);
+    template <typename T>
+    static void segmented_exponential_moving_average_into(
+        const StridedArray<const T>& data,
+        const StridedArray<const int64_t>& offsets,
+        double alpha,
+        const StridedArray<T>& output) {
+        check_alpha(alpha);
+        check_offsets(offsets, data.size);
+        for (size_t s = 0; s + 1 < offsets.size; ++s) {
+            double ema = std::numeric_limits<double>::quiet_NaN();
+            bool seeded = false;
+            for (size_t i = offsets[s]; i < static_cast<size_t>(offsets[s + 1]); ++i) {
+                double value = data[i];
+                if (!std::isnan(value)) {
+                    ema = seeded ? alpha * value + (1 - alpha) * ema : value;
+                    seeded = true;
+                }
+                output[i] = static_cast<T>(ema);
+            }
+        }
+    }
 
-        for (int i = 1; i < window_size; ++i) {
-            double diff = data[i] - data[i - 1];
-            if (diff > 0) {
-                gains[i - 1] = diff;
-            } else {
-                losses[i - 1] = -diff;
+    template <typename T>
+    static void segmented_relative_strength_index_into(
+        const StridedArray<const T>& data,
+        const StridedArray<const int64_t>& offsets,
+        int window_size,
+        const StridedArray<T>& output) {
+        if (window_size < 2) {
+            throw std::invalid_argument("Window size must be at least 2 for RSI calculation.");
+        }
+        check_offsets(offsets, data.size);
+        for (size_t s = 0; s + 1 < offsets.size; ++s) {
+            size_t n_valid = 0;
+            double previous = 0.0;
+            double avg_gain = 0.0;
+            double avg_loss = 0.0;
+            double rsi = std::numeric_limits<double>::quiet_NaN();
+            for (size_t i = offsets[s]; i < static_cast<size_t>(offsets[s + 1]); ++i) {
+                double value = data[i];
+                if (!std::isnan(value)) {
+                    if (n_valid > 0) {
+                        // Same seed and Wilder smoothing as relative_strength_index_into
+                        double diff = value - previous;
+                        if (n_valid < static_cast<size_t>(window_size)) {
+                            if (diff > 0) {
+                                avg_gain += diff;
+                            } else {
+                                avg_loss -= diff;
+                            }
+                            if (n_valid == static_cast<size_t>(window_size) - 1) {
+                                avg_gain /= window_size;
+                                avg_loss /= window_size;
+                            }
+                        } else {
+                            double gain = (diff > 0) ? diff : 0.0;
+                            double loss = (diff < 0) ? -diff : 0.0;
+                            avg_gain = (avg_gain * (window_size - 1) + gain) / window_size;
+                            avg_loss = (avg_loss * (window_size - 1) + loss) / window_size;
+                        }
+                        if (n_valid >= static_cast<size_t>(window_size) - 1) {
+                            double rs = (avg_loss == 0.0) ? std::numeric_limits<double>::infinity() : (avg_gain / avg_loss);
+                            rsi = 100.0 - (100.0 / (1.0 + rs));
+                        }
+                    }
+                    previous = value;
+                    ++n_valid;
+                }
+                output[i] = static_cast<T>(rsi);
             }
         }
+    }
 
-        double avg_gain = std::accumulate(gains.begin(), gains.end(), 0.0) / window_size;
-        double avg_loss = std::accumulate(losses.begin(), losses.end(), 0.0) / window_size;
+    // Leave-current-out expanding statistics per segment using Welford's online update.
+    // Rows must be ordered by (segment, time); each output describes the rows before it.
+    // Outputs are contiguous arrays of codes.size elements.
+    template <typename V>
+    static void grouped_expanding_stats_into(
+        const StridedArray<const int64_t>& codes,
+        const StridedArray<const V>& values,
+        double* count_out,
+        double* mean_out,
+        double* stddev_out,
+        double* minimum_out,
+        double* maximum_out,
+        double* zscore_out) {
+        if (codes.size != values.size) {
+            throw std::invalid_argument("codes and values must have the same length.");
+        }
 
-        double rs = (avg_loss == 0.0) ? std::numeric_limits<double>::infinity() : (avg_gain / avg_loss);
-        rsi[0] = 100.0 - (100.0 / (1.0 + rs));
+        const double nan = std::numeric_limits<double>::quiet_NaN();
+        const size_t n = values.size;
+        size_t k = 0;
+        double mean = 0.0;
+        double m2 = 0.0;
+        double lo = 0.0;
+        double hi = 0.0;
+
+        for (size_t i = 0; i < n; ++i) {
+            if (i == 0 || codes[i] != codes[i - 1]) {
+                k = 0;
+                mean = 0.0;
+                m2 = 0.0;
+            }
 
-        for (size_t i = window_size; i < data.size(); ++i) {
-            double diff = data[i] - data[i - 1];
-            double gain = (diff > 0) ? diff : 0.0;
-            double loss = (diff < 0) ? -diff : 0.0;
+            double stddev = (k > 1) ? std::sqrt(m2 / (k - 1)) : nan;
+            double value = values[i];
+            count_out[i] = static_cast<double>(k);
+            mean_out[i] = (k > 0) ? mean : nan;
+            stddev_out[i] = stddev;
+            minimum_out[i] = (k > 0) ? lo : nan;
+            maximum_out[i] = (k > 0) ? hi : nan;
+            zscore_out[i] = (k > 1 && stddev > 0.0 && !std::isnan(value)) ? (value - mean) / stddev : nan;
+
+            if (std::isnan(value)) {
+                continue;
+            }
+            ++k;
+            double delta = value - mean;
+            mean += delta / k;
+            m2 += delta * (value - mean);
+            lo = (k == 1) ? value : std::min(lo, value);
+            hi = (k == 1) ? value : std::max(hi, value);
+        }
+    }
 
-            avg_gain = (avg_gain * (window_size - 1) + gain) / window_size;
-            avg_loss = (avg_loss * (window_size - 1) + loss) / window_size;
+    static ExpandingStats grouped_expanding_stats(const std::vector<int64_t>& codes, const std::vector<double>& values) {
+        const size_t n = values.size();
+        ExpandingStats stats;
+        stats.count.resize(n);
+        stats.mean.resize(n);
+        stats.stddev.resize(n);
+        stats.minimum.resize(n);
+        stats.maximum.resize(n);
+        stats.zscore.resize(n);
+        grouped_expanding_stats_into(
+            StridedArray<const int64_t>(codes), StridedArray<const double>(values),
+            stats.count.data(), stats.mean.data(), stats.stddev.data(),
+            stats.minimum.data(), stats.maximum.data(), stats.zscore.data());
+        return stats;
+    }
 
-            double rolling_rs = (avg_loss == 0.0) ? std::numeric_limits<double>::infinity() : (avg_gain / avg_loss);
-            rsi[i - window_size + 1] = 100.0 - (100.0 / (1.0 + rolling_rs));
+    // Left-closed time windows [t - window, t) per segment for several windows in one call.
+    // Rows must be ordered by (segment, time). NaN values count as observations but not as values,
+    // matching pandas: count is NaN only for an empty window, sum/mean/min/max need a valid value.
+    // Each non-null output is a contiguous block of n_windows x n values and every cell is
+    // written; min/max are only tracked when minimum_out or maximum_out is given.
+    template <typename V>
+    static void grouped_window_aggregates_into(
+        const StridedArray<const int64_t>& codes,
+        const StridedArray<const int64_t>& times,
+        const StridedArray<const V>& values,
+        const std::vector<int64_t>& windows,
+        double* count_out,
+        double* sum_out,
+        double* mean_out,
+        double* minimum_out,
+        double* maximum_out) {
+        const size_t n = values.size;
+        if (codes.size != n || times.size != n) {
+            throw std::invalid_argument("codes, times and values must have the same length.");
+        }
+        for (size_t w = 0; w < windows.size(); ++w) {
+            if (windows[w] <= 0) {
+                throw std::invalid_argument("Window lengths must be positive.");
+            }
+        }
+        const bool with_extrema = (minimum_out != nullptr || maximum_out != nullptr);
+
+        // Prefix sums restart at every segment so rounding error stays local to the entity.
+        std::vector<double> prefix_sum(n + 1, 0.0);
+        std::vector<int64_t> prefix_count(n + 1, 0);
+        for (size_t i = 0; i < n; ++i) {
+            bool is_start = (i == 0 || codes[i] != codes[i - 1]);
+            double value = values[i];
+            bool valid = !std::isnan(value);
+            prefix_sum[i + 1] = (is_start ? 0.0 : prefix_sum[i]) + (valid ? value : 0.0);
+            prefix_count[i + 1] = prefix_count[i] + (valid ? 1 : 0);
         }
 
-        return rsi;
+        std::deque<size_t> min_queue;
+        std::deque<size_t> max_queue;
+        for (size_t w = 0; w < windows.size(); ++w) {
+            const size_t offset = w * n;
+            size_t segment_start = 0;
+            while (segment_start < n) {
+                size_t segment_end = segment_start + 1;
+                while (segment_end < n && codes[segment_end] == codes[segment_start]) {
+                    ++segment_end;
+                }
+
+                size_t start = segment_start;
+                size_t end = segment_start;
+                min_queue.clear();
+                max_queue.clear();
+                for (size_t i = segment_start; i < segment_end; ++i) {
+                    while (end < i && times[end] < times[i]) {
+                        if (with_extrema && !std::isnan(values[end])) {
+                            while (!min_queue.empty() && values[min_queue.back()] >= values[end]) {
+                                min_queue.pop_back();
+                            }
+                            min_queue.push_back(end);
+                            while (!max_queue.empty() && values[max_queue.back()] <= values[end]) {
+                                max_queue.pop_back();
+                            }
+                            max_queue.push_back(end);
+                        }
+                        ++end;
+                    }
+                    const int64_t lower = times[i] - windows[w];
+                    while (start < end && times[start] < lower) {
+                        ++start;
+                    }
+                    while (!min_queue.empty() && min_queue.front() < start) {
+                        min_queue.pop_front();
+                    }
+                    while (!max_queue.empty() && max_queue.front() < start) {
+                        max_queue.pop_front();
+                    }
+
+                    const double nan = std::numeric_limits<double>::quiet_NaN();
+                    const int64_t n_valid = prefix_count[end] - prefix_count[start];
+                    if (count_out != nullptr) {
+                        count_out[offset + i] = (end > start) ? static_cast<double>(n_valid) : nan;
+                    }
+                    if (n_valid > 0) {
+                        // prefix_sum[segment_start] belongs to the previous segment; treat it as zero.
+                        double upper_sum = prefix_sum[end];
+                        double lower_sum = (start == segment_start) ? 0.0 : prefix_sum[start];
+                        double window_sum = upper_sum - lower_sum;
+                        if (sum_out != nullptr) {
+                            sum_out[offset + i] = window_sum;
+                        }
+                        if (mean_out != nullptr) {
+                            mean_out[offset + i] = window_sum / n_valid;
+                        }
+                        if (minimum_out != nullptr) {
+                            minimum_out[offset + i] = values[min_queue.front()];
+                        }
+                        if (maximum_out != nullptr) {
+                            maximum_out[offset + i] = values[max_queue.front()];
+                        }
+                    } else {
+                        double* outputs[] = { sum_out, mean_out, minimum_out, maximum_out };
+                        for (double* output : outputs) {
+                            if (output != nullptr) {
+                                output[offset + i] = nan;
+                            }
+                        }
+                    }
+                }
+                segment_start = segment_end;
+            }
+        }
+    }
+
+    static WindowAggregates grouped_window_aggregates(
+        const std::vector<int64_t>& codes,
+        const std::vector<int64_t>& times,
+        const std::vector<double>& values,
+        const std::vector<int64_t>& windows,
+        bool with_extrema) {
+        const size_t total = values.size() * windows.size();
+        WindowAggregates result;
+        result.count.resize(total);
+        result.sum.resize(total);
+        result.mean.resize(total);
+        if (with_extrema) {
+            result.minimum.resize(total);
+            result.maximum.resize(total);
+        }
+        grouped_window_aggregates_into(
+            StridedArray<const int64_t>(codes), StridedArray<const int64_t>(times), StridedArray<const double>(values),
+            windows, result.count.data(), result.sum.data(), result.mean.data(),
+            with_extrema ? result.minimum.data() : nullptr, with_extrema ? result.maximum.data() : nullptr);
+        return result;
+    }
+
+    // Runs task(0..n_tasks) on up to n_threads threads (0 uses every core). Tasks are handed
+    // out through an atomic counter; the first exception is rethrown after all threads join.
+    static void parallel_for(size_t n_tasks, int n_threads, const std::function<void(size_t)>& task) {
+        size_t workers = (n_threads > 0) ? static_cast<size_t>(n_threads) : std::max(1u, std::thread::hardware_concurrency());
+        workers = std::max<size_t>(1, std::min(workers, n_tasks));
+
+        std::atomic<size_t> next(0);
+        std::exception_ptr error;
+        std::mutex error_mutex;
+        auto worker = [&]() {
+            for (size_t index = next++; index < n_tasks; index = next++) {
+                try {
+                    task(index);
+                } catch (...) {
+                    std::lock_guard<std::mutex> lock(error_mutex);
+                    if (!error) {
+                        error = std::current_exception();
+                    }
+                }
+            }
+        };
+
+        if (workers == 1) {
+            worker();
+        } else {
+            std::vector<std::thread> threads;
+            for (size_t t = 0; t < workers; ++t) {
+                threads.emplace_back(worker);
+            }
+            for (std::thread& thread : threads) {
+                thread.join();
+            }
+        }
+        if (error) {
+            std::rethrow_exception(error);
+        }
     }
 
     static std::unordered_map<std::string, double> aggregate_features(const std::vector<std::unordered_map<std::string, double> >& data) {
@@ -116,69 +558,322 @@ public:
     }
 };
 
-// Python bindings using pybind11
-py::array_t<double> calculate_moving_average_py(py::array_t<double> input, int window_size) {
-    py::buffer_info buf = input.request();
-    double* ptr = static_cast<double*>(buf.ptr);
-    size_t total = buf.size;
-    
-    std::vector<double> data_vec(ptr, ptr + total);
-    std::vector<double> result = FeatureEngineering::calculate_moving_average(data_vec, window_size);
-    
-    py::array_t<double> output(result.size());
-    py::buffer_info output_buf = output.request();
-    double* output_ptr = static_cast<double*>(output_buf.ptr);
-    std::copy(result.begin(), result.end(), output_ptr);
-    
+// Python bindings using pybind11. Inputs are taken without forcecast, so float32 and
+// float64 arrays (strided or not) bind to their own overload without a conversion copy,
+// and results are written straight into the returned NumPy arrays. Arrays are validated
+// and allocated with the GIL held; the kernels themselves run with it released, so
+// Python threads calling them run in parallel.
+template <typename T>
+using InputArray = py::array_t<T, 0>;
+
+template <typename T>
+StridedArray<const T> input_view(const InputArray<T>& input, const char* name) {
+    if (input.ndim() != 1) {
+        throw std::invalid_argument(std::string(name) + " must be a one-dimensional array.");
+    }
+    return StridedArray<const T>(input.data(), input.strides(0), static_cast<size_t>(input.shape(0)));
+}
+
+// Validates a caller-provided output array; it must match the input dtype so results
+// are written in place rather than into a converted temporary.
+template <typename T>
+py::array_t<T> output_array(const py::object& out, size_t size) {
+    if (out.is_none()) {
+        return py::array_t<T>(size);
+    }
+    if (!py::isinstance<py::array_t<T>>(out)) {
+        throw py::type_error("out must be a NumPy array with the same dtype as the input.");
+    }
+    py::array_t<T> array = py::reinterpret_borrow<py::array_t<T>>(out);
+    if (array.ndim() != 1 || static_cast<size_t>(array.shape(0)) != size) {
+        throw std::invalid_argument("out must be a one-dimensional array of " + std::to_string(size) + " elements.");
+    }
+    if (!array.writeable()) {
+        throw std::invalid_argument("out must be writeable.");
+    }
+    return array;
+}
+
+template <typename T>
+StridedArray<T> output_view(py::array_t<T>& output) {
+    return StridedArray<T>(output.mutable_data(), output.strides(0), static_cast<size_t>(output.shape(0)));
+}
+
+template <typename T>
+py::array_t<T> calculate_moving_average_py(InputArray<T> input, int window_size, py::object out) {
+    StridedArray<const T> data = input_view(input, "input");
+    py::array_t<T> output = output_array<T>(out, FeatureEngineering::moving_average_size(data.size, window_size));
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::moving_average_into(data, window_size, output_data);
+    return output;
+}
+
+template <typename T>
+py::array_t<T> calculate_exponential_moving_average_py(InputArray<T> input, double alpha, py::object out) {
+    FeatureEngineering::check_alpha(alpha);
+    StridedArray<const T> data = input_view(input, "input");
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::exponential_moving_average_into(data, alpha, output_data);
+    return output;
+}
+
+template <typename T>
+py::array_t<T> calculate_relative_strength_index_py(InputArray<T> input, int window_size, py::object out) {
+    StridedArray<const T> data = input_view(input, "input");
+    py::array_t<T> output = output_array<T>(out, FeatureEngineering::relative_strength_index_size(data.size, window_size));
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::relative_strength_index_into(data, window_size, output_data);
+    return output;
+}
+
+template <typename T>
+py::array_t<T> segmented_moving_average_py(InputArray<T> input, InputArray<int64_t> offsets, int window_size, py::object out) {
+    StridedArray<const T> data = input_view(input, "input");
+    StridedArray<const int64_t> offsets_data = input_view(offsets, "offsets");
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::segmented_moving_average_into(data, offsets_data, window_size, output_data);
+    return output;
+}
+
+template <typename T>
+py::array_t<T> segmented_exponential_moving_average_py(InputArray<T> input, InputArray<int64_t> offsets, double alpha, py::object out) {
+    StridedArray<const T> data = input_view(input, "input");
+    StridedArray<const int64_t> offsets_data = input_view(offsets, "offsets");
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::segmented_exponential_moving_average_into(data, offsets_data, alpha, output_data);
     return output;
 }
 
-py::array_t<double> calculate_exponential_moving_average_py(py::array_t<double> input, double alpha) {
-    py::buffer_info buf = input.request();
-    double* ptr = static_cast<double*>(buf.ptr);
-    size_t total = buf.size;
-    
-    std::vector<double> data_vec(ptr, ptr + total);
-    std::vector<double> result = FeatureEngineering::calculate_exponential_moving_average(data_vec, alpha);
-    
-    py::array_t<double> output(result.size());
-    py::buffer_info output_buf = output.request();
-    double* output_ptr = static_cast<double*>(output_buf.ptr);
-    std::copy(result.begin(), result.end(), output_ptr);
-    
+template <typename T>
+py::array_t<T> segmented_relative_strength_index_py(InputArray<T> input, InputArray<int64_t> offsets, int window_size, py::object out) {
+    StridedArray<const T> data = input_view(input, "input");
+    StridedArray<const int64_t> offsets_data = input_view(offsets, "offsets");
+    py::array_t<T> output = output_array<T>(out, data.size);
+    StridedArray<T> output_data = output_view(output);
+    py::gil_scoped_release release;
+    FeatureEngineering::segmented_relative_strength_index_into(data, offsets_data, window_size, output_data);
     return output;
 }
 
-py::array_t<double> calculate_relative_strength_index_py(py::array_t<double> input, int window_size) {
-    py::buffer_info buf = input.request();
-    double* ptr = static_cast<double*>(buf.ptr);
-    size_t total = buf.size;
-    
-    std::vector<double> data_vec(ptr, ptr + total);
-    std::vector<double> result = FeatureEngineering::calculate_relative_strength_index(data_vec, window_size);
-    
-    py::array_t<double> output(result.size());
-    py::buffer_info output_buf = output.request();
-    double* output_ptr = static_cast<double*>(output_buf.ptr);
-    std::copy(result.begin(), result.end(), output_ptr);
-    
+// One element of a batch call: a 1-D float32 or float64 input and its output of the same
+// dtype, both allocated or validated while the GIL is held.
+struct BatchItem {
+    bool is_float;
+    const char* input;
+    py::ssize_t input_stride;
+    size_t input_size;
+    char* output;
+    size_t output_size;
+
+    template <typename Fn>
+    void visit(Fn&& fn) const {
+        if (is_float) {
+            fn(StridedArray<const float>(reinterpret_cast<const float*>(input), input_stride, input_size),
+               StridedArray<float>(reinterpret_cast<float*>(output), sizeof(float), output_size));
+        } else {
+            fn(StridedArray<const double>(reinterpret_cast<const double*>(input), input_stride, input_size),
+               StridedArray<double>(reinterpret_cast<double*>(output), sizeof(double), output_size));
+        }
+    }
+};
+
+// Runs kernel(input, output) for every array in ``inputs`` across n_threads workers with
+// the GIL released; output_size maps an input length to its result length (and validates).
+template <typename Kernel>
+py::list indicator_batch(const py::sequence& inputs, int n_threads, const std::function<size_t(size_t)>& output_size, Kernel kernel) {
+    std::vector<BatchItem> batch;
+    py::list results;
+    // ``owners`` keeps the inputs alive even if another thread mutates the list meanwhile
+    std::vector<py::array> owners;
+    for (py::handle item : inputs) {
+        bool is_float = py::isinstance<py::array_t<float>>(item);
+        if (!is_float && !py::isinstance<py::array_t<double>>(item)) {
+            throw py::type_error("Batch inputs must be float32 or float64 NumPy arrays.");
+        }
+        py::array array = py::reinterpret_borrow<py::array>(item);
+        if (array.ndim() != 1) {
+            throw std::invalid_argument("Batch inputs must be one-dimensional arrays.");
+        }
+        size_t size = static_cast<size_t>(array.shape(0));
+        size_t result_size = output_size(size);
+        py::array result = is_float ? py::array(py::array_t<float>(result_size)) : py::array(py::array_t<double>(result_size));
+        owners.push_back(array);
+        results.append(result);
+        batch.push_back(BatchItem{is_float, static_cast<const char*>(array.data()), array.strides(0), size,
+                                  static_cast<char*>(result.mutable_data()), result_size});
+    }
+
+    py::gil_scoped_release release;
+    FeatureEngineering::parallel_for(batch.size(), n_threads, [&](size_t i) {
+        batch[i].visit(kernel);
+    });
+    return results;
+}
+
+py::list calculate_moving_average_batch_py(py::sequence inputs, int window_size, int n_threads) {
+    return indicator_batch(
+        inputs, n_threads, [&](size_t n) { return FeatureEngineering::moving_average_size(n, window_size); },
+        [&](const auto& data, const auto& output) { FeatureEngineering::moving_average_into(data, window_size, output); });
+}
+
+py::list calculate_exponential_moving_average_batch_py(py::sequence inputs, double alpha, int n_threads) {
+    FeatureEngineering::check_alpha(alpha);
+    return indicator_batch(
+        inputs, n_threads, [](size_t n) { return n; },
+        [&](const auto& data, const auto& output) { FeatureEngineering::exponential_moving_average_into(data, alpha, output); });
+}
+
+py::list calculate_relative_strength_index_batch_py(py::sequence inputs, int window_size, int n_threads) {
+    return indicator_batch(
+        inputs, n_threads, [&](size_t n) { return FeatureEngineering::relative_strength_index_size(n, window_size); },
+        [&](const auto& data, const auto& output) { FeatureEngineering::relative_strength_index_into(data, window_size, output); });
+}
+
+double* mutable_ptr(py::array_t<double>& array) {
+    return array.mutable_data();
+}
+
+template <typename V>
+py::dict grouped_expanding_stats_py(InputArray<int64_t> codes, InputArray<V> values) {
+    StridedArray<const int64_t> codes_view = input_view(codes, "codes");
+    StridedArray<const V> values_view = input_view(values, "values");
+    const size_t n = values_view.size;
+    py::array_t<double> count(n), mean(n), stddev(n), minimum(n), maximum(n), zscore(n);
+    double* pointers[6] = {
+        mutable_ptr(count), mutable_ptr(mean), mutable_ptr(stddev), mutable_ptr(minimum), mutable_ptr(maximum), mutable_ptr(zscore) };
+    {
+        py::gil_scoped_release release;
+        FeatureEngineering::grouped_expanding_stats_into(
+            codes_view, values_view, pointers[0], pointers[1], pointers[2], pointers[3], pointers[4], pointers[5]);
+    }
+
+    py::dict result;
+    result["count"] = count;
+    result["mean"] = mean;
+    result["std"] = stddev;
+    result["min"] = minimum;
+    result["max"] = maximum;
+    result["zscore"] = zscore;
+    return result;
+}
+
+template <typename V>
+py::dict grouped_window_aggregates_py(
+    InputArray<int64_t> codes,
+    InputArray<int64_t> times,
+    InputArray<V> values,
+    std::vector<int64_t> windows,
+    std::vector<std::string> aggregates) {
+    StridedArray<const int64_t> codes_view = input_view(codes, "codes");
+    StridedArray<const int64_t> times_view = input_view(times, "times");
+    StridedArray<const V> values_view = input_view(values, "values");
+    const size_t rows = windows.size();
+    const size_t cols = values_view.size;
+
+    // Only the requested aggregates get an output block
+    py::dict output;
+    double* pointers[5] = { nullptr, nullptr, nullptr, nullptr, nullptr };
+    const char* names[5] = { "count", "sum", "mean", "min", "max" };
+    for (size_t i = 0; i < aggregates.size(); ++i) {
+        const std::string& agg = aggregates[i];
+        const char* const* match = std::find(names, names + 5, agg);
+        if (match == names + 5) {
+            throw std::invalid_argument("Unsupported aggregate: " + agg);
+        }
+        size_t slot = match - names;
+        if (pointers[slot] == nullptr) {
+            py::array_t<double> block({rows, cols});
+            pointers[slot] = mutable_ptr(block);
+            output[names[slot]] = block;
+        }
+    }
+
+    {
+        py::gil_scoped_release release;
+        FeatureEngineering::grouped_window_aggregates_into(
+            codes_view, times_view, values_view, windows,
+            pointers[0], pointers[1], pointers[2], pointers[3], pointers[4]);
+    }
     return output;
 }
 
 PYBIND11_MODULE(_feature_engineering_cpp, m) {
     m.doc() = "C++ feature engineering module for FraudShield";
-    
-    m.def("calculate_moving_average", &calculate_moving_average_py,
-          "Calculate moving average with specified window size",
-          py::arg("input"), py::arg("window_size"));
-    
-    m.def("calculate_exponential_moving_average", &calculate_exponential_moving_average_py,
-          "Calculate exponential moving average with alpha parameter",
-          py::arg("input"), py::arg("alpha"));
-    
-    m.def("calculate_relative_strength_index", &calculate_relative_strength_index_py,
-          "Calculate Relative Strength Index (RSI) with specified window size",
-          py::arg("input"), py::arg("window_size"));
+
+    // float64 overloads are registered first so other numeric inputs convert to them on the second pass
+    m.def("calculate_moving_average", &calculate_moving_average_py<double>,
+          "Calculate moving average with specified window size, optionally writing into out",
+          py::arg("input"), py::arg("window_size"), py::arg("out") = py::none());
+    m.def("calculate_moving_average", &calculate_moving_average_py<float>,
+          "Calculate moving average with specified window size, optionally writing into out",
+          py::arg("input"), py::arg("window_size"), py::arg("out") = py::none());
+
+    m.def("calculate_exponential_moving_average", &calculate_exponential_moving_average_py<double>,
+          "Calculate exponential moving average with alpha parameter, optionally writing into out",
+          py::arg("input"), py::arg("alpha"), py::arg("out") = py::none());
+    m.def("calculate_exponential_moving_average", &calculate_exponential_moving_average_py<float>,
+          "Calculate exponential moving average with alpha parameter, optionally writing into out",
+          py::arg("input"), py::arg("alpha"), py::arg("out") = py::none());
+
+    m.def("calculate_relative_strength_index", &calculate_relative_strength_index_py<double>,
+          "Calculate Relative Strength Index (RSI) with specified window size, optionally writing into out",
+          py::arg("input"), py::arg("window_size"), py::arg("out") = py::none());
+    m.def("calculate_relative_strength_index", &calculate_relative_strength_index_py<float>,
+          "Calculate Relative Strength Index (RSI) with specified window size, optionally writing into out",
+          py::arg("input"), py::arg("window_size"), py::arg("out") = py::none());
+
+    m.def("calculate_moving_average_batch", &calculate_moving_average_batch_py,
+          "Moving average of every array in a list, spread over n_threads workers without the GIL",
+          py::arg("inputs"), py::arg("window_size"), py::arg("n_threads") = 0);
+    m.def("calculate_exponential_moving_average_batch", &calculate_exponential_moving_average_batch_py,
+          "Exponential moving average of every array in a list, spread over n_threads workers without the GIL",
+          py::arg("inputs"), py::arg("alpha"), py::arg("n_threads") = 0);
+    m.def("calculate_relative_strength_index_batch", &calculate_relative_strength_index_batch_py,
+          "Relative Strength Index of every array in a list, spread over n_threads workers without the GIL",
+          py::arg("inputs"), py::arg("window_size"), py::arg("n_threads") = 0);
+
+    m.def("segmented_moving_average", &segmented_moving_average_py<double>,
+          "Moving average over each segment's last window_size values, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("window_size"), py::arg("out") = py::none());
+    m.def("segmented_moving_average", &segmented_moving_average_py<float>,
+          "Moving average over each segment's last window_size values, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("window_size"), py::arg("out") = py::none());
+
+    m.def("segmented_exponential_moving_average", &segmented_exponential_moving_average_py<double>,
+          "Exponential moving average restarted at every segment, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("alpha"), py::arg("out") = py::none());
+    m.def("segmented_exponential_moving_average", &segmented_exponential_moving_average_py<float>,
+          "Exponential moving average restarted at every segment, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("alpha"), py::arg("out") = py::none());
+
+    m.def("segmented_relative_strength_index", &segmented_relative_strength_index_py<double>,
+          "Relative Strength Index (Wilder) restarted at every segment, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("window_size"), py::arg("out") = py::none());
+    m.def("segmented_relative_strength_index", &segmented_relative_strength_index_py<float>,
+          "Relative Strength Index (Wilder) restarted at every segment, aligned with the input",
+          py::arg("input"), py::arg("offsets"), py::arg("window_size"), py::arg("out") = py::none());
+
+    m.def("grouped_expanding_stats", &grouped_expanding_stats_py<double>,
+          "Leave-current-out expanding count/mean/std/min/max/z-score per segment (Welford)",
+          py::arg("codes"), py::arg("values"));
+    m.def("grouped_expanding_stats", &grouped_expanding_stats_py<float>,
+          "Leave-current-out expanding count/mean/std/min/max/z-score per segment (Welford)",
+          py::arg("codes"), py::arg("values"));
+
+    m.def("grouped_window_aggregates", &grouped_window_aggregates_py<double>,
+          "Left-closed time-window count/sum/mean/min/max per segment for several windows",
+          py::arg("codes"), py::arg("times"), py::arg("values"), py::arg("windows"), py::arg("aggregates"));
+    m.def("grouped_window_aggregates", &grouped_window_aggregates_py<float>,
+          "Left-closed time-window count/sum/mean/min/max per segment for several windows",
+          py::arg("codes"), py::arg("times"), py::arg("values"), py::arg("windows"), py::arg("aggregates"));
 }
 
 // int main() {
@@ -0,0 +1,452 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module maintains incremental per-entity feature state so live
+transactions can be scored one at a time (or in micro-batches) with the
+same columns that add_transaction_features produces over full history.
+
+File: online_state.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fraudshield.feature_engineering.rolling_engine import window_to_ns
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    _ensure_datetime,
+    _indicator_families,
+    _recency_families,
+    _user_expanding_features,
+    _window_families,
+)
+
+DEFAULT_MAX_EVENTS_PER_ENTITY = 10_000
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _as_float(value: Any) -> float:
+    if _is_missing(value):
+        return math.nan
+    return float(value)
+
+
+class _Welford:
+    """Running count/mean/variance/min/max over non-NaN values."""
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.nan
+        self.maximum = math.nan
+
+    def stats(self, value: float) -> Dict[str, float]:
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+        zscore = (value - self.mean) / std if self.count > 1 and std > 0 and not math.isnan(value) else math.nan
+        return {
+            "count": float(self.count),
+            "mean": self.mean if self.count else math.nan,
+            "std": std,
+            "min": self.minimum,
+            "max": self.maximum,
+            "zscore": zscore,
+        }
+
+    def add(self, value: float) -> None:
+        if math.isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.count == 1 else min(self.minimum, value)
+        self.maximum = value if self.count == 1 else max(self.maximum, value)
+
+
+class _WindowState:
+    """
+    Running aggregates for one entity over several windows.
+
+    Events sit in a ring buffer in time order. Each window keeps its own start
+    pointer and running count/sum (plus monotonic queues when min/max are
+    needed), so advancing to a new timestamp is amortized O(1) per event.
+    Events at the latest timestamp stay pending until time moves past them,
+    which keeps the ``[t - window, t)`` semantics of the batch features.
+    """
+
+    __slots__ = (
+        "windows_ns",
+        "times",
+        "values",
+        "base",
+        "end",
+        "starts",
+        "n_obs",
+        "n_valid",
+        "sums",
+        "min_queues",
+        "max_queues",
+    )
+
+    def __init__(self, windows_ns: Tuple[int, ...], n_values: int, extrema: bool) -> None:
+        n_windows = len(windows_ns)
+        self.windows_ns = windows_ns
+        self.times: Deque[int] = deque()
+        self.values: Deque[Tuple[float, ...]] = deque()
+        self.base = 0
+        self.end = 0
+        self.starts = [0] * n_windows
+        self.n_obs = [0] * n_windows
+        self.n_valid = [[0] * n_values for _ in range(n_windows)]
+        self.sums = [[0.0] * n_values for _ in range(n_windows)]
+        self.min_queues = [[deque() for _ in range(n_values)] for _ in range(n_windows)] if extrema else None
+        self.max_queues = [[deque() for _ in range(n_values)] for _ in range(n_windows)] if extrema else None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _enter(self, index: int) -> None:
+        values = self.values[index - self.base]
+        for w in range(len(self.starts)):
+            self.n_obs[w] += 1
+            for v, x in enumerate(values):
+                if math.isnan(x):
+                    continue
+                self.n_valid[w][v] += 1
+                self.sums[w][v] += x
+                if self.min_queues is not None:
+                    low = self.min_queues[w][v]
+                    while low and self.values[low[-1] - self.base][v] >= x:
+                        low.pop()
+                    low.append(index)
+                    high = self.max_queues[w][v]
+                    while high and self.values[high[-1] - self.base][v] <= x:
+                        high.pop()
+                    high.append(index)
+
+    def _leave(self, w: int) -> None:
+        index = self.starts[w]
+        self.starts[w] += 1
+        if index >= self.end:
+            return
+        self.n_obs[w] -= 1
+        for v, x in enumerate(self.values[index - self.base]):
+            if math.isnan(x):
+                continue
+            self.n_valid[w][v] -= 1
+            # Reset on empty so floating-point drift cannot accumulate across idle periods
+            self.sums[w][v] = self.sums[w][v] - x if self.n_valid[w][v] else 0.0
+            if self.min_queues is not None:
+                for queue in (self.min_queues[w][v], self.max_queues[w][v]):
+                    if queue and queue[0] == index:
+                        queue.popleft()
+
+    def advance(self, timestamp: int) -> None:
+        """Move every window to ``[timestamp - window, timestamp)`` and release unused events."""
+        stop = self.base + len(self.times)
+        while self.end < stop and self.times[self.end - self.base] < timestamp:
+            self._enter(self.end)
+            self.end += 1
+        for w, window_ns in enumerate(self.windows_ns):
+            lower = timestamp - window_ns
+            while self.starts[w] < self.end and self.times[self.starts[w] - self.base] < lower:
+                self._leave(w)
+        oldest = min(self.starts, default=self.end)
+        while self.base < oldest:
+            self.times.popleft()
+            self.values.popleft()
+            self.base += 1
+
+    def append(self, timestamp: int, values: Tuple[float, ...], capacity: int) -> None:
+        self.times.append(timestamp)
+        self.values.append(values)
+        if len(self.times) <= capacity:
+            return
+        # Ring buffer is full: the oldest event drops out of every window still holding it
+        for w in range(len(self.starts)):
+            if self.starts[w] == self.base:
+                self._leave(w)
+        self.end = max(self.end, self.base + 1)
+        self.times.popleft()
+        self.values.popleft()
+        self.base += 1
+
+    def evaluate(self, timestamp: int, outputs: Sequence[Tuple[str, int, int, str]]) -> Dict[str, float]:
+        """
+        ``read`` each output for the windows ending at ``timestamp``, leaving the state untouched.
+
+        Scans the buffered events instead of moving the start pointers, so a
+        later ingest dated before ``timestamp`` still finds every event it needs.
+        """
+        lowers = [timestamp - window_ns for window_ns in self.windows_ns]
+        n_obs = [0] * len(lowers)
+        valid: Dict[Tuple[int, int], List[float]] = {(w, v): [] for _, w, v, _ in outputs}
+        for time, values in zip(self.times, self.values):
+            if time >= timestamp:
+                break
+            for w, lower in enumerate(lowers):
+                if time < lower:
+                    continue
+                n_obs[w] += 1
+                for v, x in enumerate(values):
+                    if (w, v) in valid and not math.isnan(x):
+                        valid[w, v].append(x)
+
+        features = {}
+        for name, w, v, agg in outputs:
+            window = valid[w, v]
+            if agg == "count":
+                features[name] = float(len(window)) if n_obs[w] > 0 else math.nan
+            elif not window:
+                features[name] = math.nan
+            elif agg == "sum":
+                features[name] = sum(window)
+            elif agg == "mean":
+                features[name] = sum(window) / len(window)
+            else:
+                features[name] = min(window) if agg == "min" else max(window)
+        return features
+
+    def read(self, w: int, v: int, agg: str) -> float:
+        n_valid = self.n_valid[w][v]
+        if agg == "count":
+            return float(n_valid) if self.n_obs[w] > 0 else math.nan
+        if n_valid == 0:
+            return math.nan
+        if agg == "sum":
+            return self.sums[w][v]
+        if agg == "mean":
+            return self.sums[w][v] / n_valid
+        queue = self.min_queues[w][v] if agg == "min" else self.max_queues[w][v]
+        return self.values[queue[0] - self.base][v]
+
+
+class _WindowFamily(NamedTuple):
+    entity_column: str
+    windows_ns: Tuple[int, ...]
+    value_columns: Tuple[str, ...]
+    # (output name, window index, value index, aggregate) per emitted column
+    outputs: List[Tuple[str, int, int, str]]
+    extrema: bool
+
+
+# Per column-set layout: (feature names, recency families, user expanding features, window families)
+_Layout = Tuple[Tuple[str, ...], List[Tuple[str, Tuple[str, ...]]], List[Tuple[str, str]], List[_WindowFamily]]
+
+
+class OnlineFeatureState:
+    """
+    Incremental transaction feature state.
+
+    Each call to ``update`` returns the features for a transaction computed from
+    the transactions seen before it, then folds the transaction into the state,
+    mirroring the leave-current-out semantics of ``add_transaction_features``.
+    Window families keep a bounded ring buffer of recent events per entity and
+    expire events older than the longest window; recency and the user expanding
+    statistics keep O(1) state per entity.
+
+    Transactions must arrive in non-decreasing time order. Results match the
+    batch features as long as no entity exceeds ``max_events_per_entity``
+    events inside the longest window.
+    """
+
+    def __init__(
+        self,
+        config: Optional[TransactionFeatureConfig] = None,
+        max_events_per_entity: int = DEFAULT_MAX_EVENTS_PER_ENTITY,
+    ) -> None:
+        if max_events_per_entity <= 0:
+            raise ValueError("max_events_per_entity must be positive.")
+        self.config = config or TransactionFeatureConfig()
+        self.max_events_per_entity = max_events_per_entity
+        self._watermark: Optional[int] = None
+        self._last_seen: Dict[str, Dict[Hashable, int]] = {}
+        self._expanding: Dict[Hashable, _Welford] = {}
+        self._windows_state: Dict[str, Dict[Hashable, _WindowState]] = {}
+        self._layouts: Dict[Tuple[str, ...], _Layout] = {}
+
+    def feature_names(self, columns: Sequence[str]) -> List[str]:
+        """Feature columns produced for transactions carrying ``columns``."""
+        return list(self._layout(columns)[0])
+
+    def _layout(self, columns: Sequence[str]) -> _Layout:
+        key = tuple(columns)
+        layout = self._layouts.get(key)
+        if layout is None:
+            if _indicator_families(self.config, key):
+                raise ValueError("Indicator families are batch-only; OnlineFeatureState does not support them.")
+            recency = _recency_families(self.config, key)
+            expanding = _user_expanding_features(self.config, key)
+            families = []
+            for family in _window_families(self.config, key):
+                value_columns = tuple(dict.fromkeys(spec.value for spec in family.aggregates))
+                outputs = [
+                    (name, family.windows.index(window), value_columns.index(spec.value), spec.agg)
+                    for name, window, spec in family.outputs
+                ]
+                windows_ns = tuple(window_to_ns(window) for window in family.windows)
+                extrema = any(spec.agg in ("min", "max") for spec in family.aggregates)
+                families.append(_WindowFamily(family.entity_column, windows_ns, value_columns, outputs, extrema))
+            names = [name for name, _ in recency]
+            names.extend(name for name, _ in expanding)
+            for family in families:
+                names.extend(name for name, _, _, _ in family.outputs)
+            layout = self._layouts[key] = (tuple(names), recency, expanding, families)
+        return layout
+
+    def _entity(self, transaction: Mapping[str, Any], key_columns: Tuple[str, ...]) -> Optional[Hashable]:
+        keys = tuple(transaction[column] for column in key_columns)
+        if any(_is_missing(key) for key in keys):
+            return None
+        return keys[0] if len(keys) == 1 else keys
+
+    def compute(self, transaction: Mapping[str, Any]) -> Dict[str, float]:
+        """
+        Features for ``transaction`` from the current state, without ingesting it.
+
+        The state is left unchanged, so scoring a transaction dated after later
+        ingests does not expire events those ingests still need. Window
+        families are evaluated by scanning the buffered events of the entity.
+
+        Args:
+            transaction: Mapping with at least the configured time and amount columns
+
+        Returns:
+            Dict of feature name to value, in ``add_transaction_features`` column order
+        """
+        return self._features(transaction, advance=False)
+
+    def _features(self, transaction: Mapping[str, Any], advance: bool) -> Dict[str, float]:
+        """Features for ``transaction``; ``advance`` moves the windows forward, for callers that ingest it next."""
+        config = self.config
+        names, recency, expanding, families = self._layout(list(transaction.keys()))
+        features = dict.fromkeys(names, math.nan)
+        timestamp = self._timestamp(transaction)
+        if timestamp is None:
+            return features
+        self._check_order(timestamp)
+
+        for name, key_columns in recency:
+            entity = self._entity(transaction, key_columns)
+            last = self._last_seen.get(name, {}).get(entity) if entity is not None else None
+            if last is not None:
+                features[name] = (timestamp - last) / 1e9
+
+        if expanding:
+            user = self._entity(transaction, (config.user_column,))
+            if user is not None:
+                welford = self._expanding.get(user) or _Welford()
+                stats = welford.stats(_as_float(transaction[config.amount_column]))
+                for name, stat in expanding:
+                    features[name] = stats[stat]
+
+        for family in families:
+            entity = self._entity(transaction, (family.entity_column,))
+            state = self._windows_state.get(family.entity_column, {}).get(entity) if entity is not None else None
+            if state is None:
+                continue
+            if advance:
+                state.advance(timestamp)
+                for name, w, v, agg in family.outputs:
+                    features[name] = state.read(w, v, agg)
+            else:
+                features.update(state.evaluate(timestamp, family.outputs))
+        return features
+
+    def ingest(self, transaction: Mapping[str, Any]) -> None:
+        """Fold ``transaction`` into the state."""
+        config = self.config
+        timestamp = self._timestamp(transaction)
+        if timestamp is None:
+            return
+        self._check_order(timestamp)
+        self._watermark = timestamp
+        _, recency, expanding, families = self._layout(list(transaction.keys()))
+
+        for name, key_columns in recency:
+            entity = self._entity(transaction, key_columns)
+            if entity is not None:
+                self._last_seen.setdefault(name, {})[entity] = timestamp
+
+        if expanding:
+            user = self._entity(transaction, (config.user_column,))
+            if user is not None:
+                self._expanding.setdefault(user, _Welford()).add(_as_float(transaction[config.amount_column]))
+
+        for family in families:
+            entity = self._entity(transaction, (family.entity_column,))
+            if entity is None:
+                continue
+            states = self._windows_state.setdefault(family.entity_column, {})
+            state = states.get(entity)
+            if state is None:
+                state = states[entity] = _WindowState(family.windows_ns, len(family.value_columns), family.extrema)
+            values = tuple(_as_float(transaction[column]) for column in family.value_columns)
+            state.append(timestamp, values, self.max_events_per_entity)
+
+    def update(self, transaction: Mapping[str, Any]) -> Dict[str, float]:
+        """Compute the features for ``transaction`` and then ingest it."""
+        # Ingesting raises the watermark to this timestamp, so moving the windows here is safe
+        features = self._features(transaction, advance=True)
+        self.ingest(transaction)
+        return features
+
+    def update_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stream a micro-batch through ``update`` in time order.
+
+        Args:
+            df: Transactions with the configured columns
+
+        Returns:
+            DataFrame of features indexed like ``df``
+        """
+        times = _ensure_datetime(df[self.config.time_column])
+        order = np.argsort(times.to_numpy(dtype="datetime64[ns]"), kind="stable")
+        records = df.to_dict("records")
+        columns = self.feature_names(list(df.columns))
+        rows: List[Dict[str, float]] = [{}] * len(df)
+        for position in order:
+            rows[position] = self.update(records[position])
+        return pd.DataFrame(rows, index=df.index, columns=columns)
+
+    def expire(self, now: Any) -> None:
+        """Advance every window to ``now``, dropping expired events and entities left with none."""
+        timestamp = self._timestamp({self.config.time_column: now})
+        if timestamp is None:
+            return
+        self._check_order(timestamp)
+        self._watermark = timestamp
+        for states in self._windows_state.values():
+            for entity in list(states):
+                states[entity].advance(timestamp)
+                if not states[entity]:
+                    del states[entity]
+
+    def _check_order(self, timestamp: int) -> None:
+        if self._watermark is not None and timestamp < self._watermark:
+            raise ValueError("Transactions must arrive in non-decreasing time order.")
+
+    def _timestamp(self, transaction: Mapping[str, Any]) -> Optional[int]:
+        value = transaction.get(self.config.time_column)
+        if _is_missing(value):
+            return None
+        timestamp = pd.to_datetime(value, errors="coerce", utc=True)
+        if pd.isna(timestamp):
+            return None
+        return int(timestamp.value)
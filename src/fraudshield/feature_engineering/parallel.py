@@ -0,0 +1,209 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module runs the rolling engine across a process pool. Rows are hash
+partitioned by entity, so every entity's history lives in one partition,
+and columns travel through shared memory instead of pickled DataFrames.
+
+File: parallel.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fraudshield.feature_engineering import rolling_engine
+from fraudshield.feature_engineering.rolling_engine import (
+    EntityIndicator,
+    EntityKey,
+    WindowAggregate,
+    _as_keys,
+    entity_codes,
+)
+
+# Below this many rows the pool start-up costs more than it saves
+PARALLEL_MIN_ROWS = 100_000
+
+
+@dataclass(frozen=True)
+class _SharedSpec:
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def _attach(spec: _SharedSpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    # Pool workers share the parent's resource tracker, and the parent unlinks every block
+    if sys.version_info >= (3, 13):
+        block = shared_memory.SharedMemory(name=spec.name, track=False)
+    else:
+        block = shared_memory.SharedMemory(name=spec.name)
+    return block, np.ndarray(spec.shape, dtype=spec.dtype, buffer=block.buf)
+
+
+def _run_partition(
+    kind: str,
+    partition: int,
+    n_partitions: int,
+    codes_spec: _SharedSpec,
+    times_spec: _SharedSpec,
+    value_specs: Dict[str, _SharedSpec],
+    out_spec: _SharedSpec,
+    params: Dict[str, Any],
+) -> None:
+    """Compute one partition's features and write them into the shared output rows."""
+    blocks: List[shared_memory.SharedMemory] = []
+    try:
+        block, codes = _attach(codes_spec)
+        blocks.append(block)
+        block, times = _attach(times_spec)
+        blocks.append(block)
+        block, out = _attach(out_spec)
+        blocks.append(block)
+        values = {}
+        for name, spec in value_specs.items():
+            block, values[name] = _attach(spec)
+            blocks.append(block)
+
+        rows = np.flatnonzero((codes >= 0) & (codes % n_partitions == partition))
+        if len(rows) == 0:
+            return
+        entity = codes[rows]
+        part_times = times[rows]
+        if kind == "recency":
+            out[0, rows] = rolling_engine.time_since_last(entity, part_times)
+        elif kind == "expanding":
+            stats = rolling_engine.expanding_stats(entity, part_times, values["value"][rows])
+            for i, stat in enumerate(params["stats"]):
+                out[i, rows] = stats[stat]
+        elif kind == "indicators":
+            columns = rolling_engine.entity_indicators(entity, part_times, values["value"][rows], params["indicators"])
+            for i, column in enumerate(columns.values()):
+                out[i, rows] = column
+        else:
+            features = rolling_engine.compute_window_aggregates(
+                entity,
+                part_times,
+                {name: column[rows] for name, column in values.items()},
+                params["windows"],
+                params["aggregates"],
+            )
+            for i, column in enumerate(features.values()):
+                out[i, rows] = column
+        del codes, times, out, values
+    finally:
+        for block in blocks:
+            block.close()
+
+
+class PartitionedEngine:
+    """
+    Drop-in for the ``rolling_engine`` functions that fans each call out over
+    ``n_jobs`` entity partitions in a process pool. Use as a context manager so
+    the pool and shared-memory blocks are released.
+    """
+
+    def __init__(self, n_jobs: int) -> None:
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "PartitionedEngine":
+        self._pool = ProcessPoolExecutor(max_workers=self.n_jobs)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(
+        self,
+        kind: str,
+        entity: EntityKey,
+        times: np.ndarray,
+        values: Mapping[str, np.ndarray],
+        n_outputs: int,
+        params: Dict[str, Any],
+    ) -> np.ndarray:
+        if self._pool is None:
+            raise RuntimeError("PartitionedEngine must be used as a context manager.")
+        blocks: List[shared_memory.SharedMemory] = []
+
+        def share(array: np.ndarray) -> Tuple[_SharedSpec, np.ndarray]:
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            view[...] = array
+            return _SharedSpec(block.name, array.shape, array.dtype.str), view
+
+        try:
+            codes = entity_codes(*_as_keys(entity))
+            # Rows without a usable time never reach a kernel, same as the serial engine
+            codes[times == rolling_engine.NAT] = -1
+            codes_spec, _ = share(codes)
+            times_spec, _ = share(np.ascontiguousarray(times, dtype=np.int64))
+            value_specs = {
+                name: share(np.ascontiguousarray(column, dtype=np.float64))[0] for name, column in values.items()
+            }
+            out_spec, out = share(np.full((n_outputs, len(times)), np.nan))
+
+            futures = [
+                self._pool.submit(
+                    _run_partition, kind, p, self.n_jobs, codes_spec, times_spec, value_specs, out_spec, params
+                )
+                for p in range(self.n_jobs)
+            ]
+            for future in futures:
+                future.result()
+            return out.copy()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def time_since_last(self, entity: EntityKey, times: np.ndarray) -> np.ndarray:
+        return self._run("recency", entity, times, {}, 1, {})[0]
+
+    def expanding_stats(self, entity: EntityKey, times: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+        stats = ["count", "mean", "std", "min", "max", "zscore"]
+        out = self._run("expanding", entity, times, {"value": values}, len(stats), {"stats": stats})
+        return dict(zip(stats, out))
+
+    def entity_indicators(
+        self,
+        entity: EntityKey,
+        times: np.ndarray,
+        values: np.ndarray,
+        indicators: Sequence[EntityIndicator],
+    ) -> Dict[str, np.ndarray]:
+        names = [spec.name for spec in indicators]
+        params = {"indicators": list(indicators)}
+        out = self._run("indicators", entity, times, {"value": values}, len(names), params)
+        return dict(zip(names, out))
+
+    def compute_window_aggregates(
+        self,
+        entity: EntityKey,
+        times: np.ndarray,
+        values: Mapping[str, np.ndarray],
+        windows: Sequence[str],
+        aggregates: Sequence[WindowAggregate],
+    ) -> Dict[str, np.ndarray]:
+        names = [f"{spec.name}_{window}" for window in windows for spec in aggregates]
+        params = {"windows": list(windows), "aggregates": list(aggregates)}
+        out = self._run("window", entity, times, values, len(names), params)
+        return dict(zip(names, out))
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    """Map ``-1`` (or any non-positive value) to the machine's CPU count."""
+    if n_jobs > 0:
+        return n_jobs
+    return os.cpu_count() or 1
@@ -10,17 +10,38 @@ License: MIT
 """
 
 import logging
+from contextlib import nullcontext
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from fraudshield.feature_engineering import parallel, rolling_engine
+from fraudshield.feature_engineering.dtypes import float32_if_safe
+from fraudshield.feature_engineering.rolling_engine import NAT, EntityIndicator, WindowAggregate
+
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_WINDOWS = ["1h", "24h", "7d", "30d"]
 
+# Entity families that feature selection can name
+FEATURE_FAMILIES = ("user", "merchant", "user_merchant", "currency", "status")
+# Families that stay off unless named in ``families`` or their outputs in ``features``
+OPTIONAL_FAMILIES = ("user_indicators", "merchant_indicators")
+# Aggregates of the rolling window outputs that ``aggregates`` can select; the engine's
+# min/max are not emitted by any family
+WINDOW_AGGREGATES = ("count", "sum", "mean")
+
+# (output column, statistic) pairs from the per-user leave-current-out expanding pass
+USER_EXPANDING_FEATURES = [
+    ("user_amount_zscore", "zscore"),
+    ("user_amount_expanding_count", "count"),
+    ("user_amount_expanding_min", "min"),
+    ("user_amount_expanding_max", "max"),
+]
+
 
 @dataclass
 class TransactionFeatureConfig:
@@ -32,6 +53,34 @@ class TransactionFeatureConfig:
     status_column: str = "status"
     target_column: str = "fraud"
     windows: List[str] = field(default_factory=lambda: list(DEFAULT_WINDOWS))
+    # Worker processes for entity-partitioned feature computation (-1 uses every core)
+    n_jobs: int = 1
+    # Emit engineered features as float32 where every value round-trips
+    compact_dtypes: bool = False
+    # Feature selection; None keeps everything the input columns allow. ``families``
+    # takes FEATURE_FAMILIES names, ``aggregates`` restricts rolling-window aggregates,
+    # and ``features`` lists exact output columns (their window suffixes need not be in
+    # ``windows``). Only the computations behind selected outputs run.
+    families: Optional[List[str]] = None
+    aggregates: Optional[List[str]] = None
+    features: Optional[List[str]] = None
+    # Per-entity amount indicators of the OPTIONAL_FAMILIES: moving average and RSI
+    # windows in transactions, and the EMA smoothing factor
+    ma_window: int = 5
+    ema_alpha: float = 0.3
+    rsi_window: int = 14
+
+
+class WindowFamily(NamedTuple):
+    """Selected rolling outputs keyed on one entity column."""
+
+    entity_column: str
+    family: str
+    # Every aggregate and window any selected output needs
+    aggregates: List[WindowAggregate]
+    windows: List[str]
+    # (output column, window, aggregate) in window-major order
+    outputs: List[Tuple[str, str, WindowAggregate]]
 
 
 def parse_windows(windows: Optional[Iterable[str]]) -> List[str]:
@@ -60,92 +109,266 @@ def parse_windows(windows: Optional[Iterable[str]]) -> List[str]:
 
 
 def _ensure_datetime(series: pd.Series) -> pd.Series:
+    # Schema-typed ingestion already delivers UTC timestamps; only text or naive values are parsed
+    if isinstance(series.dtype, pd.DatetimeTZDtype) and str(series.dtype.tz) == "UTC":
+        return series
     return pd.to_datetime(series, errors="coerce", utc=True)
 
 
-def _rolling_group_agg(df: pd.DataFrame, group_col: str, value_col: str, window: str, agg: str) -> pd.Series:
-    grouped = df.groupby(group_col)[value_col]
-    rolled = grouped.rolling(window, closed="left").agg(agg)
-    return rolled.reset_index(level=0, drop=True)
+def _epoch_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    return pd.DatetimeIndex(index).as_unit("ns").asi8
 
 
-def _compute_user_amount_zscore(df: pd.DataFrame, user_col: str, amount_col: str) -> pd.Series:
-    grouped = df.groupby(user_col)[amount_col]
-    # Use shift(1) to exclude current row from expanding window calculation
-    mean = grouped.expanding().mean().groupby(level=0).shift(1)
-    std = grouped.expanding().std(ddof=1).groupby(level=0).shift(1)
-    mean = mean.reset_index(level=0, drop=True)
-    std = std.reset_index(level=0, drop=True)
-    # Handle division by zero - replace with NaN when std is 0 or NaN
-    z = pd.Series(index=df.index, dtype=float)
-    valid_mask = (std > 0) & std.notna()
-    z[valid_mask] = (df.loc[valid_mask, amount_col] - mean[valid_mask]) / std[valid_mask]
-    z[~valid_mask] = np.nan
-    return z
+def _validate_selection(config: TransactionFeatureConfig) -> None:
+    unknown = set(config.families or []) - set(FEATURE_FAMILIES) - set(OPTIONAL_FAMILIES)
+    if unknown:
+        raise ValueError(
+            f"Unknown feature families {sorted(unknown)}. Use any of {FEATURE_FAMILIES + OPTIONAL_FAMILIES}."
+        )
+    unknown = set(config.aggregates or []) - set(WINDOW_AGGREGATES)
+    if unknown:
+        raise ValueError(f"Unknown aggregates {sorted(unknown)}. Use any of {WINDOW_AGGREGATES}.")
 
 
-def add_transaction_features(df: pd.DataFrame, config: TransactionFeatureConfig) -> pd.DataFrame:
-    if config.time_column not in df.columns or config.amount_column not in df.columns:
-        logger.info("Skipping transaction features: required columns missing.")
-        return df
+def _selected(config: TransactionFeatureConfig, family: str, name: str) -> bool:
+    if config.families is not None and family not in config.families:
+        return False
+    return config.features is None or name in config.features
+
 
-    work_df = df.copy()
-    work_df[config.time_column] = _ensure_datetime(work_df[config.time_column])
+def _opted_in(config: TransactionFeatureConfig, family: str, name: str) -> bool:
+    """``_selected`` for OPTIONAL_FAMILIES, which must also be asked for by name."""
+    named = (config.families is not None and family in config.families) or (
+        config.features is not None and name in config.features
+    )
+    return named and _selected(config, family, name)
 
-    work_df["__orig_index__"] = np.arange(len(work_df))
-    work_df = work_df.sort_values(config.time_column)
-    work_df = work_df.set_index(config.time_column)
 
+def _recency_families(config: TransactionFeatureConfig, columns: Iterable[str]) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Entities (as key columns) that get a selected ``*_time_since_last_txn`` feature."""
+    columns = set(columns)
+    candidates: List[Tuple[str, str, Tuple[str, ...]]] = []
+    has_user = config.user_column in columns
+    has_merchant = config.merchant_column in columns
+    if has_user:
+        candidates.append(("user", "user_time_since_last_txn", (config.user_column,)))
+    if has_merchant:
+        candidates.append(("merchant", "merchant_time_since_last_txn", (config.merchant_column,)))
+    if has_user and has_merchant:
+        candidates.append(
+            ("user_merchant", "user_merchant_time_since_last_txn", (config.user_column, config.merchant_column))
+        )
+    return [(name, key_columns) for family, name, key_columns in candidates if _selected(config, family, name)]
+
+
+def _user_expanding_features(config: TransactionFeatureConfig, columns: Iterable[str]) -> List[Tuple[str, str]]:
+    """Selected (output column, statistic) pairs of the per-user expanding pass."""
+    if config.user_column not in set(columns):
+        return []
+    return [(name, stat) for name, stat in USER_EXPANDING_FEATURES if _selected(config, "user", name)]
+
+
+def _spec_windows(config: TransactionFeatureConfig, spec: WindowAggregate) -> List[str]:
     windows = parse_windows(config.windows)
+    if config.features is None:
+        return windows
+    # Explicit output names may carry windows beyond ``config.windows``
+    prefix = f"{spec.name}_"
+    for name in config.features:
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and suffix not in windows:
+            try:
+                pd.to_timedelta(suffix)
+            except ValueError:
+                continue
+            windows.append(suffix)
+    return windows
+
 
-    if config.user_column in work_df.columns:
-        work_df["user_time_since_last_txn"] = (
-            work_df.groupby(config.user_column)
-            .apply(lambda group: group.index.to_series().diff().dt.total_seconds())
-            .reset_index(level=0, drop=True)
+def _window_families(config: TransactionFeatureConfig, columns: Iterable[str]) -> List[WindowFamily]:
+    """Group the selected rolling window outputs by the entity column they are keyed on."""
+    columns = set(columns)
+    candidates: List[Tuple[str, str, List[WindowAggregate]]] = []
+    if config.user_column in columns:
+        candidates.append(
+            (
+                config.user_column,
+                "user",
+                [
+                    WindowAggregate("user_txn_count", config.amount_column, "count"),
+                    WindowAggregate("user_amount_sum", config.amount_column, "sum"),
+                    WindowAggregate("user_amount_mean", config.amount_column, "mean"),
+                ],
+            )
         )
-        work_df["user_amount_zscore"] = _compute_user_amount_zscore(
-            work_df,
-            config.user_column,
-            config.amount_column,
+    if config.merchant_column in columns:
+        merchant = [
+            WindowAggregate("merchant_txn_count", config.amount_column, "count"),
+            WindowAggregate("merchant_amount_mean", config.amount_column, "mean"),
+        ]
+        if config.target_column in columns:
+            merchant.append(WindowAggregate("merchant_fraud_rate", config.target_column, "mean"))
+        candidates.append((config.merchant_column, "merchant", merchant))
+    if config.currency_column in columns:
+        candidates.append(
+            (config.currency_column, "currency", [WindowAggregate("currency_txn_count", config.amount_column, "count")])
+        )
+    if config.status_column in columns:
+        candidates.append(
+            (config.status_column, "status", [WindowAggregate("status_txn_count", config.amount_column, "count")])
         )
-        for window in windows:
-            work_df[f"user_txn_count_{window}"] = _rolling_group_agg(
-                work_df, config.user_column, config.amount_column, window, "count"
-            )
-            work_df[f"user_amount_sum_{window}"] = _rolling_group_agg(
-                work_df, config.user_column, config.amount_column, window, "sum"
-            )
-            work_df[f"user_amount_mean_{window}"] = _rolling_group_agg(
-                work_df, config.user_column, config.amount_column, window, "mean"
-            )
 
-    if config.merchant_column in work_df.columns:
-        for window in windows:
-            work_df[f"merchant_txn_count_{window}"] = _rolling_group_agg(
-                work_df, config.merchant_column, config.amount_column, window, "count"
-            )
-            work_df[f"merchant_amount_mean_{window}"] = _rolling_group_agg(
-                work_df, config.merchant_column, config.amount_column, window, "mean"
+    families: List[WindowFamily] = []
+    for entity_column, family, specs in candidates:
+        if config.aggregates is not None:
+            specs = [spec for spec in specs if spec.agg in config.aggregates]
+        wanted = {
+            spec: [window for window in _spec_windows(config, spec) if _selected(config, family, f"{spec.name}_{window}")]
+            for spec in specs
+        }
+        windows = list(dict.fromkeys(window for spec in specs for window in wanted[spec]))
+        outputs = [
+            (f"{spec.name}_{window}", window, spec) for window in windows for spec in specs if window in wanted[spec]
+        ]
+        if outputs:
+            aggregates = [spec for spec in specs if wanted[spec]]
+            families.append(WindowFamily(entity_column, family, aggregates, windows, outputs))
+    return families
+
+
+def _indicator_families(
+    config: TransactionFeatureConfig, columns: Iterable[str]
+) -> List[Tuple[str, List[EntityIndicator]]]:
+    """Entity columns with their selected per-entity amount indicators."""
+    columns = set(columns)
+    candidates = [
+        ("user_indicators", "user", config.user_column),
+        ("merchant_indicators", "merchant", config.merchant_column),
+    ]
+    families = []
+    for family, prefix, entity_column in candidates:
+        if entity_column not in columns:
+            continue
+        indicators = [
+            EntityIndicator(f"{prefix}_amount_ma_{config.ma_window}", "ma", config.ma_window),
+            EntityIndicator(f"{prefix}_amount_ema", "ema", config.ema_alpha),
+            EntityIndicator(f"{prefix}_amount_rsi_{config.rsi_window}", "rsi", config.rsi_window),
+        ]
+        indicators = [spec for spec in indicators if _opted_in(config, family, spec.name)]
+        if indicators:
+            families.append((entity_column, indicators))
+    return families
+
+
+def feature_names(config: TransactionFeatureConfig, columns: Iterable[str]) -> List[str]:
+    """
+    Output columns ``add_transaction_features`` emits for the given input columns.
+
+    Args:
+        config: Feature configuration, including any feature selection
+        columns: Input column names
+
+    Returns:
+        Feature column names in emission order
+    """
+    columns = list(columns)
+    _validate_selection(config)
+    names = [name for name, _ in _recency_families(config, columns)]
+    names.extend(name for name, _ in _user_expanding_features(config, columns))
+    for family in _window_families(config, columns):
+        names.extend(name for name, _, _ in family.outputs)
+    for _, indicators in _indicator_families(config, columns):
+        names.extend(spec.name for spec in indicators)
+    return names
+
+
+def compute_transaction_features(df: pd.DataFrame, config: TransactionFeatureConfig) -> Dict[str, np.ndarray]:
+    """
+    Compute every engineered feature column for ``df`` without attaching them.
+
+    Args:
+        df: Transactions containing the configured time and amount columns
+        config: Feature configuration
+
+    Returns:
+        Mapping of feature name to an array aligned with ``df`` rows
+    """
+    time_values = _ensure_datetime(df[config.time_column])
+    epoch = _epoch_ns(pd.DatetimeIndex(time_values))
+    # Time order with NaT rows last, stable for ties; features are computed on this order
+    order = np.lexsort((epoch, epoch == NAT))
+    times = epoch[order]
+
+    def column_values(column: str, dtype: Optional[type] = None) -> np.ndarray:
+        series = df[column]
+        if dtype is None and isinstance(series.dtype, pd.CategoricalDtype):
+            # Keep the dictionary encoding; factorize reads the codes directly
+            return series.array[order]
+        return series.to_numpy(dtype=dtype)[order]
+
+    _validate_selection(config)
+    sorted_features: Dict[str, np.ndarray] = {}
+    use_pool = parallel.resolve_n_jobs(config.n_jobs) > 1 and len(df) >= parallel.PARALLEL_MIN_ROWS
+    with parallel.PartitionedEngine(config.n_jobs) if use_pool else nullcontext(rolling_engine) as engine:
+        for name, key_columns in _recency_families(config, df.columns):
+            entity = tuple(column_values(column) for column in key_columns)
+            sorted_features[name] = engine.time_since_last(entity, times)
+
+        expanding = _user_expanding_features(config, df.columns)
+        if expanding:
+            stats = engine.expanding_stats(
+                column_values(config.user_column),
+                times,
+                column_values(config.amount_column, np.float64),
             )
-            if config.target_column in work_df.columns:
-                work_df[f"merchant_fraud_rate_{window}"] = _rolling_group_agg(
-                    work_df, config.merchant_column, config.target_column, window, "mean"
-                )
+            for name, stat in expanding:
+                sorted_features[name] = stats[stat]
 
-    if config.currency_column in work_df.columns:
-        for window in windows:
-            work_df[f"currency_txn_count_{window}"] = _rolling_group_agg(
-                work_df, config.currency_column, config.amount_column, window, "count"
+        for family in _window_families(config, df.columns):
+            values = {column: column_values(column, np.float64) for column in {spec.value for spec in family.aggregates}}
+            computed = engine.compute_window_aggregates(
+                column_values(family.entity_column),
+                times,
+                values,
+                family.windows,
+                family.aggregates,
             )
+            for name, _, _ in family.outputs:
+                sorted_features[name] = computed[name]
 
-    if config.status_column in work_df.columns:
-        for window in windows:
-            work_df[f"status_txn_count_{window}"] = _rolling_group_agg(
-                work_df, config.status_column, config.amount_column, window, "count"
+        for entity_column, indicators in _indicator_families(config, df.columns):
+            sorted_features.update(
+                engine.entity_indicators(
+                    column_values(entity_column),
+                    times,
+                    column_values(config.amount_column, np.float64),
+                    indicators,
+                )
             )
 
-    work_df = work_df.reset_index()
-    work_df = work_df.sort_values("__orig_index__")
-    work_df = work_df.drop(columns=["__orig_index__"])
-    return work_df
+    if config.features is not None:
+        missing = [name for name in config.features if name not in sorted_features]
+        if missing:
+            logger.warning(f"Requested features not available for these input columns: {missing}")
+
+    # Scatter back to input row order
+    features = {}
+    for name, column in sorted_features.items():
+        restored = np.empty(len(df))
+        restored[order] = column
+        features[name] = float32_if_safe(restored) if config.compact_dtypes else restored
+    return features
+
+
+def attach_features(df: pd.DataFrame, config: TransactionFeatureConfig, features: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Return ``df`` with a parsed time column and ``features`` appended in one concat."""
+    base = df.drop(columns=[config.time_column, *[name for name in features if name in df.columns]])
+    base.insert(0, config.time_column, _ensure_datetime(df[config.time_column]).array)
+    return pd.concat([base, pd.DataFrame(features, index=df.index)], axis=1)
+
+
+def add_transaction_features(df: pd.DataFrame, config: TransactionFeatureConfig) -> pd.DataFrame:
+    if config.time_column not in df.columns or config.amount_column not in df.columns:
+        logger.info("Skipping transaction features: required columns missing.")
+        return df
+    return attach_features(df, config, compute_transaction_features(df, config))
@@ -0,0 +1,34 @@
+"""
+FraudShield - Advanced Anomaly Detection Pipeline
+
+This module configures logging for the command-line entry points. Handlers
+are installed when a CLI starts rather than when its module is imported, so
+library callers keep control of their own logging setup.
+
+File: logging_config.py
+Author: Mudit Bhargava
+License: MIT
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+LOG_DIR = "logs"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(log_file: str, level: int = logging.INFO) -> None:
+    """
+    Sends INFO logs to stdout and to ``logs/<log_file>``.
+
+    Args:
+        log_file: File name inside the ``logs`` directory
+        level: Root logging level
+    """
+    Path(LOG_DIR).mkdir(exist_ok=True)
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[logging.FileHandler(Path(LOG_DIR) / log_file), logging.StreamHandler(sys.stdout)],
+    )
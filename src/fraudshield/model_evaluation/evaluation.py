@@ -3,7 +3,8 @@ FraudShield - Advanced Anomaly Detection Pipeline
 
 This module executes model inference against testing sets, quantifies
 predictive capabilities using scikit-learn metrics, and creates
-graphical analysis summaries.
+graphical analysis summaries. The plotting stack is imported only when a
+figure is drawn, and saved figures render without pyplot.
 
 File: evaluation.py
 Author: Mudit Bhargava
@@ -12,16 +13,13 @@ License: MIT
 
 import argparse
 import logging
-import sys
 from pathlib import Path
 
 from typing import Optional, Tuple
 
 import joblib
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 from sklearn.metrics import (
     accuracy_score,
     average_precision_score,
@@ -32,15 +30,13 @@ from sklearn.metrics import (
     roc_auc_score,
 )
 
-# Set up logging
-Path("logs").mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("logs/fraudshield_evaluate.log"), logging.StreamHandler(sys.stdout)],
-)
+from fraudshield.logging_config import configure_logging
+
 logger = logging.getLogger(__name__)
 
+CM_RENDERERS = ("seaborn", "matplotlib")
+CM_LABELS = ["Neg", "Pos"]
+
 
 class ModelEvaluation:
     def __init__(self, y_true: np.ndarray, y_pred: np.ndarray, y_prob: Optional[np.ndarray] = None) -> None:
@@ -75,34 +71,71 @@ class ModelEvaluation:
         )
         return accuracy, precision, recall, f1, auc, ap
 
-    def plot_confusion_matrix(self, normalize: bool = False, save_path: Optional[str] = None) -> None:
+    def compute_confusion_matrix(self, normalize: bool = False) -> np.ndarray:
         cm = confusion_matrix(self.y_true, self.y_pred)
         if normalize:
             row_sums = cm.sum(axis=1)[:, np.newaxis]
             cm = np.divide(
                 cm.astype("float"), row_sums, out=np.zeros_like(cm, dtype=float), where=row_sums != 0
             )
+        return cm
 
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(
-            cm,
-            annot=True,
-            cmap="Blues",
-            fmt=".2f" if normalize else "d",
-            xticklabels=["Neg", "Pos"],
-            yticklabels=["Neg", "Pos"],
-        )
-        plt.xlabel("Predicted Labels")
-        plt.ylabel("True Labels")
-        plt.title("Confusion Matrix")
+    def plot_confusion_matrix(
+        self,
+        normalize: bool = False,
+        save_path: Optional[str] = None,
+        renderer: str = "seaborn",
+        dpi: int = 300,
+    ) -> None:
+        """
+        Draws the confusion matrix, saving it to ``save_path`` or showing it interactively.
+
+        Args:
+            normalize: Plot row-normalized rates instead of counts
+            save_path: PNG destination; None opens an interactive window
+            renderer: ``seaborn`` heatmap, or ``matplotlib`` for a lighter
+                ``imshow`` rendering that does not import seaborn
+            dpi: Resolution of the saved figure
+        """
+        if renderer not in CM_RENDERERS:
+            raise ValueError(f"Unsupported renderer '{renderer}'; expected one of {CM_RENDERERS}")
+        cm = self.compute_confusion_matrix(normalize)
+
+        # Saved figures render on a standalone Agg figure, so headless jobs never load pyplot or a GUI backend
+        if save_path:
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(8, 6))
+        else:
+            import matplotlib.pyplot as plt
+
+            fig = plt.figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        fmt = ".2f" if normalize else "d"
+        if renderer == "seaborn":
+            import seaborn as sns
+
+            sns.heatmap(cm, annot=True, cmap="Blues", fmt=fmt, xticklabels=CM_LABELS, yticklabels=CM_LABELS, ax=ax)
+        else:
+            image = ax.imshow(cm, cmap="Blues")
+            fig.colorbar(image, ax=ax)
+            ax.set_xticks(range(len(CM_LABELS)), CM_LABELS)
+            ax.set_yticks(range(len(CM_LABELS)), CM_LABELS)
+            threshold = (cm.max() + cm.min()) / 2.0
+            for (i, j), value in np.ndenumerate(cm):
+                color = "white" if value > threshold else "black"
+                ax.text(j, i, format(value, fmt), ha="center", va="center", color=color)
+        ax.set_xlabel("Predicted Labels")
+        ax.set_ylabel("True Labels")
+        ax.set_title("Confusion Matrix")
 
         if save_path:
             path_obj = Path(save_path)
             path_obj.parent.mkdir(parents=True, exist_ok=True)
-            plt.savefig(path_obj, dpi=300, bbox_inches="tight")
+            fig.savefig(path_obj, dpi=dpi, bbox_inches="tight")
         else:
             plt.show()
-        plt.close()
+            plt.close(fig)
 
     def generate_report(self, output_path: Optional[str] = None) -> pd.DataFrame:
         accuracy, precision, recall, f1, auc, ap = self.calculate_metrics()
@@ -151,9 +184,28 @@ def evaluate_and_save(
     model_path: str,
     test_data: str,
     output_path: str,
-    confusion_matrix_path: str,
+    confusion_matrix_path: Optional[str] = None,
     normalize_cm: bool = False,
+    metrics_only: bool = False,
+    cm_renderer: str = "seaborn",
+    cm_dpi: int = 300,
 ) -> ModelEvaluation:
+    """
+    Scores a saved model on the test set and writes the metrics report.
+
+    Args:
+        model_path: Trained model file
+        test_data: Test set saved by preprocessing
+        output_path: Metrics CSV destination
+        confusion_matrix_path: Confusion-matrix PNG destination; None skips the plot
+        normalize_cm: Plot row-normalized rates instead of counts
+        metrics_only: Write only the metrics CSV, without importing or rendering any plot
+        cm_renderer: ``seaborn`` or the lighter ``matplotlib`` renderer
+        cm_dpi: Resolution of the confusion-matrix PNG
+
+    Returns:
+        The evaluation, for further inspection
+    """
     model = joblib.load(model_path)
     X_test, y_test = _load_dataset(test_data)
     y_pred = model.predict(X_test)
@@ -161,11 +213,15 @@ def evaluate_and_save(
 
     evaluation = ModelEvaluation(y_test, y_pred, y_prob)
     evaluation.generate_report(output_path)
-    evaluation.plot_confusion_matrix(normalize=normalize_cm, save_path=confusion_matrix_path)
+    if not metrics_only and confusion_matrix_path:
+        evaluation.plot_confusion_matrix(
+            normalize=normalize_cm, save_path=confusion_matrix_path, renderer=cm_renderer, dpi=cm_dpi
+        )
     return evaluation
 
 
 def main() -> None:
+    configure_logging("fraudshield_evaluate.log")
     parser = argparse.ArgumentParser(description="Evaluate trained models")
     parser.add_argument(
         "--model_path", type=str, default="data/models/xgboost.pkl", help="Path to the trained model file"
@@ -190,6 +246,19 @@ def main() -> None:
         action="store_true",
         help="Normalize conf matrix values",
     )
+    parser.add_argument(
+        "--metrics_only",
+        action="store_true",
+        help="Write only the metrics report and skip the confusion matrix plot",
+    )
+    parser.add_argument(
+        "--cm_renderer",
+        type=str,
+        default="seaborn",
+        choices=list(CM_RENDERERS),
+        help="Confusion matrix renderer; 'matplotlib' avoids importing seaborn",
+    )
+    parser.add_argument("--cm_dpi", type=int, default=300, help="Resolution of the saved confusion matrix")
     args = parser.parse_args()
 
     evaluate_and_save(
@@ -198,6 +267,9 @@ def main() -> None:
         output_path=args.output_path,
         confusion_matrix_path=args.confusion_matrix_path,
         normalize_cm=args.normalize_cm,
+        metrics_only=args.metrics_only,
+        cm_renderer=args.cm_renderer,
+        cm_dpi=args.cm_dpi,
     )
 
 
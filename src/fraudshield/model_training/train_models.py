@@ -13,13 +13,11 @@ License: MIT
 import argparse
 import json
 import logging
-import sys
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 
 import joblib
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import (
     accuracy_score,
     average_precision_score,
@@ -30,15 +28,13 @@ from sklearn.metrics import (
 )
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from xgboost import XGBClassifier
-
-# Set up logging
-Path("logs").mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("logs/fraudshield_train.log"), logging.StreamHandler(sys.stdout)],
-)
+
+from fraudshield.logging_config import configure_logging
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
+    from xgboost import XGBClassifier
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,7 +87,9 @@ def _parse_hyperparameters(hyperparameters: Union[str, Dict, None]) -> Dict[str,
 
 def train_random_forest(
     X_train: np.ndarray, y_train: np.ndarray, random_state: int = 42, params: Optional[Dict[str, Any]] = None
-) -> RandomForestClassifier:
+) -> "RandomForestClassifier":
+    from sklearn.ensemble import RandomForestClassifier
+
     model_params = {
         "n_estimators": 300,
         "random_state": random_state,
@@ -107,7 +105,10 @@ def train_random_forest(
 
 def train_xgboost(
     X_train: np.ndarray, y_train: np.ndarray, random_state: int = 42, params: Optional[Dict[str, Any]] = None
-) -> XGBClassifier:
+) -> "XGBClassifier":
+    # xgboost is the slowest dependency to import; load it only when training
+    from xgboost import XGBClassifier
+
     scale_pos_weight = _compute_scale_pos_weight(y_train)
     model_params = {
         "n_estimators": 300,
@@ -208,6 +209,7 @@ def train_and_save(
 
 
 def main() -> None:
+    configure_logging("fraudshield_train.log")
     parser = argparse.ArgumentParser(description="Train fraud detection models")
     parser.add_argument(
         "--preprocessed_data",
@@ -45,6 +45,83 @@ TEST(FeatureEngineeringTest, AggregateFeatures) {
     EXPECT_EQ(result, expected);
 }
 
+TEST(FeatureEngineeringTest, GroupedExpandingStats) {
+    std::vector<int64_t> codes = { 0, 0, 0, 0, 1, 1 };
+    std::vector<double> values = { 1.0, 3.0, NAN, 8.0, 5.0, 7.0 };
+    ExpandingStats stats = FeatureEngineering::grouped_expanding_stats(codes, values);
+
+    std::vector<double> expected_count = { 0.0, 1.0, 2.0, 2.0, 0.0, 1.0 };
+    EXPECT_EQ(stats.count, expected_count);
+    EXPECT_TRUE(std::isnan(stats.mean[0]));
+    EXPECT_DOUBLE_EQ(stats.mean[3], 2.0);
+    EXPECT_NEAR(stats.stddev[3], std::sqrt(2.0), 1e-12);
+    EXPECT_NEAR(stats.zscore[3], 6.0 / std::sqrt(2.0), 1e-12);
+    EXPECT_TRUE(std::isnan(stats.zscore[2]));
+    EXPECT_DOUBLE_EQ(stats.minimum[3], 1.0);
+    EXPECT_DOUBLE_EQ(stats.maximum[3], 3.0);
+    EXPECT_DOUBLE_EQ(stats.mean[5], 5.0);
+    EXPECT_TRUE(std::isnan(stats.stddev[5]));
+}
+
+TEST(FeatureEngineeringTest, GroupedWindowAggregates) {
+    std::vector<int64_t> codes = { 0, 0, 0, 0, 1, 1 };
+    std::vector<int64_t> times = { 0, 10, 10, 25, 0, 5 };
+    std::vector<double> values = { 4.0, NAN, 2.0, 6.0, 1.0, 3.0 };
+    std::vector<int64_t> windows = { 15, 100 };
+    WindowAggregates result = FeatureEngineering::grouped_window_aggregates(codes, times, values, windows, true);
+
+    // Window 15 at t=25 covers [10, 25): the NaN row and 2.0
+    EXPECT_TRUE(std::isnan(result.count[0]));
+    EXPECT_DOUBLE_EQ(result.count[1], 1.0);
+    EXPECT_DOUBLE_EQ(result.count[2], 1.0);
+    EXPECT_DOUBLE_EQ(result.count[3], 1.0);
+    EXPECT_DOUBLE_EQ(result.sum[3], 2.0);
+    EXPECT_DOUBLE_EQ(result.minimum[3], 2.0);
+
+    // Window 100 at t=25 covers every earlier row of segment 0
+    EXPECT_DOUBLE_EQ(result.count[6 + 3], 2.0);
+    EXPECT_DOUBLE_EQ(result.mean[6 + 3], 3.0);
+    EXPECT_DOUBLE_EQ(result.minimum[6 + 3], 2.0);
+    EXPECT_DOUBLE_EQ(result.maximum[6 + 3], 4.0);
+    EXPECT_DOUBLE_EQ(result.sum[6 + 5], 1.0);
+    EXPECT_TRUE(std::isnan(result.sum[6 + 4]));
+}
+
+TEST(FeatureEngineeringTest, SegmentedIndicators) {
+    std::vector<double> values = { 1.0, 3.0, NAN, 5.0, 10.0, 20.0, 30.0 };
+    std::vector<int64_t> offsets = { 0, 4, 4, 7 };
+    std::vector<double> output(values.size());
+    StridedArray<const int64_t> offsets_view(offsets);
+
+    // The NaN row carries the previous value; segment 2 restarts at 10.0
+    FeatureEngineering::segmented_moving_average_into(
+        StridedArray<const double>(values), offsets_view, 2, StridedArray<double>(output));
+    EXPECT_TRUE(std::isnan(output[0]));
+    EXPECT_DOUBLE_EQ(output[1], 2.0);
+    EXPECT_DOUBLE_EQ(output[2], 2.0);
+    EXPECT_DOUBLE_EQ(output[3], 4.0);
+    EXPECT_TRUE(std::isnan(output[4]));
+    EXPECT_DOUBLE_EQ(output[6], 25.0);
+
+    FeatureEngineering::segmented_exponential_moving_average_into(
+        StridedArray<const double>(values), offsets_view, 0.5, StridedArray<double>(output));
+    EXPECT_DOUBLE_EQ(output[0], 1.0);
+    EXPECT_DOUBLE_EQ(output[3], 3.5);
+    EXPECT_DOUBLE_EQ(output[4], 10.0);
+
+    FeatureEngineering::segmented_relative_strength_index_into(
+        StridedArray<const double>(values), offsets_view, 2, StridedArray<double>(output));
+    EXPECT_TRUE(std::isnan(output[0]));
+    EXPECT_DOUBLE_EQ(output[1], 100.0);
+    EXPECT_DOUBLE_EQ(output[6], 100.0);
+
+    std::vector<int64_t> bad_offsets = { 0, 3 };
+    EXPECT_THROW(FeatureEngineering::segmented_moving_average_into(
+                     StridedArray<const double>(values), StridedArray<const int64_t>(bad_offsets), 2,
+                     StridedArray<double>(output)),
+                 std::invalid_argument);
+}
+
 int main(int argc, char** argv) {
     testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();
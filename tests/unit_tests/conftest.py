@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def make_transactions():
+    """Builds a random transaction frame sorted by date, with some amounts missing."""
+
+    def build(n=300, seed=5, missing=10):
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame(
+            {
+                "transaction_id": np.arange(n, dtype=np.int64),
+                "user_id": rng.integers(0, 10, n),
+                "merchant_id": rng.integers(0, 5, n),
+                "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 3000, n), unit="min"),
+                "amount": rng.gamma(2.0, 40.0, n),
+                "currency": rng.choice(["USD", "EUR", "GBP"], n),
+                "status": rng.choice(["approved", "declined"], n),
+                "fraud": rng.integers(0, 2, n),
+            }
+        )
+        df.loc[rng.choice(n, missing, replace=False), "amount"] = np.nan
+        return df.sort_values("transaction_date", kind="stable").reset_index(drop=True)
+
+    return build
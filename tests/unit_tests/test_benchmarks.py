@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from fraudshield.benchmarks import kernel_benchmarks
+from fraudshield.benchmarks.kernel_benchmarks import (
+    BenchmarkResult,
+    compare_to_baseline,
+    kernel_names,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+
+def test_every_kernel_runs_on_each_backend():
+    results = run_benchmarks(sizes=[1_000], backends=["python"], min_repeats=1, min_seconds=0.0)
+    assert [result.kernel for result in results] == kernel_names()
+    assert all(result.seconds > 0 and result.size == 1_000 for result in results)
+
+    with pytest.raises(ValueError):
+        run_benchmarks(sizes=[1_000], kernels=["features.nonexistent"])
+
+
+def test_results_round_trip_and_regressions_are_flagged(tmp_path):
+    baseline = [
+        BenchmarkResult("features.calculate_moving_average", "cpp", 1_000, 0.010, 0.011, 3),
+        BenchmarkResult("features.calculate_moving_average", "python", 1_000, 0.020, 0.021, 3),
+        BenchmarkResult("cleaning.remove_outliers", "cpp", 1_000, 0.00001, 0.00001, 3),
+    ]
+    path = tmp_path / "baseline.json"
+    save_results(str(path), baseline)
+    assert json.loads(path.read_text())["results"][0]["throughput"] == pytest.approx(100_000)
+    assert load_results(str(path)) == baseline
+
+    current = [
+        BenchmarkResult("features.calculate_moving_average", "cpp", 1_000, 0.014, 0.014, 3),
+        BenchmarkResult("features.calculate_moving_average", "python", 1_000, 0.022, 0.022, 3),
+        # Below the noise floor and absent from the baseline: never flagged
+        BenchmarkResult("cleaning.remove_outliers", "cpp", 1_000, 0.001, 0.001, 3),
+        BenchmarkResult("cleaning.remove_outliers", "python", 1_000, 9.0, 9.0, 1),
+    ]
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+    assert [(r.kernel, r.backend) for r in regressions] == [("features.calculate_moving_average", "cpp")]
+    assert regressions[0].slowdown == pytest.approx(1.4)
+    assert compare_to_baseline(current, baseline, threshold=0.5) == []
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    kernel = "features.calculate_exponential_moving_average"
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+    argv = ["--sizes", "1e3", "--kernels", kernel, "--backends", "python", "--output", str(output)]
+    assert kernel_benchmarks.main(argv) == 0
+    assert [result.kernel for result in load_results(str(output))] == [kernel]
+
+    save_results(str(baseline), [BenchmarkResult(kernel, "python", 1_000, 0.001, 0.001, 3)])
+    monkeypatch.setattr(kernel_benchmarks, "_time", lambda run, min_repeats, min_seconds: [0.01])
+    assert kernel_benchmarks.main(argv + ["--baseline", str(baseline)]) == 1
+    assert kernel_benchmarks.main(argv + ["--baseline", str(baseline), "--threshold", "20"]) == 0
+
+
+def test_load_benchmarks_cover_each_sqlite_method():
+    from fraudshield.benchmarks.ingestion_benchmarks import run_load_benchmarks
+
+    results = run_load_benchmarks(rows=[200], chunksize=50)
+    assert [result.kernel for result in results] == ["ingest.executemany", "ingest.multi", "ingest.to_sql"]
+    assert {result.backend for result in results} == {"sqlite"}
+    with pytest.raises(ValueError):
+        run_load_benchmarks(rows=[200], methods=["bcp"])
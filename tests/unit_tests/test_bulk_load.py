@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+
+from fraudshield.data_ingestion import bulk_load
+from fraudshield.data_ingestion.bulk_load import bulk_insert, resolve_load_method, tune_sqlite
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "transaction_id": np.arange(7, dtype=np.int64),
+            "amount": [1.5, np.nan, 3.0, 4.25, 5.0, 6.0, 7.75],
+            "currency": ["USD", "EUR", None, "USD", "GBP", "EUR", "USD"],
+            "transaction_date": pd.date_range("2024-01-01", periods=7, freq="h"),
+        }
+    )
+
+
+@pytest.mark.parametrize("method", ["auto", "executemany", "multi", "to_sql"])
+def test_sqlite_methods_round_trip(tmp_path, frame, method):
+    engine = create_engine(f"sqlite:///{tmp_path / 'load.db'}")
+    tune_sqlite(engine)
+    with engine.begin() as conn:
+        assert bulk_insert(conn, frame, "fraud_data", if_exists="replace", method=method, chunksize=3) == len(frame)
+        bulk_insert(conn, frame.iloc[:2], "fraud_data", method=method, chunksize=3)
+
+    loaded = pd.read_sql_table("fraud_data", engine)
+    expected = pd.concat([frame, frame.iloc[:2]], ignore_index=True)
+    pd.testing.assert_frame_equal(loaded, expected)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_resolve_load_method():
+    assert resolve_load_method("postgresql") == "copy"
+    assert resolve_load_method("sqlite") == "executemany"
+    assert resolve_load_method("mysql") == "multi"
+    assert resolve_load_method("sqlite", "to_sql") == "to_sql"
+    with pytest.raises(ValueError, match="PostgreSQL"):
+        resolve_load_method("sqlite", "copy")
+    with pytest.raises(ValueError, match="Unsupported"):
+        resolve_load_method("sqlite", "bcp")
+
+
+def test_copy_streams_csv_through_copy_expert():
+    cursor = MagicMock()
+    conn = SimpleNamespace(dialect=postgresql.dialect(), connection=MagicMock())
+    conn.connection.cursor.return_value.__enter__.return_value = cursor
+    table = SimpleNamespace(name="fraud data", schema="public")
+
+    rows = bulk_load._copy_from_stdin(table, conn, ["id", "amount"], iter([(1, 2.5), (2, None)]))
+
+    assert rows == 2
+    sql, buffer = cursor.copy_expert.call_args.args
+    assert sql == 'COPY public."fraud data" (id, amount) FROM STDIN WITH (FORMAT csv)'
+    assert buffer.getvalue().splitlines() == ["1,2.5", "2,"]
+
+
+def test_methods_store_identical_datetime_text(tmp_path, frame):
+    typed = frame.assign(transaction_date=frame["transaction_date"].dt.tz_localize("UTC"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'dates.db'}")
+    stored = {}
+    for method in ["executemany", "multi", "to_sql"]:
+        with engine.begin() as conn:
+            bulk_insert(conn, typed, f"dates_{method}", if_exists="replace", method=method)
+            stored[method] = conn.exec_driver_sql(f"SELECT transaction_date FROM dates_{method}").scalars().all()
+
+    # A load resumed with another method must not mix text formats in one column
+    assert stored["executemany"] == stored["multi"] == stored["to_sql"]
+    assert stored["to_sql"][0] == "2024-01-01 00:00:00.000000"
+    for method in stored:
+        loaded = pd.read_sql_table(f"dates_{method}", engine)
+        pd.testing.assert_series_equal(loaded["transaction_date"], frame["transaction_date"])
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from fraudshield.data_preprocessing.data_preprocessing import preprocess_data
+from fraudshield.feature_engineering.dtypes import compact_dtypes, float32_if_safe
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    add_transaction_features,
+)
+
+
+def test_compact_dtypes_downcasts_and_reports_savings(make_transactions):
+    df = make_transactions(n=200, seed=3)
+    # Stored amounts are whole cents
+    df["amount"] = df["amount"].round(2)
+    df["huge"] = np.array([1e300] * len(df))
+    compact, saved = compact_dtypes(df, exclude=["fraud"])
+
+    assert compact["user_id"].dtype == np.int32
+    assert isinstance(compact["currency"].dtype, pd.CategoricalDtype)
+    assert compact["amount"].dtype == np.float32
+    assert compact["huge"].dtype == np.float64
+    assert compact["fraud"].dtype == df["fraud"].dtype
+    assert saved["currency"] > 0 and saved["user_id"] == 4 * len(df)
+    assert "huge" not in saved
+    np.testing.assert_allclose(compact["amount"].to_numpy(), df["amount"].to_numpy(), rtol=1e-6)
+
+    assert float32_if_safe(np.array([1.5, np.nan])).dtype == np.float32
+    assert float32_if_safe(np.array([1e-320])).dtype == np.float64
+
+
+def test_compact_dtypes_keeps_cents_of_large_amounts():
+    df = pd.DataFrame({"amount": [12.34, 250_000.01, 1_234_567.89], "score": [12.34, 250_000.01, 1_234_567.89]})
+    compact, _ = compact_dtypes(df)
+
+    # Same values: the relative check alone would downcast both columns
+    assert compact["score"].dtype == np.float32
+    assert compact["amount"].dtype == np.float64
+    assert compact["amount"].tolist() == df["amount"].tolist()
+    assert compact_dtypes(df.iloc[:1])[0]["amount"].dtype == np.float32
+
+
+def test_compact_features_match_full_precision(make_transactions):
+    df = make_transactions(n=200, seed=3)
+    config = TransactionFeatureConfig(windows=["1h", "24h"])
+    reference = add_transaction_features(df, config)
+    compact_input, _ = compact_dtypes(df, exclude=["fraud", "transaction_date"])
+    compact = add_transaction_features(compact_input, TransactionFeatureConfig(windows=["1h", "24h"], compact_dtypes=True))
+
+    feature_columns = [col for col in reference.columns if col not in df.columns]
+    assert all(compact[col].dtype == np.float32 for col in feature_columns)
+    for column in feature_columns:
+        np.testing.assert_allclose(
+            compact[column].to_numpy(np.float64), reference[column].to_numpy(), rtol=1e-5, atol=1e-6, err_msg=column
+        )
+
+
+def test_preprocess_data_compact_dtypes(make_transactions):
+    df = make_transactions(n=200, seed=3)
+    full = preprocess_data(df, feature_windows=["1h"])
+    compact = preprocess_data(df, feature_windows=["1h"], compact_dtypes=True)
+
+    assert compact[0].shape == full[0].shape
+    assert compact[5] == full[5]
@@ -0,0 +1,222 @@
+import numpy as np
+import pytest
+
+from fraudshield.data_cleaning import cpp_wrapper as cleaning
+from fraudshield.feature_engineering import cpp_wrapper as features
+
+
+@pytest.fixture(params=[True, False], ids=["cpp", "python"])
+def use_cpp(request, monkeypatch):
+    if request.param and not (cleaning.is_cpp_available() and features.is_cpp_available()):
+        pytest.skip("C++ modules not built")
+    monkeypatch.setattr(cleaning, "CPP_AVAILABLE", request.param)
+    monkeypatch.setattr(features, "CPP_AVAILABLE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_cleaning_reads_strided_input_and_keeps_dtype(use_cpp, dtype):
+    base = np.array([1.0, 9.0, np.nan, 9.0, 2.0, 9.0, 3.0, 9.0, np.nan, 9.0, 50.0, 9.0], dtype=dtype)
+    strided = base[::2]
+
+    kept = cleaning.remove_missing_values(strided)
+    assert kept.dtype == dtype
+    np.testing.assert_array_equal(kept, np.array([1.0, 2.0, 3.0, 50.0], dtype=dtype))
+
+    inliers = cleaning.remove_outliers(kept, threshold=1.0)
+    np.testing.assert_array_equal(inliers, np.array([1.0, 2.0, 3.0], dtype=dtype))
+
+
+def test_cleaning_writes_into_out(use_cpp):
+    data = np.array([4.0, np.nan, 5.0, np.nan, 6.0])
+    out = np.full(len(data), -1.0)
+
+    kept = cleaning.remove_missing_values(data, out=out)
+    np.testing.assert_array_equal(kept, [4.0, 5.0, 6.0])
+    assert np.shares_memory(kept, out)
+    np.testing.assert_array_equal(out[:3], [4.0, 5.0, 6.0])
+
+    # Compacting in place reuses the input buffer
+    in_place = cleaning.remove_missing_values(data, out=data)
+    assert np.shares_memory(in_place, data)
+    np.testing.assert_array_equal(in_place, [4.0, 5.0, 6.0])
+
+    with pytest.raises((TypeError, ValueError)):
+        cleaning.remove_outliers(np.ones(4), out=np.empty(4, dtype=np.float32))
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_indicators_accept_strided_input_and_out(use_cpp, dtype):
+    series = np.array([1.0, 3.0, 2.0, 5.0, 4.0, 6.0, 8.0, 7.0, 9.0, 10.0])
+    strided = np.repeat(series, 2).astype(dtype)[::2]
+    assert not strided.flags.c_contiguous
+
+    expected_ma = np.convolve(series, np.ones(3) / 3, mode="valid")
+    ma = features.calculate_moving_average(strided, 3)
+    assert ma.dtype == dtype
+    np.testing.assert_allclose(ma, expected_ma, rtol=1e-6)
+
+    out = np.empty(len(series), dtype=dtype)
+    ema = features.calculate_exponential_moving_average(strided, 0.5, out=out)
+    assert ema is out or np.shares_memory(ema, out)
+    assert out[0] == 1.0
+    np.testing.assert_allclose(out[1], 2.0)
+
+    rsi_out = np.empty(len(series) - 2, dtype=dtype)
+    rsi = features.calculate_relative_strength_index(strided, 3, out=rsi_out)
+    assert np.shares_memory(rsi, rsi_out)
+    assert np.all((rsi_out >= 0) & (rsi_out <= 100))
+
+
+def test_moving_average_rejects_out_overlapping_data(use_cpp):
+    data = np.arange(10, dtype=np.float64)
+    with pytest.raises(ValueError, match="overlap"):
+        features.calculate_moving_average(data, 3, out=data[:8])
+    np.testing.assert_array_equal(data, np.arange(10))
+
+
+def test_grouped_kernels_accept_float32_and_strided_values(use_cpp):
+    codes = np.array([0, 0, 0, 1, 1, 1], dtype=np.int64)
+    times = np.array([0, 5, 20, 0, 1, 2], dtype=np.int64)
+    values = np.array([1.0, 2.0, 4.0, 3.0, np.nan, 5.0])
+    strided = np.repeat(values, 2).astype(np.float32)[::2]
+
+    expected = features.grouped_expanding_stats(codes, values)
+    result = features.grouped_expanding_stats(codes, strided)
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-6, equal_nan=True)
+
+    expected = features.grouped_window_aggregates(codes, times, values, [10], ["count", "sum", "max"])
+    result = features.grouped_window_aggregates(codes, times, strided, [10], ["count", "sum", "max"])
+    assert sorted(result) == ["count", "max", "sum"]
+    for name in expected:
+        assert result[name].dtype == np.float64
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-6, equal_nan=True)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_summarize_outliers_matches_remove_outliers(use_cpp, dtype):
+    rng = np.random.default_rng(3)
+    data = rng.normal(100.0, 10.0, 500).astype(dtype)
+    data[[5, 50, 400]] = np.nan
+    data[[7, 300]] = [1000.0, -800.0]
+
+    summary = cleaning.summarize_outliers(data, threshold=4.0)
+    expected = cleaning.remove_outliers(cleaning.remove_missing_values(data), threshold=4.0)
+
+    assert summary.keep.dtype == np.bool_
+    np.testing.assert_array_equal(data[summary.keep], expected)
+    assert (summary.n_missing, summary.n_outliers) == (3, 2)
+    assert summary.median == pytest.approx(float(np.median(expected)), rel=1e-6)
+    valid = data[~np.isnan(data)].astype(np.float64)
+    assert summary.mean == pytest.approx(valid.mean(), rel=1e-9)
+    assert summary.std == pytest.approx(valid.std(ddof=1), rel=1e-9)
+    assert summary.lower == pytest.approx(summary.mean - 4.0 * summary.std)
+    assert summary.upper == pytest.approx(summary.mean + 4.0 * summary.std)
+
+
+def test_summarize_outliers_edge_cases(use_cpp):
+    constant = cleaning.summarize_outliers(np.array([2.0, 2.0, np.nan, 2.0]))
+    assert constant.keep.tolist() == [True, True, False, True]
+    assert (constant.lower, constant.upper, constant.median) == (-np.inf, np.inf, 2.0)
+
+    empty = cleaning.summarize_outliers(np.array([np.nan, np.nan]))
+    assert not empty.keep.any()
+    assert np.isnan(empty.median) and np.isnan(empty.mean)
+
+    out = np.zeros(4, dtype=bool)
+    summary = cleaning.summarize_outliers(np.array([1.0, 2.0, 3.0, 4.0]), out=out)
+    assert out.all() and np.shares_memory(summary.keep, out)
+    assert summary.median == 2.5
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_summarize_columns_matches_per_column_cleaning(use_cpp, order, dtype):
+    rng = np.random.default_rng(11)
+    matrix = rng.normal(0.0, 1.0, (400, 5))
+    matrix[[3, 90], 0] = [25.0, -30.0]
+    matrix[[10, 11, 12], 2] = np.nan
+    matrix[:, 3] = 7.0
+    matrix[:, 4] = np.nan
+    matrix = np.asarray(matrix, dtype=dtype, order=order)
+
+    summary = cleaning.summarize_columns(matrix, threshold=4.0, winsorize=True, n_jobs=3)
+    for j in range(matrix.shape[1]):
+        column = cleaning.summarize_outliers(matrix[:, j], threshold=4.0)
+        np.testing.assert_array_equal(summary.keep[:, j], column.keep)
+        assert summary.n_outliers[j] == column.n_outliers
+        assert summary.n_missing[j] == column.n_missing
+        np.testing.assert_allclose(
+            [summary.lower[j], summary.upper[j]], [column.lower, column.upper], rtol=1e-7, equal_nan=True
+        )
+    assert summary.n_outliers.tolist() == [2, 0, 0, 0, 0]
+
+    clipped = summary.values
+    assert clipped.dtype == dtype
+    np.testing.assert_allclose(clipped[[3, 90], 0], [summary.upper[0], summary.lower[0]], rtol=1e-6)
+    np.testing.assert_array_equal(np.isnan(clipped), np.isnan(matrix))
+    untouched = summary.keep
+    np.testing.assert_array_equal(clipped[untouched], matrix[untouched])
+
+
+def test_summarize_columns_mad_is_robust_and_clips_in_place(use_cpp):
+    matrix = np.array([[1.0, 10.0], [2.0, 11.0], [3.0, 12.0], [4.0, 13.0], [1000.0, 14.0]])
+    summary = cleaning.summarize_columns(matrix, threshold=3.0, method="mad", winsorize=True, out=matrix)
+
+    assert summary.median.tolist() == [3.0, 12.0]
+    assert summary.mad.tolist() == [1.0, 1.0]
+    assert summary.keep[:, 0].tolist() == [True, True, True, True, False]
+    assert np.shares_memory(summary.values, matrix)
+    assert matrix[4, 0] == pytest.approx(3.0 + 3.0 * 1.4826)
+    assert summary.n_outliers.tolist() == [1, 0]
+
+    with pytest.raises(ValueError):
+        cleaning.summarize_columns(matrix, method="iqr")
+
+
+def test_batch_apis_match_single_calls(use_cpp):
+    rng = np.random.default_rng(5)
+    arrays = [
+        rng.normal(50.0, 5.0, 300),
+        rng.normal(0.0, 1.0, 120).astype(np.float32),
+        np.repeat(rng.normal(size=40), 2)[::2],
+    ]
+    arrays[0][[3, 30]] = [np.nan, 400.0]
+
+    summaries = cleaning.summarize_outliers_batch(arrays, threshold=3.0, n_jobs=2)
+    for data, summary in zip(arrays, summaries):
+        expected = cleaning.summarize_outliers(data, threshold=3.0)
+        np.testing.assert_array_equal(summary.keep, expected.keep)
+        assert (summary.n_missing, summary.n_outliers) == (expected.n_missing, expected.n_outliers)
+        assert summary.median == pytest.approx(expected.median)
+
+    kernels = [
+        (features.calculate_moving_average_batch, features.calculate_moving_average, 5),
+        (features.calculate_exponential_moving_average_batch, features.calculate_exponential_moving_average, 0.2),
+        (features.calculate_relative_strength_index_batch, features.calculate_relative_strength_index, 7),
+    ]
+    for batch, single, param in kernels:
+        results = batch(arrays[1:], param, n_jobs=2)
+        assert len(results) == 2
+        for data, result in zip(arrays[1:], results):
+            expected = single(data, param)
+            assert result.dtype == expected.dtype
+            np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+
+def test_kernels_run_concurrently_from_threads(use_cpp):
+    from concurrent.futures import ThreadPoolExecutor
+
+    rng = np.random.default_rng(8)
+    arrays = [rng.normal(size=20_000) for _ in range(16)]
+
+    def work(data):
+        return (
+            cleaning.summarize_outliers(data, threshold=2.5).n_outliers,
+            features.calculate_exponential_moving_average(data, 0.1)[-1],
+        )
+
+    expected = [work(data) for data in arrays]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(work, arrays)) == expected
@@ -3,7 +3,11 @@
 import os
 import pandas as pd
 import pytest
+from fraudshield.data_ingestion import sinks
+from fraudshield.data_ingestion.columnar import read_ingested_data, row_groups_in_range
 from fraudshield.data_ingestion.data_ingestion import DataIngestion
+from fraudshield.data_ingestion.schema import IngestionSchema
+from fraudshield.feature_engineering.transaction_features import _ensure_datetime
 
 
 def test_read_csv_valid_file(tmpdir):
@@ -48,3 +52,160 @@ def test_read_csv_empty_file(tmpdir):
     # Call the read_csv_file method with the empty file
     with pytest.raises(ValueError, match="Empty data file"):
         data_ingestion.read_csv_file(temp_file.basename)
+
+
+def _row_ids(db_url, table):
+    from sqlalchemy import create_engine
+
+    return pd.read_sql_table(table, create_engine(db_url))["row_id"].tolist()
+
+
+def test_stream_to_database_writes_every_chunk(tmpdir):
+    pd.DataFrame({"row_id": range(25), "amount": [float(i) for i in range(25)]}).to_csv(
+        tmpdir.join("data.csv"), index=False
+    )
+    db_url = f"sqlite:///{tmpdir.join('stream.db')}"
+    data_ingestion = DataIngestion(str(tmpdir), db_url)
+
+    chunks = list(data_ingestion.read_csv_chunks("data.csv", chunk_size=10, skip_rows=5))
+    assert [len(chunk) for chunk in chunks] == [10, 10]
+    assert chunks[0]["row_id"].iloc[0] == 5
+
+    written = data_ingestion.stream_to_database("data.csv", "fraud_data", chunk_size=4, commit_every=2)
+    assert written == 25
+    assert _row_ids(db_url, "fraud_data") == list(range(25))
+    assert data_ingestion.committed_rows("data.csv", "fraud_data") == 0
+
+
+def test_stream_to_database_resumes_after_failure(tmpdir, monkeypatch):
+    pd.DataFrame({"row_id": range(30), "amount": [1.5] * 30}).to_csv(tmpdir.join("data.csv"), index=False)
+    db_url = f"sqlite:///{tmpdir.join('stream.db')}"
+    data_ingestion = DataIngestion(str(tmpdir), db_url)
+
+    original = sinks.bulk_insert
+    calls = []
+
+    def failing_write(conn, dataframe, *args, **kwargs):
+        calls.append(len(dataframe))
+        if len(calls) == 4:
+            raise RuntimeError("connection lost")
+        return original(conn, dataframe, *args, **kwargs)
+
+    monkeypatch.setattr(sinks, "bulk_insert", failing_write)
+    with pytest.raises(ValueError, match="connection lost"):
+        data_ingestion.run_ingestion_pipeline(
+            "data.csv", "fraud_data", if_exists="replace", stream=True, chunk_size=5, commit_every=2
+        )
+    # The open transaction (chunks 3 and 4) rolled back; chunks 1 and 2 are durable
+    assert data_ingestion.committed_rows("data.csv", "fraud_data") == 10
+    assert _row_ids(db_url, "fraud_data") == list(range(10))
+
+    monkeypatch.undo()
+    data_ingestion.run_ingestion_pipeline(
+        "data.csv", "fraud_data", if_exists="replace", stream=True, chunk_size=5, commit_every=2
+    )
+    assert _row_ids(db_url, "fraud_data") == list(range(30))
+    assert data_ingestion.committed_rows("data.csv", "fraud_data") == 0
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_one_parse_feeds_every_sink(tmpdir, monkeypatch, stream):
+    frame = pd.DataFrame({"row_id": range(12), "currency": ["USD", "EUR", "GBP"] * 4})
+    frame.to_csv(tmpdir.join("data.csv"), index=False)
+    db_url = f"sqlite:///{tmpdir.join('fanout.db')}"
+    output_file = tmpdir.join("processed", "ingested.csv")
+
+    read_csv = pd.read_csv
+    parses = []
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: parses.append(args[0]) or read_csv(*args, **kwargs))
+
+    collected = sinks.FrameSink()
+    DataIngestion(str(tmpdir), db_url).run_ingestion_pipeline(
+        "data.csv", "fraud_data", stream=stream, chunk_size=5, output_file=str(output_file), sinks=[collected]
+    )
+
+    assert len(parses) == 1
+    assert _row_ids(db_url, "fraud_data") == list(range(12))
+    pd.testing.assert_frame_equal(read_csv(str(output_file)), frame)
+    # The transaction schema parses currency as a categorical in both modes
+    pd.testing.assert_frame_equal(collected.frame, frame.astype({"currency": "category"}))
+    assert not os.path.exists(str(output_file) + ".partial")
+
+
+def test_parquet_output_prunes_row_groups_by_date(tmpdir):
+    frame = pd.DataFrame(
+        {
+            "row_id": range(30),
+            "amount": [float(i) for i in range(30)],
+            "transaction_date": pd.date_range("2024-01-01", periods=30, freq="D").strftime("%Y-%m-%d"),
+        }
+    )
+    frame.to_csv(tmpdir.join("data.csv"), index=False)
+    parquet_file = str(tmpdir.join("processed", "ingested.parquet"))
+
+    data_ingestion = DataIngestion(str(tmpdir), f"sqlite:///{tmpdir.join('unused.db')}")
+    data_ingestion.ingest("data.csv", [sinks.ParquetSink(parquet_file, row_group_size=10)], chunk_size=10)
+    assert not os.path.exists(parquet_file + ".partial")
+
+    # Thirty daily rows in groups of ten: 2024-01-15..2024-01-24 touches the second and third groups only
+    assert row_groups_in_range(parquet_file, start="2024-01-15", end="2024-01-25") == [1, 2]
+    subset = read_ingested_data(parquet_file, columns=["row_id"], start="2024-01-15", end="2024-01-25")
+    assert list(subset.columns) == ["row_id"]
+    assert subset["row_id"].tolist() == list(range(14, 24))
+
+    full = read_ingested_data(parquet_file)
+    assert pd.api.types.is_datetime64_any_dtype(full["transaction_date"])
+    pd.testing.assert_frame_equal(full.drop(columns="transaction_date"), frame.drop(columns="transaction_date"))
+
+    # CSV output reads back to the same rows
+    csv_file = str(tmpdir.join("processed", "ingested.csv"))
+    data_ingestion.save_ingested_data("data.csv", csv_file)
+    pd.testing.assert_frame_equal(
+        read_ingested_data(csv_file, columns=["row_id"], start="2024-01-15", end="2024-01-25"), subset
+    )
+
+
+def test_schema_types_columns_once_in_both_read_modes(tmpdir):
+    tmpdir.join("data.csv").write(
+        "user_id,amount,currency,transaction_date,note\n"
+        "7,1.5,EUR,01/03/2024 09:30,a\n"
+        ",2.0,USD,01/03/2024 10:00,b\n"
+        "9,,EUR,not a date,c\n"
+    )
+    schema = IngestionSchema.from_dict(
+        {
+            "dtypes": {"user_id": "Int64", "amount": "float64", "missing_column": "Int32"},
+            "categorical": ["currency"],
+            "datetime_columns": ["transaction_date"],
+            "datetime_format": "%d/%m/%Y %H:%M",
+            "timezone": "Europe/Paris",
+        }
+    )
+    data_ingestion = DataIngestion(str(tmpdir), "sqlite:///:memory:", schema=schema)
+
+    whole = data_ingestion.read_csv_file("data.csv")
+    streamed = pd.concat(list(data_ingestion.read_csv_chunks("data.csv", chunk_size=2)))
+    for frame in (whole, streamed):
+        assert str(frame["user_id"].dtype) == "Int64"
+        assert frame["user_id"].isna().tolist() == [False, True, False]
+        assert str(frame["transaction_date"].dtype) == "datetime64[ns, UTC]"
+        assert frame["transaction_date"].iloc[0] == pd.Timestamp("2024-03-01 08:30", tz="UTC")
+        assert pd.isna(frame["transaction_date"].iloc[2])
+        assert frame["note"].tolist() == ["a", "b", "c"]
+    assert isinstance(whole["currency"].dtype, pd.CategoricalDtype)
+    # Feature engineering takes the typed column as is instead of parsing it again
+    assert _ensure_datetime(whole["transaction_date"]) is whole["transaction_date"]
+
+    tmpdir.join("bad.csv").write("user_id,amount\nseven,1.0\n")
+    with pytest.raises(ValueError, match="does not match the ingestion schema"):
+        data_ingestion.read_csv_file("bad.csv")
+    with pytest.raises(ValueError, match="Unknown schema fields"):
+        IngestionSchema.from_dict({"dtype": {}})
+
+
+def test_sink_without_write_cannot_be_constructed():
+    class Incomplete(sinks.IngestionSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
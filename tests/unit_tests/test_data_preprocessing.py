@@ -28,3 +28,37 @@ def test_preprocess_data():
     # Ensure target values are preserved
     assert set(y_train).issubset({0, 1})
     assert set(y_test).issubset({0, 1})
+
+
+def test_preprocess_data_winsorizes_numeric_columns():
+    data = pd.DataFrame(
+        {
+            "numeric_feature": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0] * 4,
+            "count_feature": list(range(39)) + [10_000],
+            "fraud": [0, 1] * 20,
+        }
+    )
+    baseline = preprocess_data(data, random_state=0)
+    X_train, X_test, _, _, preprocessor, feature_names = preprocess_data(
+        data, random_state=0, winsorize_numeric="mad", winsorize_threshold=3.0
+    )
+
+    column = feature_names.index("num__count_feature")
+    assert max(X_train[:, column].max(), X_test[:, column].max()) < max(
+        baseline[0][:, column].max(), baseline[1][:, column].max()
+    )
+    # Columns without outliers come out exactly as before
+    other = feature_names.index("num__numeric_feature")
+    assert (X_train[:, other] == baseline[0][:, other]).all()
+
+
+def test_preprocess_data_winsorizes_nullable_integer_columns():
+    counts = pd.array(list(range(38)) + [pd.NA, 10_000], dtype="Int64")
+    data = pd.DataFrame({"count_feature": counts, "amount": [float(i % 7) for i in range(40)], "fraud": [0, 1] * 20})
+
+    X_train, X_test, _, _, _, feature_names = preprocess_data(data, random_state=0, winsorize_numeric="mad")
+
+    column = feature_names.index("num__count_feature")
+    baseline = preprocess_data(data.astype({"count_feature": "float64"}), random_state=0, winsorize_numeric="mad")
+    assert (X_train[:, column] == baseline[0][:, column]).all()
+    assert (X_test[:, column] == baseline[1][:, column]).all()
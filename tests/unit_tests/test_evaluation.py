@@ -1,9 +1,11 @@
 import unittest
+import joblib
 import numpy as np
 import pandas as pd
 import tempfile
 from pathlib import Path
-from fraudshield.model_evaluation.evaluation import ModelEvaluation
+from sklearn.dummy import DummyClassifier
+from fraudshield.model_evaluation.evaluation import ModelEvaluation, evaluate_and_save
 
 
 class TestModelEvaluation(unittest.TestCase):
@@ -29,6 +31,37 @@ class TestModelEvaluation(unittest.TestCase):
             save_path = Path(tmpdir) / "confusion_matrix.png"
             evaluation.plot_confusion_matrix(normalize=True, save_path=save_path)
 
+    def test_plot_confusion_matrix_lightweight_renderer(self):
+        evaluation = ModelEvaluation(self.y_true, self.y_pred)
+        np.testing.assert_array_equal(evaluation.compute_confusion_matrix(), [[4, 1], [2, 3]])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            save_path = Path(tmpdir) / "plots" / "confusion_matrix.png"
+            evaluation.plot_confusion_matrix(save_path=save_path, renderer="matplotlib", dpi=50)
+            self.assertTrue(save_path.exists())
+        with self.assertRaises(ValueError):
+            evaluation.plot_confusion_matrix(save_path="unused.png", renderer="plotly")
+
+    def test_evaluate_and_save_metrics_only(self):
+        X = np.arange(20, dtype=float).reshape(10, 2)
+        test_data = np.column_stack([X, self.y_true])
+        model = DummyClassifier(strategy="most_frequent").fit(X, self.y_true)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = Path(tmpdir) / "model.pkl"
+            data_path = Path(tmpdir) / "test_data.npy"
+            cm_path = Path(tmpdir) / "confusion_matrix.png"
+            joblib.dump(model, model_path)
+            np.save(data_path, test_data)
+
+            evaluate_and_save(
+                str(model_path),
+                str(data_path),
+                str(Path(tmpdir) / "report.csv"),
+                confusion_matrix_path=str(cm_path),
+                metrics_only=True,
+            )
+            self.assertTrue((Path(tmpdir) / "report.csv").exists())
+            self.assertFalse(cm_path.exists())
+
     def test_generate_report(self):
         evaluation = ModelEvaluation(self.y_true, self.y_pred, self.y_prob)
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from fraudshield.feature_engineering import feature_cache
+from fraudshield.feature_engineering.feature_cache import (
+    FeatureCache,
+    add_transaction_features_cached,
+    fingerprint_config,
+    fingerprint_frame,
+)
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    add_transaction_features,
+)
+
+
+def test_fingerprints_track_data_and_config(make_transactions):
+    df = make_transactions(n=150, seed=9)
+    changed = df.copy()
+    changed.loc[3, "amount"] += 1.0
+
+    assert fingerprint_frame(df) == fingerprint_frame(df.copy())
+    assert fingerprint_frame(df) != fingerprint_frame(changed)
+    assert fingerprint_config(TransactionFeatureConfig()) == fingerprint_config(TransactionFeatureConfig(n_jobs=4))
+    assert fingerprint_config(TransactionFeatureConfig()) != fingerprint_config(TransactionFeatureConfig(windows=["1h"]))
+
+
+def test_cache_hit_skips_feature_computation(tmp_path, monkeypatch, make_transactions):
+    df = make_transactions(n=150, seed=9)
+    config = TransactionFeatureConfig(windows=["1h", "24h"])
+    cache = FeatureCache(str(tmp_path))
+    expected = add_transaction_features(df, config)
+
+    first = add_transaction_features_cached(df, config, cache)
+    pd.testing.assert_frame_equal(first, expected)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("features recomputed on a cache hit")
+
+    monkeypatch.setattr(feature_cache, "compute_transaction_features", fail)
+    second = add_transaction_features_cached(df, config, cache)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = FeatureCache(str(tmp_path), max_bytes=10**9)
+    column = {"feature": np.zeros(1000)}
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, column)
+        os.utime(tmp_path / f"{key}.npz", (i, i))
+    # Reading "a" makes it the most recently used entry
+    assert cache.get("a") is not None
+
+    cache.max_bytes = 2 * (tmp_path / "a.npz").stat().st_size
+    cache.put("d", column)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.npz")) == ["a", "d"]
+    assert cache.get("b") is None
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fraudshield.data_preprocessing.data_preprocessing import preprocess_data
+from fraudshield.feature_engineering.checkpoint import (
+    add_transaction_features_incremental,
+    load_feature_checkpoint,
+    save_feature_checkpoint,
+)
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    add_transaction_features,
+)
+
+
+def test_incremental_features_match_full_history(tmp_path, make_transactions):
+    df = make_transactions(n=400, seed=11)
+    config = TransactionFeatureConfig(windows=["1h", "24h"])
+    batch = add_transaction_features(df, config).set_index("transaction_id")
+
+    checkpoint = None
+    chunks = []
+    for chunk in np.array_split(df, 5):
+        featured, checkpoint = add_transaction_features_incremental(chunk, config, checkpoint)
+        chunks.append(featured)
+        # Round-trip through disk like a daily run would
+        save_feature_checkpoint(checkpoint, str(tmp_path / "checkpoint.joblib"))
+        checkpoint = load_feature_checkpoint(str(tmp_path / "checkpoint.joblib"))
+    incremental = pd.concat(chunks).set_index("transaction_id")
+
+    assert checkpoint.n_rows == len(df)
+    assert len(checkpoint.tail) < len(df)
+    feature_columns = [col for col in batch.columns if col not in df.columns]
+    assert set(feature_columns) <= set(incremental.columns)
+    for column in feature_columns:
+        np.testing.assert_allclose(
+            incremental[column].to_numpy(), batch.loc[incremental.index, column].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=column
+        )
+
+
+def test_incremental_features_reject_late_rows_and_window_changes(make_transactions):
+    df = make_transactions(n=100, seed=11)
+    config = TransactionFeatureConfig(windows=["1h"])
+    _, checkpoint = add_transaction_features_incremental(df.iloc[50:], config)
+
+    with pytest.raises(ValueError):
+        add_transaction_features_incremental(df.iloc[:10], config, checkpoint)
+    with pytest.raises(ValueError):
+        add_transaction_features_incremental(df.iloc[50:], TransactionFeatureConfig(windows=["24h"]), checkpoint)
+
+
+def test_preprocess_data_with_feature_state_dir(tmp_path, monkeypatch, make_transactions):
+    from fraudshield.data_preprocessing import data_preprocessing
+
+    df = make_transactions(n=400, seed=11)
+    config = TransactionFeatureConfig(windows=["1h"])
+    state_dir = tmp_path / "feature_state"
+    full = preprocess_data(df, feature_windows=["1h"])
+
+    captured = []
+    featurize = data_preprocessing._add_transaction_features_from_state
+    monkeypatch.setattr(
+        data_preprocessing,
+        "_add_transaction_features_from_state",
+        lambda *args: captured.append(featurize(*args)) or captured[-1],
+    )
+    preprocess_data(df.iloc[:250], feature_windows=["1h"], feature_state_dir=str(state_dir))
+    # Later days pass only their new rows; each run adds one history partition
+    preprocess_data(df.iloc[250:330], feature_windows=["1h"], feature_state_dir=str(state_dir))
+    assert len(captured[-1]) == 80
+    # A partition written by a run that crashed before saving its checkpoint is discarded
+    partitions = sorted((state_dir / "featured_history").glob("part-*.parquet"))
+    stale = partitions[-1].with_name(f"part-{10**19:020d}.parquet")
+    stale.write_bytes(partitions[-1].read_bytes())
+    resumed = preprocess_data(df, feature_windows=["1h"], feature_state_dir=str(state_dir))
+
+    assert not stale.exists()
+    assert len(list((state_dir / "featured_history").glob("part-*.parquet"))) == 3
+    assert resumed[0].shape == full[0].shape
+    assert resumed[1].shape == full[1].shape
+    assert resumed[5] == full[5]
+
+    reference = add_transaction_features(df, config).set_index("transaction_id")
+    featured = captured[-1].set_index("transaction_id")
+    assert sorted(featured.index) == sorted(reference.index)
+    feature_columns = [col for col in reference.columns if col not in df.columns]
+    for column in feature_columns:
+        np.testing.assert_allclose(
+            featured[column].to_numpy(), reference.loc[featured.index, column].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=column
+        )
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from fraudshield.feature_engineering import cpp_wrapper
+
+
+def _reference_ema(data, alpha):
+    # Element-by-element recurrence, as in feature_engineering.cpp
+    ema = np.empty(len(data))
+    ema[0] = data[0]
+    for i in range(1, len(data)):
+        ema[i] = alpha * data[i] + (1 - alpha) * ema[i - 1]
+    return ema
+
+
+def _reference_rsi(data, window_size):
+    gain_sum = loss_sum = 0.0
+    for i in range(1, window_size):
+        diff = data[i] - data[i - 1]
+        if diff > 0:
+            gain_sum += diff
+        else:
+            loss_sum -= diff
+    avg_gain, avg_loss = gain_sum / window_size, loss_sum / window_size
+    rsi = [100.0 - 100.0 / (1.0 + (np.inf if avg_loss == 0 else avg_gain / avg_loss))]
+    for i in range(window_size, len(data)):
+        diff = data[i] - data[i - 1]
+        avg_gain = (avg_gain * (window_size - 1) + (diff if diff > 0 else 0.0)) / window_size
+        avg_loss = (avg_loss * (window_size - 1) + (-diff if diff < 0 else 0.0)) / window_size
+        rsi.append(100.0 - 100.0 / (1.0 + (np.inf if avg_loss == 0 else avg_gain / avg_loss)))
+    return np.array(rsi)
+
+
+def _series(kind, n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    if kind == "walk":
+        return 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+    if kind == "rising":
+        return np.arange(n, dtype=np.float64)
+    if kind == "flat":
+        return np.full(n, 42.0)
+    return np.round(rng.gamma(2.0, 50.0, n), 2)
+
+
+def _backends():
+    backends = [False]
+    if cpp_wrapper.is_cpp_available():
+        backends.append(True)
+    return backends
+
+
+@pytest.fixture(params=_backends(), ids=lambda cpp: "cpp" if cpp else "python")
+def backend(request, monkeypatch):
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("kind", ["walk", "rising", "flat", "amounts"])
+@pytest.mark.parametrize("alpha", [0.0, 0.05, 0.5, 1.0])
+def test_ema_matches_reference(backend, kind, alpha):
+    data = _series(kind)
+    np.testing.assert_allclose(
+        cpp_wrapper.calculate_exponential_moving_average(data, alpha), _reference_ema(data, alpha), rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize("kind", ["walk", "rising", "flat", "amounts"])
+@pytest.mark.parametrize("window_size", [2, 3, 14, 500])
+def test_rsi_matches_reference(backend, kind, window_size):
+    data = _series(kind)
+    np.testing.assert_allclose(
+        cpp_wrapper.calculate_relative_strength_index(data, window_size),
+        _reference_rsi(data, window_size),
+        rtol=1e-10,
+        atol=1e-10,
+    )
+
+
+def test_fallbacks_match_cpp_on_float32_and_nan(monkeypatch):
+    if not cpp_wrapper.is_cpp_available():
+        pytest.skip("C++ feature engineering module not built")
+    data = _series("walk", n=2_000, seed=5).astype(np.float32)
+    data[[10, 1_500]] = np.nan
+
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", True)
+    native = (
+        cpp_wrapper.calculate_exponential_moving_average(data, 0.2),
+        cpp_wrapper.calculate_relative_strength_index(data, 14),
+    )
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", False)
+    fallback = (
+        cpp_wrapper.calculate_exponential_moving_average(data, 0.2),
+        cpp_wrapper.calculate_relative_strength_index(data, 14),
+    )
+    for expected, actual in zip(native, fallback):
+        assert actual.dtype == expected.dtype == np.float32
+        np.testing.assert_allclose(actual, expected, rtol=1e-6, equal_nan=True)
+
+
+def test_fallbacks_validate_like_cpp(backend):
+    data = _series("walk", n=10)
+    with pytest.raises(ValueError):
+        cpp_wrapper.calculate_exponential_moving_average(data, 1.5)
+    for window_size in (0, 1, 11):
+        with pytest.raises(ValueError):
+            cpp_wrapper.calculate_relative_strength_index(data, window_size)
+    assert len(cpp_wrapper.calculate_exponential_moving_average(np.empty(0), 0.5)) == 0
+
+
+def _carry_per_segment(data, offsets, indicator, min_values):
+    # Apply the single-series indicator to each segment's non-NaN values, then carry over NaN rows
+    expected = np.full(len(data), np.nan)
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        rows = start + np.flatnonzero(~np.isnan(data[start:end]))
+        if len(rows) >= min_values:
+            expected[rows[min_values - 1:]] = indicator(data[rows])
+        for i in range(start + 1, end):
+            if np.isnan(data[i]):
+                expected[i] = expected[i - 1]
+    return expected
+
+
+def test_segmented_indicators_match_per_segment_calls(backend):
+    rng = np.random.default_rng(9)
+    lengths = np.array([0, 1, 3, 20, 0, 57, 2, 130, 16])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    data = 100.0 + np.cumsum(rng.normal(0.0, 2.0, offsets[-1]))
+    data[rng.choice(len(data), 25, replace=False)] = np.nan
+
+    ma = cpp_wrapper.segmented_moving_average(data, offsets, 4)
+    expected = _carry_per_segment(data, offsets, lambda x: np.convolve(x, np.ones(4) / 4, mode="valid"), 4)
+    np.testing.assert_allclose(ma, expected, rtol=1e-10, equal_nan=True)
+
+    ema = cpp_wrapper.segmented_exponential_moving_average(data, offsets, 0.3)
+    expected = _carry_per_segment(data, offsets, lambda x: _reference_ema(x, 0.3), 1)
+    np.testing.assert_allclose(ema, expected, rtol=1e-12, equal_nan=True)
+
+    out = np.empty(len(data))
+    rsi = cpp_wrapper.segmented_relative_strength_index(data, offsets, 5, out=out)
+    assert np.shares_memory(rsi, out)
+    expected = _carry_per_segment(data, offsets, lambda x: _reference_rsi(x, 5), 5)
+    np.testing.assert_allclose(rsi, expected, rtol=1e-10, atol=1e-10, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        cpp_wrapper.segmented_moving_average(data, offsets[:-1], 4)
+    with pytest.raises(ValueError):
+        cpp_wrapper.segmented_relative_strength_index(data, offsets, 1)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fraudshield.feature_engineering.online_state import OnlineFeatureState
+from fraudshield.feature_engineering.transaction_features import (
+    TransactionFeatureConfig,
+    add_transaction_features,
+)
+
+
+def test_online_state_matches_batch_features(make_transactions):
+    df = make_transactions()
+    config = TransactionFeatureConfig(windows=["1h", "24h"])
+    batch = add_transaction_features(df, config).set_index("transaction_id")
+
+    state = OnlineFeatureState(config)
+    online = pd.concat([state.update_batch(chunk) for chunk in np.array_split(df, 7)])
+    online.index = df["transaction_id"]
+
+    feature_columns = [col for col in batch.columns if col not in df.columns]
+    assert list(online.columns) == feature_columns
+    for column in feature_columns:
+        np.testing.assert_allclose(
+            online[column].to_numpy(), batch.loc[online.index, column].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=column
+        )
+
+
+def test_online_state_single_transaction_and_ordering():
+    config = TransactionFeatureConfig(windows=["1h"])
+    state = OnlineFeatureState(config)
+    first = state.update({"user_id": 1, "transaction_date": "2024-01-01 00:00:00", "amount": 10.0})
+    assert np.isnan(first["user_txn_count_1h"])
+
+    second = state.update({"user_id": 1, "transaction_date": "2024-01-01 00:30:00", "amount": 20.0})
+    assert second["user_txn_count_1h"] == 1
+    assert second["user_amount_sum_1h"] == 10.0
+    assert second["user_time_since_last_txn"] == 1800.0
+
+    # Events past the longest window expire from the ring buffer
+    state.expire("2024-01-01 02:00:00")
+    assert not state._windows_state["user_id"]
+
+    with pytest.raises(ValueError):
+        state.update({"user_id": 1, "transaction_date": "2023-12-31 23:00:00", "amount": 5.0})
+
+
+def test_online_state_compute_leaves_state_untouched():
+    config = TransactionFeatureConfig(windows=["1h"])
+    rows = [
+        {"user_id": 1, "transaction_date": "2024-01-01 00:00:00", "amount": 10.0},
+        {"user_id": 1, "transaction_date": "2024-01-01 00:10:00", "amount": 30.0},
+        {"user_id": 1, "transaction_date": "2024-01-01 00:20:00", "amount": 5.0},
+    ]
+    state = OnlineFeatureState(config)
+    state.update(rows[0])
+    # Scoring a later transaction without ingesting it must not expire the 00:00 event
+    scored = state.compute({"user_id": 1, "transaction_date": "2024-01-01 05:00:00", "amount": 1.0})
+    assert np.isnan(scored["user_amount_sum_1h"])
+    state.update(rows[1])
+    online = state.compute(rows[2])
+
+    batch = add_transaction_features(pd.DataFrame(rows), config).iloc[-1]
+    assert online["user_txn_count_1h"] == batch["user_txn_count_1h"] == 2
+    for name, value in online.items():
+        np.testing.assert_allclose(value, batch[name], err_msg=name)
+    # The advancing path used by update agrees with the read-only scan
+    updated = state.update(rows[2])
+    np.testing.assert_allclose(list(updated.values()), list(online.values()))
+
+
+def test_online_state_respects_feature_selection(make_transactions):
+    df = make_transactions(n=120)
+    config = TransactionFeatureConfig(windows=["1h"], families=["merchant"], aggregates=["mean"])
+    batch = add_transaction_features(df, config)
+
+    state = OnlineFeatureState(config)
+    online = state.update_batch(df)
+
+    assert list(online.columns) == ["merchant_time_since_last_txn", "merchant_amount_mean_1h", "merchant_fraud_rate_1h"]
+    for column in online.columns:
+        np.testing.assert_allclose(online[column].to_numpy(), batch[column].to_numpy(), rtol=1e-9, err_msg=column)
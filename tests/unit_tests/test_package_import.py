@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+HEAVY = ["airflow", "matplotlib", "seaborn", "sklearn", "xgboost", "pandas", "sqlalchemy"]
+
+
+def _import_in_subprocess(statement):
+    """Run ``statement`` in a fresh interpreter; return the heavy modules it loaded and AIRFLOW_HOME."""
+    script = (
+        f"import json, os, sys\n{statement}\n"
+        f"print(json.dumps([sorted(m for m in {HEAVY!r} if m in sys.modules), os.environ.get('AIRFLOW_HOME')]))"
+    )
+    env = {key: value for key, value in os.environ.items() if not key.startswith("AIRFLOW")}
+    env["PYTHONPATH"] = os.pathsep.join([str(SRC), env.get("PYTHONPATH", "")])
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_package_import_is_lazy():
+    loaded, airflow_home = _import_in_subprocess("import fraudshield")
+    assert loaded == []
+    assert airflow_home is None
+
+
+@pytest.mark.parametrize(
+    "statement, absent",
+    [
+        ("import fraudshield.model_training.train_models", ["xgboost", "airflow"]),
+        ("import fraudshield.model_evaluation.evaluation", ["matplotlib", "seaborn", "xgboost", "airflow"]),
+        ("import fraudshield.data_pipeline.pipeline_tasks", ["sklearn", "xgboost", "matplotlib", "airflow"]),
+    ],
+)
+def test_modules_defer_heavy_dependencies(statement, absent):
+    loaded, _ = _import_in_subprocess(statement)
+    assert not set(loaded) & set(absent)
+
+
+def test_subpackages_load_on_attribute_access():
+    import fraudshield
+
+    assert "feature_engineering" in dir(fraudshield)
+    assert fraudshield.feature_engineering.TransactionFeatureConfig is not None
+    with pytest.raises(AttributeError):
+        fraudshield.not_a_module
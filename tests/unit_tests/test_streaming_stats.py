@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fraudshield.data_cleaning.streaming_stats import (
+    ColumnStatistics,
+    QuantileSketch,
+    RunningMoments,
+    fit_column_statistics,
+    merge_column_statistics,
+)
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def _rank_error(values, estimates, quantiles):
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    return np.abs(ranks - np.asarray(quantiles)).max()
+
+
+def test_running_moments_merge_matches_full_column():
+    rng = np.random.default_rng(0)
+    values = rng.normal(1e6, 3.0, 10_000)
+    values[::97] = np.nan
+
+    parts = [RunningMoments().update(chunk) for chunk in np.array_split(values, 7)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    finite = values[~np.isnan(values)]
+    assert merged.count == len(finite)
+    assert merged.mean == pytest.approx(finite.mean(), rel=1e-12)
+    assert merged.std == pytest.approx(finite.std(ddof=1), rel=1e-9)
+    assert (merged.minimum, merged.maximum) == (finite.min(), finite.max())
+    assert np.isnan(RunningMoments().update([5.0]).std)
+
+
+def test_quantile_sketch_is_accurate_bounded_and_mergeable():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(3.0, 1.0, 400_000)
+
+    sketch = QuantileSketch(k=200, seed=0)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert len(sketch) < 3 * 200
+    assert _rank_error(values, sketch.quantile(QUANTILES), QUANTILES) < 0.015
+
+    parts = [QuantileSketch(k=200, seed=i).update(chunk) for i, chunk in enumerate(np.array_split(values, 6))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.n == len(values)
+    assert len(merged) < 3 * 200
+    assert _rank_error(values, merged.quantile(QUANTILES), QUANTILES) < 0.015
+
+    small = QuantileSketch().update([3.0, 1.0, np.nan, 2.0])
+    assert small.quantile(0.5) == 2.0
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_fit_column_statistics_over_chunks():
+    rng = np.random.default_rng(2)
+    frame = pd.DataFrame({"amount": rng.normal(100.0, 10.0, 50_000), "label": ["x"] * 50_000})
+    frame.loc[::50, "amount"] = np.nan
+    frame.loc[7, "amount"] = 10_000.0
+
+    chunks = [frame.iloc[i:i + 5_000] for i in range(0, len(frame), 5_000)]
+    stats = merge_column_statistics(fit_column_statistics(chunks[:4]), fit_column_statistics(chunks[4:]))
+    assert list(stats) == ["amount"]
+    amount = stats["amount"]
+    assert isinstance(amount, ColumnStatistics)
+    assert amount.n_missing == 1_000
+
+    finite = frame["amount"].dropna()
+    assert amount.median == pytest.approx(finite.median(), abs=0.5)
+    lower, upper = amount.bounds("zscore", threshold=4.0)
+    assert lower == pytest.approx(finite.mean() - 4.0 * finite.std(), rel=1e-9)
+    q_lower, q_upper = amount.bounds("quantile", quantiles=(0.01, 0.99))
+    assert _rank_error(finite.to_numpy(), [q_lower, q_upper], [0.01, 0.99]) < 0.015
+
+    clipped = amount.winsorize(frame["amount"], "iqr", threshold=3.0)
+    assert clipped[7] < 200.0
+    assert np.isnan(clipped[0])
+    assert ColumnStatistics().update([1.0, 1.0]).bounds("iqr") == (-np.inf, np.inf)
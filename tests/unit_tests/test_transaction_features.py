@@ -1,6 +1,11 @@
+import dataclasses
+
 import pandas as pd
 import numpy as np
+import pytest
 
+from fraudshield.feature_engineering import cpp_wrapper
+from fraudshield.feature_engineering.rolling_engine import WindowAggregate, compute_window_aggregates
 from fraudshield.feature_engineering.transaction_features import (
     TransactionFeatureConfig,
     add_transaction_features,
@@ -45,3 +50,276 @@ def test_transaction_feature_generation_closed_left():
 
     # Merchant fraud rate uses past transactions only (merchant 10)
     assert result.loc[2, "merchant_fraud_rate_1h"] == 0.0
+
+
+def _reference_rolling(df, group_col, value_col, window, agg):
+    indexed = df.assign(transaction_date=pd.to_datetime(df["transaction_date"], utc=True))
+    indexed = indexed.sort_values("transaction_date", kind="stable").set_index("transaction_date")
+    grouped = indexed.groupby(group_col)
+    rolled = grouped[value_col].rolling(window, closed="left").agg(agg)
+    ids = np.concatenate([group["transaction_id"].to_numpy() for _, group in grouped])
+    return pd.Series(rolled.to_numpy(), index=ids)
+
+
+@pytest.mark.parametrize("use_cpp", [True, False])
+def test_window_features_match_pandas_rolling(monkeypatch, use_cpp):
+    if use_cpp and not cpp_wrapper.is_cpp_available():
+        pytest.skip("C++ feature engineering module not built")
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", use_cpp)
+
+    rng = np.random.default_rng(7)
+    n = 400
+    start = pd.Timestamp("2024-01-01")
+    df = pd.DataFrame(
+        {
+            "transaction_id": np.arange(n),
+            "user_id": rng.integers(0, 15, n),
+            "merchant_id": rng.integers(0, 6, n),
+            "transaction_date": start + pd.to_timedelta(rng.integers(0, 72 * 60, n), unit="min"),
+            "amount": rng.gamma(2.0, 50.0, n),
+            "currency": rng.choice(["USD", "EUR"], n),
+            "status": rng.choice(["approved", "declined"], n),
+            "fraud": rng.integers(0, 2, n),
+        }
+    )
+    df.loc[rng.choice(n, 20, replace=False), "amount"] = np.nan
+
+    windows = ["1h", "24h"]
+    result = add_transaction_features(df, TransactionFeatureConfig(windows=windows))
+    result = result.set_index("transaction_id")
+
+    expected_specs = [
+        ("user_txn_count", "user_id", "amount", "count"),
+        ("user_amount_sum", "user_id", "amount", "sum"),
+        ("user_amount_mean", "user_id", "amount", "mean"),
+        ("merchant_txn_count", "merchant_id", "amount", "count"),
+        ("merchant_amount_mean", "merchant_id", "amount", "mean"),
+        ("merchant_fraud_rate", "merchant_id", "fraud", "mean"),
+        ("currency_txn_count", "currency", "amount", "count"),
+        ("status_txn_count", "status", "amount", "count"),
+    ]
+    for name, group_col, value_col, agg in expected_specs:
+        for window in windows:
+            expected = _reference_rolling(df, group_col, value_col, window, agg)
+            actual = result.loc[expected.index, f"{name}_{window}"].to_numpy()
+            np.testing.assert_allclose(actual, expected.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=f"{name}_{window}")
+
+
+def test_time_since_last_txn_per_user_merchant_and_pair():
+    df = pd.DataFrame(
+        {
+            "transaction_id": [1, 2, 3, 4, 5],
+            "user_id": [1, 2, 1, 1, 2],
+            "merchant_id": [10, 10, 11, 10, 11],
+            "transaction_date": [
+                "2024-01-01 00:00:00",
+                "2024-01-01 00:01:00",
+                "2024-01-01 00:05:00",
+                "2024-01-01 00:15:00",
+                "2024-01-01 01:00:00",
+            ],
+            "amount": [10.0, 20.0, 30.0, 40.0, 50.0],
+        }
+    )
+
+    result = add_transaction_features(df, TransactionFeatureConfig(windows=[])).set_index("transaction_id")
+
+    assert np.isnan(result.loc[1, "user_time_since_last_txn"])
+    assert result.loc[3, "user_time_since_last_txn"] == 300.0
+    assert result.loc[5, "user_time_since_last_txn"] == 3540.0
+
+    assert result.loc[2, "merchant_time_since_last_txn"] == 60.0
+    assert result.loc[4, "merchant_time_since_last_txn"] == 840.0
+
+    assert np.isnan(result.loc[3, "user_merchant_time_since_last_txn"])
+    assert result.loc[4, "user_merchant_time_since_last_txn"] == 900.0
+
+
+@pytest.mark.parametrize("use_cpp", [True, False])
+def test_user_expanding_stats_match_pandas_expanding(monkeypatch, use_cpp):
+    if use_cpp and not cpp_wrapper.is_cpp_available():
+        pytest.skip("C++ feature engineering module not built")
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", use_cpp)
+
+    rng = np.random.default_rng(11)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "transaction_id": np.arange(n),
+            "user_id": rng.integers(0, 12, n),
+            "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 500, n), unit="min"),
+            "amount": rng.lognormal(4.0, 1.0, n),
+        }
+    )
+    df.loc[rng.choice(n, 15, replace=False), "amount"] = np.nan
+
+    result = add_transaction_features(df, TransactionFeatureConfig(windows=[])).set_index("transaction_id")
+
+    ordered = df.assign(transaction_date=pd.to_datetime(df["transaction_date"], utc=True))
+    ordered = ordered.sort_values("transaction_date", kind="stable")
+    grouped = ordered.groupby("user_id")["amount"]
+    prior_mean = grouped.transform(lambda s: s.expanding().mean().shift(1))
+    prior_std = grouped.transform(lambda s: s.expanding().std(ddof=1).shift(1))
+    prior_min = grouped.transform(lambda s: s.expanding().min().shift(1))
+    prior_max = grouped.transform(lambda s: s.expanding().max().shift(1))
+    prior_count = grouped.transform(lambda s: s.notna().cumsum().shift(1, fill_value=0))
+    expected_z = ((ordered["amount"] - prior_mean) / prior_std.where(prior_std > 0)).to_numpy()
+
+    actual = result.loc[ordered["transaction_id"]]
+    np.testing.assert_allclose(actual["user_amount_zscore"].to_numpy(), expected_z, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(actual["user_amount_expanding_min"].to_numpy(), prior_min.to_numpy())
+    np.testing.assert_allclose(actual["user_amount_expanding_max"].to_numpy(), prior_max.to_numpy())
+    np.testing.assert_allclose(actual["user_amount_expanding_count"].to_numpy(), prior_count.to_numpy())
+
+
+@pytest.mark.parametrize("use_cpp", [True, False])
+def test_window_min_max_match_pandas_rolling(monkeypatch, use_cpp):
+    if use_cpp and not cpp_wrapper.is_cpp_available():
+        pytest.skip("C++ feature engineering module not built")
+    monkeypatch.setattr(cpp_wrapper, "CPP_AVAILABLE", use_cpp)
+
+    rng = np.random.default_rng(3)
+    n = 500
+    times = np.sort(pd.Timestamp("2024-01-01").value + rng.integers(0, 600, n) * 60 * 10**9)
+    entity = rng.integers(0, 8, n)
+    values = rng.normal(size=n)
+    values[rng.choice(n, 40, replace=False)] = np.nan
+
+    windows = ["30min", "6h"]
+    aggs = ["count", "sum", "mean", "min", "max"]
+    result = compute_window_aggregates(
+        entity, times, {"v": values}, windows, [WindowAggregate(agg, "v", agg) for agg in aggs]
+    )
+
+    frame = pd.DataFrame({"entity": entity, "v": values, "row": np.arange(n)}, index=pd.to_datetime(times))
+    grouped = frame.groupby("entity")
+    rows = np.concatenate([group["row"].to_numpy() for _, group in grouped])
+    for window in windows:
+        for agg in aggs:
+            expected = np.full(n, np.nan)
+            expected[rows] = grouped["v"].rolling(window, closed="left").agg(agg).to_numpy()
+            np.testing.assert_allclose(result[f"{agg}_{window}"], expected, rtol=1e-9, atol=1e-9, err_msg=f"{agg}_{window}")
+
+
+def test_parallel_features_match_serial(monkeypatch):
+    from fraudshield.feature_engineering import parallel
+
+    rng = np.random.default_rng(13)
+    n = 2000
+    df = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 40, n),
+            "merchant_id": rng.integers(0, 15, n),
+            "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 20000, n), unit="min"),
+            "amount": rng.gamma(2.0, 40.0, n),
+            "currency": rng.choice(["USD", "EUR", "GBP"], n),
+            "status": rng.choice(["approved", "declined"], n),
+            "fraud": rng.integers(0, 2, n),
+        }
+    )
+    df.loc[rng.choice(n, 20, replace=False), "user_id"] = np.nan
+    df.loc[rng.choice(n, 20, replace=False), "transaction_date"] = pd.NaT
+
+    serial = add_transaction_features(df, TransactionFeatureConfig(windows=["1h", "7d"]))
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_ROWS", 0)
+    partitioned = add_transaction_features(df, TransactionFeatureConfig(windows=["1h", "7d"], n_jobs=3))
+
+    pd.testing.assert_frame_equal(partitioned, serial, rtol=1e-9)
+
+
+def test_feature_selection_computes_only_requested_outputs(monkeypatch):
+    from fraudshield.feature_engineering import rolling_engine
+
+    rng = np.random.default_rng(21)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 10, n),
+            "merchant_id": rng.integers(0, 5, n),
+            "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 6000, n), unit="min"),
+            "amount": rng.gamma(2.0, 40.0, n),
+            "currency": rng.choice(["USD", "EUR"], n),
+            "status": rng.choice(["approved", "declined"], n),
+            "fraud": rng.integers(0, 2, n),
+        }
+    )
+    full = add_transaction_features(df, TransactionFeatureConfig(windows=["1h", "24h", "7d"]))
+
+    calls = []
+    original = rolling_engine.compute_window_aggregates
+
+    def spy(entity, times, values, windows, aggregates):
+        calls.append((list(windows), [spec.name for spec in aggregates]))
+        return original(entity, times, values, windows, aggregates)
+
+    monkeypatch.setattr(rolling_engine, "compute_window_aggregates", spy)
+    wanted = ["user_txn_count_7d", "merchant_fraud_rate_1h", "user_amount_zscore"]
+    config = TransactionFeatureConfig(windows=["1h"], features=wanted)
+    selected = add_transaction_features(df, config)
+
+    assert [col for col in selected.columns if col not in df.columns] == [
+        "user_amount_zscore",
+        "user_txn_count_7d",
+        "merchant_fraud_rate_1h",
+    ]
+    assert calls == [(["7d"], ["user_txn_count"]), (["1h"], ["merchant_fraud_rate"])]
+    for column in wanted:
+        np.testing.assert_allclose(selected[column].to_numpy(), full[column].to_numpy(), err_msg=column)
+
+    calls.clear()
+    by_family = add_transaction_features(
+        df, TransactionFeatureConfig(windows=["24h"], families=["currency", "status"], aggregates=["count"])
+    )
+    assert [col for col in by_family.columns if col not in df.columns] == ["currency_txn_count_24h", "status_txn_count_24h"]
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError):
+        add_transaction_features(df, TransactionFeatureConfig(families=["device"]))
+    # min/max are engine aggregates no rolling family emits; selecting them must not silently drop the windows
+    with pytest.raises(ValueError):
+        add_transaction_features(df, TransactionFeatureConfig(families=["user"], aggregates=["max"]))
+
+
+def test_indicator_families_are_opt_in_and_use_prior_rows(monkeypatch):
+    from fraudshield.feature_engineering import parallel
+    from fraudshield.feature_engineering.checkpoint import add_transaction_features_incremental
+
+    rng = np.random.default_rng(17)
+    n = 400
+    df = pd.DataFrame(
+        {
+            "transaction_id": np.arange(n),
+            "user_id": rng.integers(0, 15, n),
+            "merchant_id": rng.integers(0, 6, n),
+            "transaction_date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 5000, n), unit="min"),
+            "amount": rng.gamma(2.0, 40.0, n),
+        }
+    )
+    assert not any("_ema" in col for col in add_transaction_features(df, TransactionFeatureConfig()).columns)
+
+    config = TransactionFeatureConfig(windows=[], families=["user_indicators"], ma_window=3, ema_alpha=0.4)
+    result = add_transaction_features(df, config).set_index("transaction_id")
+    assert [col for col in result.columns if col not in df.columns] == [
+        "user_amount_ma_3",
+        "user_amount_ema",
+        "user_amount_rsi_14",
+    ]
+
+    ordered = df.assign(transaction_date=pd.to_datetime(df["transaction_date"], utc=True))
+    ordered = ordered.sort_values("transaction_date", kind="stable")
+    grouped = ordered.groupby("user_id")["amount"]
+    prior_ma = grouped.transform(lambda s: s.rolling(3).mean().shift(1))
+    prior_ema = grouped.transform(lambda s: s.ewm(alpha=0.4, adjust=False).mean().shift(1))
+    actual = result.loc[ordered["transaction_id"]]
+    np.testing.assert_allclose(actual["user_amount_ma_3"].to_numpy(), prior_ma.to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(actual["user_amount_ema"].to_numpy(), prior_ema.to_numpy(), rtol=1e-9)
+    rsi = actual["user_amount_rsi_14"]
+    assert rsi.isna().to_numpy().tolist() == (ordered.groupby("user_id").cumcount() < 14).tolist()
+    assert rsi.dropna().between(0, 100).all()
+
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_ROWS", 0)
+    partitioned = add_transaction_features(df, dataclasses.replace(config, n_jobs=2))
+    pd.testing.assert_frame_equal(partitioned.set_index("transaction_id"), result, rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        add_transaction_features_incremental(df, config)